@@ -1,5 +1,7 @@
 import os
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Config:
     """Configuration de l'application Flask"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
@@ -7,3 +9,62 @@ class Config:
     UPLOAD_FOLDER = 'data'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'csv', 'txt', 'pdf', 'jpg', 'jpeg', 'png', 'webp'}
+
+    # Instantané colonnaire (.npy par colonne) du dataset CSV normalisé
+    CSV_SNAPSHOT_ENABLED = os.environ.get('CSV_SNAPSHOT_ENABLED', '1') != '0'
+    CSV_SNAPSHOT_DIR = os.environ.get('CSV_SNAPSHOT_DIR') or os.path.join(BASE_DIR, 'data', '.snapshots', 'player_stats')
+
+    # Nombre de lignes sérialisées par morceau lors des exports en flux (/api/csv/data)
+    CSV_EXPORT_CHUNK_SIZE = 1000
+
+    # Nombre maximal de résultats de requêtes (agrégations, etc.) gardés en cache LRU
+    CSV_QUERY_CACHE_SIZE = 256
+
+    # Lecture par morceaux des gros fichiers CSV : 'auto' (au-delà du seuil), 'memory' ou 'chunked'
+    CSV_INGESTION_MODE = os.environ.get('CSV_INGESTION_MODE', 'auto')
+    CSV_CHUNKED_THRESHOLD_MB = int(os.environ.get('CSV_CHUNKED_THRESHOLD_MB', 512))
+    # Plafond mémoire visé pour un morceau en cours de traitement
+    CSV_CHUNK_MEMORY_MB = int(os.environ.get('CSV_CHUNK_MEMORY_MB', 64))
+
+    # Ingestion de lignes par l'API (POST /api/csv/ingest) : désactivée par défaut, l'API n'ayant pas d'authentification
+    CSV_INGEST_ENABLED = os.environ.get('CSV_INGEST_ENABLED', '0') == '1'
+    CSV_INGEST_MAX_ROWS = int(os.environ.get('CSV_INGEST_MAX_ROWS', 10000))
+    # Profils de colonnes après un ajout : recalculés exactement au prochain accès jusqu'à ce nombre de
+    # lignes ; au-delà, fusionnés depuis des accumulateurs (quantiles et valeurs distinctes estimés)
+    CSV_PROFILES_EXACT_MAX_ROWS = int(os.environ.get('CSV_PROFILES_EXACT_MAX_ROWS', 500000))
+
+    # Moteur d'extraction des couleurs dominantes : 'histogram', 'median_cut', 'minibatch', 'kmeans' ou 'frequency'
+    IMAGE_COLOR_ENGINE = os.environ.get('IMAGE_COLOR_ENGINE', 'histogram')
+
+    # Analyse des couleurs sur une miniature de IMAGE_ANALYSIS_SIZE px de côté, rééchantillonnée avec
+    # IMAGE_ANALYSIS_FILTER ; hors /api/image/analyze avec des étapes pleine résolution, un JPEG est
+    # décodé directement à résolution réduite (le mode de décodage fait partie de la clé du cache)
+    # ('box', 'nearest', 'bilinear', 'bicubic' ou 'lanczos')
+    IMAGE_ANALYSIS_SIZE = int(os.environ.get('IMAGE_ANALYSIS_SIZE', 200))
+    IMAGE_ANALYSIS_FILTER = os.environ.get('IMAGE_ANALYSIS_FILTER', 'box')
+    # Nombre maximal de pixels décodés pour une analyse (après réduction JPEG) : borne mémoire et latence
+    IMAGE_MAX_PIXELS = int(os.environ.get('IMAGE_MAX_PIXELS', 25_000_000))
+
+    # Cache persistant (SQLite, partagé entre processus) des analyses de couleurs des logos
+    IMAGE_COLOR_CACHE_ENABLED = os.environ.get('IMAGE_COLOR_CACHE_ENABLED', '1') != '0'
+    IMAGE_COLOR_CACHE_PATH = os.environ.get('IMAGE_COLOR_CACHE_PATH') or os.path.join(BASE_DIR, 'data', '.cache', 'image_analysis.sqlite3')
+    IMAGE_COLOR_CACHE_MAX_ENTRIES = int(os.environ.get('IMAGE_COLOR_CACHE_MAX_ENTRIES', 10000))
+
+    # Manifeste persistant du catalogue des logos (nom, taille, mtime, dimensions, format, mode) ;
+    # le dossier n'est reparcouru (sans rouvrir les fichiers inchangés) qu'après IMAGE_CATALOG_RESCAN_S
+    # secondes, ou dès que son mtime change (ajout, retrait ou renommage d'un logo)
+    IMAGE_CATALOG_PATH = os.environ.get('IMAGE_CATALOG_PATH') or os.path.join(BASE_DIR, 'data', '.cache', 'logo_manifest.json')
+    IMAGE_CATALOG_RESCAN_S = float(os.environ.get('IMAGE_CATALOG_RESCAN_S', 10))
+
+    # Analyse des logos par lots (comparaison, analyse globale) dans un pool de processus :
+    # nombre de processus (0 = nombre de cœurs, plafonné à 8), logos par tâche soumise,
+    # et nombre minimal de logos à calculer pour démarrer le pool (en dessous : calcul en place)
+    IMAGE_BATCH_WORKERS = int(os.environ.get('IMAGE_BATCH_WORKERS', 0))
+    IMAGE_BATCH_CHUNK_SIZE = int(os.environ.get('IMAGE_BATCH_CHUNK_SIZE', 4))
+    IMAGE_BATCH_MIN_PARALLEL = int(os.environ.get('IMAGE_BATCH_MIN_PARALLEL', 8))
+
+    # Miniatures des logos (WebP / PNG) générées une fois dans IMAGE_DERIVATIVES_DIR, adressées par le
+    # contenu du logo source : tailles possibles (px) et format utilisé par la liste des logos
+    IMAGE_DERIVATIVES_DIR = os.environ.get('IMAGE_DERIVATIVES_DIR') or os.path.join(BASE_DIR, 'data', '.cache', 'logo_derivatives')
+    IMAGE_DERIVATIVE_SIZES = [int(size) for size in os.environ.get('IMAGE_DERIVATIVE_SIZES', '64,128,256').split(',')]
+    IMAGE_DERIVATIVE_FORMAT = os.environ.get('IMAGE_DERIVATIVE_FORMAT', 'webp')
@@ -1,14 +1,42 @@
-from flask import Blueprint, jsonify, request
-from app.services import csv_service
+from flask import Blueprint, jsonify, request, Response, stream_with_context
+from app.config import Config
+from app.services import csv_service, ingestion
 
 csv_bp = Blueprint('csv', __name__, url_prefix='/api/csv')
 
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+def _get_list_arg(name):
+    """Lit un paramètre liste (répété ou séparé par des virgules)"""
+    values = []
+    for raw in request.args.getlist(name):
+        values.extend(item.strip() for item in raw.split(',') if item.strip())
+    return values
+
 @csv_bp.route('/data', methods=['GET'])
 def get_csv_data():
-    """Récupère les données du CSV"""
+    """Récupère les données du CSV (colonnes, filtres, offset/limit, export NDJSON/CSV en flux)"""
     try:
-        data = csv_service.get_csv_data()
-        return jsonify({'status': 'success', 'data': data})
+        columns = _get_list_arg('columns')
+        filters = request.args.getlist('filter')
+        offset = request.args.get('offset', 0, type=int)
+        limit = request.args.get('limit', None, type=int)
+        export_format = request.args.get('format', 'json')
+        
+        if export_format in EXPORT_MIMETYPES:
+            chunks = csv_service.iter_csv_export(columns, filters, offset, limit, export_format)
+            response = Response(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[export_format])
+            if export_format == 'csv':
+                response.headers['Content-Disposition'] = 'attachment; filename=player_stats.csv'
+            return response
+        
+        page = csv_service.get_csv_page(columns, filters, offset, limit)
+        return jsonify({'status': 'success', 'data': page['rows'], 'pagination': page['pagination']})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -16,8 +44,10 @@ def get_csv_data():
 def get_csv_stats():
     """Récupère les statistiques du CSV"""
     try:
-        stats = csv_service.get_stats()
+        stats = csv_service.get_stats(filters=request.args.getlist('filter'))
         return jsonify({'status': 'success', 'stats': stats})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -25,8 +55,10 @@ def get_csv_stats():
 def get_columns():
     """Récupère les informations sur les colonnes"""
     try:
-        columns_info = csv_service.get_columns_info()
+        columns_info = csv_service.get_columns_info(filters=request.args.getlist('filter'))
         return jsonify({'status': 'success', 'columns': columns_info})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -44,8 +76,28 @@ def get_column_data(column_name):
     """Récupère les données d'une colonne pour visualisation"""
     try:
         limit = request.args.get('limit', 100, type=int)
-        data = csv_service.get_column_data(column_name, limit)
+        data = csv_service.get_column_data(column_name, limit, filters=request.args.getlist('filter'))
         return jsonify({'status': 'success', 'data': data})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/column/<column_name>/summary', methods=['GET'])
+def get_column_summary(column_name):
+    """Récupère un résumé compact d'une colonne numérique (histogram, box ou downsample)"""
+    try:
+        summary = csv_service.get_column_summary(
+            column_name,
+            kind=request.args.get('kind', 'histogram'),
+            method=request.args.get('method', 'fixed'),
+            bins=request.args.get('bins', None, type=int),
+            points=request.args.get('points', None, type=int),
+            filters=request.args.getlist('filter')
+        )
+        return jsonify({'status': 'success', 'data': summary})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -53,8 +105,10 @@ def get_column_data(column_name):
 def get_nationality_map():
     """Récupère les données pour la carte des nationalités"""
     try:
-        map_data = csv_service.get_nationality_map_data()
+        map_data = csv_service.get_nationality_map_data(filters=request.args.getlist('filter'))
         return jsonify({'status': 'success', 'map_data': map_data})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -87,11 +141,152 @@ def get_multiple_columns():
         data = request.json
         columns = data.get('columns', [])
         limit = data.get('limit', 100)
+        filters = data.get('filters', [])
+        if isinstance(filters, str):
+            filters = [filters]
         
         if not columns:
             return jsonify({'status': 'error', 'message': 'Aucune colonne fournie'}), 400
         
-        columns_data = csv_service.get_multiple_columns_data(columns, limit)
+        columns_data = csv_service.get_multiple_columns_data(columns, limit, filters=filters)
         return jsonify({'status': 'success', 'data': columns_data})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Récupère les compteurs du cache du dataset"""
+    try:
+        cache_stats = csv_service.get_cache_stats()
+        return jsonify({'status': 'success', 'cache': cache_stats})
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/aggregate', methods=['GET'])
+def get_aggregate():
+    """Regroupe les joueurs (Squad, Nation, Position, Compition, Age band) et agrège des métriques"""
+    try:
+        result = csv_service.get_aggregate(
+            group_by=_get_list_arg('group_by'),
+            metrics=_get_list_arg('metrics'),
+            aggregations=_get_list_arg('aggs') or ['sum'],
+            filters=request.args.getlist('filter'),
+            sort_by=request.args.get('sort', None),
+            ascending=request.args.get('order', 'desc') == 'asc',
+            limit=request.args.get('limit', None, type=int)
+        )
+        return jsonify({'status': 'success', 'aggregate': result})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/player/<player_name>/similar', methods=['GET'])
+def get_similar_players(player_name):
+    """Récupère les joueurs au profil statistique le plus proche (k plus proches voisins)"""
+    try:
+        result = csv_service.get_similar_players(
+            player_name,
+            k=request.args.get('k', 10, type=int),
+            positions=_get_list_arg('position'),
+            competitions=request.args.getlist('competition'),
+            filters=request.args.getlist('filter')
+        )
+        return jsonify({'status': 'success', 'similarity': result})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/filters', methods=['GET'])
+def get_filter_options():
+    """Récupère les colonnes indexées, leurs valeurs et les opérateurs des expressions de filtre"""
+    try:
+        options = csv_service.get_filter_options()
+        return jsonify({'status': 'success', 'filters': options})
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Classement des meilleurs joueurs sur une métrique (filtres, minutes minimales, per90)"""
+    try:
+        metric = request.args.get('metric', None)
+        if not metric:
+            return jsonify({'status': 'error', 'message': 'Paramètre metric requis'}), 400
+        result = csv_service.get_leaderboard(
+            metric,
+            limit=request.args.get('limit', 20, type=int),
+            filters=request.args.getlist('filter'),
+            min_minutes=request.args.get('min_minutes', None, type=float),
+            per90=request.args.get('per90', 'false').lower() in ('1', 'true', 'yes'),
+            ascending=request.args.get('order', 'desc') == 'asc'
+        )
+        return jsonify({'status': 'success', 'leaderboard': result})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/player/<player_name>/profile', methods=['GET'])
+def get_player_profile(player_name):
+    """Récupère les valeurs et percentiles d'un joueur parmi ses pairs (poste et compétition)"""
+    try:
+        profile = csv_service.get_player_profile(player_name)
+        return jsonify({'status': 'success', 'profile': profile})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 404
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/players/search', methods=['GET'])
+def search_players():
+    """Recherche de joueurs par nom (préfixe puis recherche approchée), pour la saisie au fil de la frappe"""
+    try:
+        result = csv_service.search_players(
+            request.args.get('q', ''),
+            limit=request.args.get('limit', 10, type=int)
+        )
+        return jsonify({'status': 'success', 'search': result})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/correlation', methods=['GET'])
+def get_correlation():
+    """Matrice de corrélation des colonnes numériques (triangle supérieur, ligne par ligne)"""
+    try:
+        result = csv_service.get_correlation(
+            columns=_get_list_arg('columns'),
+            method=request.args.get('method', 'pearson'),
+            filters=request.args.getlist('filter'),
+            include_covariance=request.args.get('covariance', 'false').lower() in ('1', 'true', 'yes')
+        )
+        return jsonify({'status': 'success', 'correlation': result})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@csv_bp.route('/ingest', methods=['POST'])
+def ingest_rows():
+    """Ajoute ou met à jour des lignes de joueurs (JSON {"rows": [...]} ou corps text/csv)"""
+    if not Config.CSV_INGEST_ENABLED:
+        return jsonify({'status': 'error', 'message': 'Ingestion désactivée (CSV_INGEST_ENABLED=1 pour l\'activer)'}), 403
+    try:
+        mode = request.args.get('mode', 'append')
+        if request.mimetype == 'text/csv':
+            rows = ingestion.rows_from_csv_text(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True) or {}
+            mode = data.get('mode', mode)
+            rows = ingestion.rows_from_records(data.get('rows', []))
+        result = csv_service.ingest_rows(rows, mode)
+        return jsonify({'status': 'success', 'ingest': result})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
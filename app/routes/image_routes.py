@@ -1,8 +1,16 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, send_file
 from app.services import image_service
 
 image_bp = Blueprint('image', __name__, url_prefix='/api/image')
 
+def _histogram_args():
+    """Options des histogrammes passées en paramètres de requête (bins, encoding, size)"""
+    return {
+        'bins': request.args.get('bins', type=int),
+        'encoding': request.args.get('encoding', 'json'),
+        'size': request.args.get('size', type=int)
+    }
+
 @image_bp.route('/logos', methods=['GET'])
 def get_logos():
     """Récupère la liste des logos de clubs"""
@@ -29,10 +37,18 @@ def analyze_image(filename):
         from urllib.parse import unquote
         filename = unquote(filename)
         
-        details = image_service.get_image_details(filename)
+        details = image_service.get_image_details(
+            filename,
+            engine=request.args.get('engine'),
+            stages=request.args.get('stages'),
+            timings=request.args.get('timings', '0').lower() in ('1', 'true', 'yes'),
+            histogram_options=_histogram_args()
+        )
         return jsonify({'status': 'success', 'image': details})
     except FileNotFoundError as e:
         return jsonify({'status': 'error', 'message': f'Image non trouvée: {str(e)}'}), 404
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
@@ -43,8 +59,10 @@ def analyze_image(filename):
 def get_image_colors(filename):
     """Récupère les couleurs dominantes d'une image"""
     try:
-        colors = image_service.analyze_image_colors(filename)
+        colors = image_service.analyze_image_colors(filename, engine=request.args.get('engine'))
         return jsonify({'status': 'success', 'colors': colors})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -54,10 +72,33 @@ def get_histograms(filename):
     try:
         from urllib.parse import unquote
         filename = unquote(filename)
-        histograms = image_service.get_image_histograms(filename)
+        histograms = image_service.get_image_histograms(filename, **_histogram_args())
         return jsonify({'status': 'success', 'histograms': histograms})
     except FileNotFoundError as e:
         return jsonify({'status': 'error', 'message': f'Image non trouvée: {str(e)}'}), 404
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@image_bp.route('/thumbnail/<filename>', methods=['GET'])
+def get_thumbnail(filename):
+    """Sert la miniature d'un logo (WebP ou PNG) avec ETag et en-têtes de cache longue durée"""
+    try:
+        from urllib.parse import unquote
+        filename = unquote(filename)
+        size = request.args.get('size', 128, type=int)
+        path, etag, mimetype = image_service.get_logo_derivative(filename, size, request.args.get('format'))
+        # URL versionnée (paramètre v = révision du logo) : contenu immuable pour cette URL
+        versioned = bool(request.args.get('v'))
+        max_age = image_service.THUMBNAIL_MAX_AGE if versioned else image_service.THUMBNAIL_REVALIDATE_AGE
+        response = send_file(path, mimetype=mimetype, etag=etag, conditional=True, max_age=max_age)
+        response.cache_control.immutable = versioned
+        return response
+    except FileNotFoundError as e:
+        return jsonify({'status': 'error', 'message': f'Image non trouvée: {str(e)}'}), 404
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -66,8 +107,10 @@ def get_clubs_comparison():
     """Récupère la comparaison des couleurs entre clubs"""
     try:
         limit = request.args.get('limit', 10, type=int)
-        clubs_data = image_service.get_clubs_comparison(limit=limit)
+        clubs_data = image_service.get_clubs_comparison(limit=limit, engine=request.args.get('engine'))
         return jsonify({'status': 'success', 'clubs': clubs_data})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -75,8 +118,21 @@ def get_clubs_comparison():
 def get_global_analysis():
     """Récupère l'analyse globale de toutes les images"""
     try:
-        analysis = image_service.get_all_images_analysis()
+        analysis = image_service.get_all_images_analysis(engine=request.args.get('engine'))
         return jsonify({'status': 'success', 'analysis': analysis})
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
+@image_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Récupère les compteurs du cache des analyses de couleurs, du dernier lot, du catalogue et des miniatures"""
+    try:
+        stats = image_service.get_color_cache_stats()
+        return jsonify({'status': 'success', 'cache': stats, 'batch': image_service.get_last_batch_stats(),
+                        'catalog': image_service.get_catalog_stats(),
+                        'derivatives': image_service.get_derivative_stats()})
     except Exception as e:
         return jsonify({'status': 'error', 'message': str(e)}), 500
 
@@ -0,0 +1,105 @@
+import re
+import numpy as np
+import pandas as pd
+from app.utils import stats_utils
+
+# Clés de regroupement autorisées ('Age band' est calculée à partir de 'Age')
+GROUP_KEYS = ['Squad', 'Nation', 'Position', 'Compition', 'Age band']
+AGE_BAND_COLUMN = 'Age band'
+AGE_BAND_BINS = [0, 21, 24, 27, 30, 33, np.inf]
+AGE_BAND_LABELS = ['<21', '21-23', '24-26', '27-29', '30-32', '33+']
+
+# Colonne des matchs joués ramenés à 90 minutes, utilisée par l'agrégation 'per90'
+NINETIES_COLUMN = '90s'
+
+SIMPLE_AGGREGATIONS = ['sum', 'mean', 'median', 'min', 'max', 'std']
+QUANTILE_PATTERN = re.compile(r'^q(\d{1,2})$')
+
+
+def _validate_aggregation(name):
+    """Vérifie qu'une fonction d'agrégation est supportée"""
+    if name in SIMPLE_AGGREGATIONS or name in ('count', 'per90') or QUANTILE_PATTERN.match(name):
+        return name
+    raise ValueError(f"Agrégation non supportée: {name}")
+
+
+def _prepare_frame(df, group_by, metrics):
+    """Vérifie la requête et ajoute les colonnes virtuelles nécessaires"""
+    if not group_by:
+        raise ValueError("Au moins une clé de regroupement est requise")
+    for key in group_by:
+        if key not in GROUP_KEYS:
+            raise ValueError(f"Clé de regroupement non supportée: {key} (autorisées: {', '.join(GROUP_KEYS)})")
+    for metric in metrics:
+        if metric not in df.columns:
+            raise ValueError(f"Colonne {metric} non trouvée")
+        if not pd.api.types.is_numeric_dtype(df[metric]):
+            raise ValueError(f"La colonne {metric} n'est pas numérique")
+
+    columns = [key for key in group_by if key != AGE_BAND_COLUMN] + list(metrics)
+    if NINETIES_COLUMN in df.columns:
+        columns.append(NINETIES_COLUMN)
+    work = df[list(dict.fromkeys(columns))]
+    # Accumulation en float64 (les colonnes du dataset sont stockées en float32)
+    work = work.astype({col: 'float64' for col in work.columns if col not in group_by})
+
+    if AGE_BAND_COLUMN in group_by:
+        work = work.assign(**{AGE_BAND_COLUMN: pd.cut(df['Age'], bins=AGE_BAND_BINS,
+                                                       labels=AGE_BAND_LABELS, right=False)})
+    return work
+
+
+def _aggregate_metrics(grouped, name, work, metrics):
+    """Calcule une agrégation pour toutes les métriques (DataFrame groupes x métriques)"""
+    values = grouped[metrics]
+    quantile = QUANTILE_PATTERN.match(name)
+    if quantile:
+        return values.quantile(int(quantile.group(1)) / 100)
+    if name == 'per90':
+        if NINETIES_COLUMN not in work.columns:
+            raise ValueError(f"Colonne {NINETIES_COLUMN} requise pour l'agrégation per90")
+        nineties = grouped[NINETIES_COLUMN].sum()
+        return values.sum().div(nineties.where(nineties > 0), axis=0)
+    return values.agg(name)
+
+
+def aggregate(df, group_by, metrics=None, aggregations=None, sort_by=None, ascending=False, limit=None):
+    """Regroupe le DataFrame et calcule les agrégations demandées de façon vectorisée.
+
+    Retourne une liste de groupes : {'group': {...}, 'count': n, 'metrics': {metrique: {agg: valeur}}}.
+    """
+    metrics = list(metrics or [])
+    aggregations = [_validate_aggregation(name) for name in (aggregations or ['sum'])]
+    work = _prepare_frame(df, group_by, metrics)
+    grouped = work.groupby(list(group_by), observed=True, sort=False)
+
+    results = {'count': grouped.size()}
+    if metrics:
+        for name in aggregations:
+            if name == 'count':
+                continue
+            frame = _aggregate_metrics(grouped, name, work, metrics)
+            for metric in metrics:
+                results[f"{metric}.{name}"] = frame[metric]
+    table = pd.DataFrame(results)
+
+    if sort_by:
+        if sort_by not in table.columns:
+            raise ValueError(f"Tri impossible sur {sort_by} (valeurs possibles: {', '.join(table.columns)})")
+        table = table.sort_values(sort_by, ascending=ascending, na_position='last')
+    if limit is not None:
+        table = table.head(limit)
+
+    groups = []
+    for keys, row in zip(table.index, table.itertuples(index=False, name=None)):
+        keys = keys if isinstance(keys, tuple) else (keys,)
+        entry = {
+            'group': {key: str(value) for key, value in zip(group_by, keys)},
+            'count': int(row[0]),
+            'metrics': {}
+        }
+        for column, value in zip(table.columns[1:], row[1:]):
+            metric, name = column.rsplit('.', 1)
+            entry['metrics'].setdefault(metric, {})[name] = stats_utils.to_float(value)
+        groups.append(entry)
+    return groups
@@ -0,0 +1,170 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Résolution de la date de dernier accès : une lecture ne réécrit la ligne que si son
+# dernier accès enregistré est plus ancien (les lectures restent sans écriture)
+ACCESS_RESOLUTION_S = 60
+# Délai d'attente du verrou SQLite quand un autre processus écrit
+LOCK_TIMEOUT_S = 5
+
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def content_digest(path):
+    """Empreinte blake2b du contenu d'un fichier, mémorisée par (chemin, mtime, taille)"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    with _digests_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        hasher = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(block)
+        digest = hasher.hexdigest()
+        with _digests_lock:
+            _digests[key] = digest
+    return digest
+
+
+def make_key(digest, params):
+    """Clé d'un résultat : empreinte du contenu + paramètres de l'analyse (ordre des clés indifférent)"""
+    return digest + ':' + json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+
+class PersistentCache:
+    """Cache de résultats d'analyse (JSON) dans une base SQLite, partagé entre processus.
+
+    Les entrées sont adressées par contenu (voir `make_key`) et survivent aux
+    redémarrages ; au-delà de `max_entries`, les moins récemment utilisées sont
+    évincées. Une erreur SQLite (ou d'accès au dossier) est signalée et l'analyse
+    se poursuit sans cache.
+    """
+
+    def __init__(self, path, max_entries=10000, enabled=True):
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connection(self):
+        """Connexion SQLite du thread courant (créée, avec la table, au premier accès)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT_S)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, '
+                'created REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+            connection.commit()
+            self._local.connection = connection
+        return connection
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _failed(self, error):
+        print(f"Warning: Cache d'analyse indisponible ({self.path}): {error}")
+        self._count('errors')
+
+    def get(self, key):
+        """Résultat en cache pour la clé, None sinon"""
+        if not self.enabled:
+            return None
+        try:
+            connection = self._connection()
+            row = connection.execute('SELECT value, accessed FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self._count('misses')
+                return None
+            now = time.time()
+            if now - row[1] > ACCESS_RESOLUTION_S:
+                with connection:
+                    connection.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+            self._count('hits')
+            return json.loads(row[0])
+        except (sqlite3.Error, OSError) as e:
+            self._failed(e)
+            return None
+
+    def put(self, key, value):
+        """Enregistre un résultat (sérialisable en JSON) et évince l'excédent d'entrées"""
+        if not self.enabled:
+            return
+        data = json.dumps(value, separators=(',', ':'))
+        now = time.time()
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                                   (key, data, len(data), now, now))
+                excess = connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0] - self.max_entries
+                if excess > 0:
+                    connection.execute('DELETE FROM entries WHERE key IN '
+                                       '(SELECT key FROM entries ORDER BY accessed LIMIT ?)', (excess,))
+                    with self._lock:
+                        self.evictions += excess
+        except (sqlite3.Error, OSError) as e:
+            self._failed(e)
+
+    def get_or_compute(self, key, compute):
+        """Retourne le résultat en cache ou le calcule avec compute() puis l'enregistre"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Vide le cache"""
+        if not self.enabled:
+            return
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute('DELETE FROM entries')
+        except (sqlite3.Error, OSError) as e:
+            self._failed(e)
+
+    def get_stats(self):
+        """Compteurs du processus courant et contenu de la base (entrées, octets)"""
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                'enabled': self.enabled,
+                'path': self.path,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'errors': self.errors,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+                'entries': 0,
+                'bytes': 0
+            }
+        if self.enabled:
+            try:
+                entries, size = self._connection().execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+                stats['entries'] = entries
+                stats['bytes'] = size
+            except (sqlite3.Error, OSError) as e:
+                self._failed(e)
+        return stats
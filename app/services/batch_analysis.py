@@ -0,0 +1,108 @@
+import os
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Plafond du nombre de processus quand le nombre de workers est automatique (0)
+MAX_AUTO_WORKERS = 8
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def resolve_workers(workers):
+    """Nombre de processus effectif : `workers`, ou min(cœurs, MAX_AUTO_WORKERS) si 0"""
+    if workers and workers > 0:
+        return workers
+    return max(1, min(os.cpu_count() or 1, MAX_AUTO_WORKERS))
+
+
+def _init_worker():
+    """Un seul thread de calcul (BLAS/OpenMP) par processus : le parallélisme vient du pool"""
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+
+def _call(function, item):
+    """Résultat (True, valeur) ou (False, message) : l'échec d'un élément n'interrompt pas le lot"""
+    try:
+        return True, function(item)
+    except Exception as e:
+        return False, str(e)
+
+
+def _run_chunk(function, chunk):
+    """Traite un morceau d'éléments dans un processus du pool"""
+    return [_call(function, item) for item in chunk]
+
+
+def _get_executor(workers):
+    """Pool de processus partagé entre requêtes, recréé si le nombre de workers change"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            # 'spawn' : pas de fork d'un serveur multi-thread (verrous, pools OpenMP hérités)
+            _executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=_init_worker)
+            _executor_workers = workers
+        return _executor
+
+
+def _reset_executor(executor):
+    """Abandonne un pool cassé (processus tué) pour qu'il soit recréé au prochain lot"""
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def run_batch(function, items, workers=0, chunk_size=4, min_parallel=8):
+    """Applique `function` (fonction de module, sérialisable) à chaque élément dans un pool de processus.
+
+    Les éléments sont soumis par morceaux de `chunk_size` et les résultats rendus
+    dans l'ordre des éléments, sous la forme (succès, valeur ou message d'erreur).
+    En dessous de `min_parallel` éléments, ou avec un seul worker, le lot est traité
+    dans le processus courant ; si le pool casse, le reste est traité de même.
+    Retourne (résultats, statistiques du lot).
+    """
+    items = list(items)
+    workers = min(resolve_workers(workers), max(1, len(items)))
+    chunk_size = max(1, chunk_size)
+    start = time.perf_counter()
+
+    mode = 'serial'
+    outcomes = []
+    if workers > 1 and len(items) >= min_parallel:
+        mode = 'process'
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        executor = _get_executor(workers)
+        try:
+            for chunk_outcomes in executor.map(_run_chunk, [function] * len(chunks), chunks):
+                outcomes.extend(chunk_outcomes)
+        except BrokenProcessPool as e:
+            print(f"Warning: Pool d'analyse interrompu ({e}), fin du lot dans le processus courant")
+            _reset_executor(executor)
+            mode = 'process+serial'
+    outcomes.extend(_call(function, item) for item in items[len(outcomes):])
+
+    seconds = time.perf_counter() - start
+    stats = {
+        'items': len(items),
+        'failed': sum(1 for ok, _ in outcomes if not ok),
+        'mode': mode,
+        'workers': workers if mode != 'serial' else 1,
+        'chunk_size': chunk_size,
+        'seconds': round(seconds, 4),
+        'items_per_second': round(len(items) / seconds, 2) if seconds > 0 else 0.0
+    }
+    return outcomes, stats
@@ -0,0 +1,128 @@
+import numpy as np
+from app.utils import stats_utils
+
+HISTOGRAM_METHODS = ['fixed', 'fd', 'quantile']
+DEFAULT_BINS = 20
+MAX_BINS = 200
+DEFAULT_POINTS = 500
+
+
+def _clean(values):
+    """Convertit en tableau float64 sans valeurs manquantes ni infinies"""
+    values = np.asarray(values, dtype=np.float64)
+    return values[np.isfinite(values)]
+
+
+def _format_edge(value):
+    """Formate une borne d'intervalle pour les libellés"""
+    return f"{value:.4g}"
+
+
+def _freedman_diaconis_bins(values):
+    """Nombre de classes selon la règle de Freedman–Diaconis (Sturges si IQR nul)"""
+    q1, q3 = np.percentile(values, [25, 75])
+    iqr = q3 - q1
+    value_range = values.max() - values.min()
+    if iqr <= 0 or value_range <= 0:
+        return int(np.ceil(np.log2(len(values)) + 1))
+    width = 2 * iqr / np.cbrt(len(values))
+    return int(np.ceil(value_range / width))
+
+
+def histogram(values, method='fixed', bins=None):
+    """Calcule un histogramme (classes fixes, Freedman–Diaconis ou quantiles)"""
+    if method not in HISTOGRAM_METHODS:
+        raise ValueError(f"Méthode d'histogramme non supportée: {method} (possibles: {', '.join(HISTOGRAM_METHODS)})")
+    values = _clean(values)
+    if len(values) == 0:
+        return {'kind': 'histogram', 'method': method, 'edges': [], 'labels': [], 'data': []}
+
+    if method == 'fd':
+        n_bins = _freedman_diaconis_bins(values)
+    else:
+        n_bins = bins or DEFAULT_BINS
+    n_bins = max(1, min(int(n_bins), MAX_BINS))
+
+    if method == 'quantile':
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)))
+        if len(edges) < 2:
+            edges = np.array([values.min(), values.max() + 1])
+    else:
+        edges = np.histogram_bin_edges(values, bins=n_bins)
+    counts, edges = np.histogram(values, bins=edges)
+
+    return {
+        'kind': 'histogram',
+        'method': method,
+        'edges': [stats_utils.to_float(edge) for edge in edges],
+        'labels': [f"{_format_edge(lo)}-{_format_edge(hi)}" for lo, hi in zip(edges[:-1], edges[1:])],
+        'data': counts.tolist()
+    }
+
+
+def box_summary(values):
+    """Résumé en cinq nombres (avec moustaches à 1,5 IQR et nombre de valeurs aberrantes)"""
+    values = _clean(values)
+    if len(values) == 0:
+        return {'kind': 'box', 'count': 0}
+
+    minimum, q1, median, q3, maximum = np.percentile(values, [0, 25, 50, 75, 100])
+    iqr = q3 - q1
+    low_fence, high_fence = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = values[(values >= low_fence) & (values <= high_fence)]
+
+    return {
+        'kind': 'box',
+        'count': int(len(values)),
+        'min': stats_utils.to_float(minimum),
+        'q1': stats_utils.to_float(q1),
+        'median': stats_utils.to_float(median),
+        'q3': stats_utils.to_float(q3),
+        'max': stats_utils.to_float(maximum),
+        'mean': stats_utils.to_float(values.mean()),
+        'whisker_low': stats_utils.to_float(inside.min() if len(inside) else minimum),
+        'whisker_high': stats_utils.to_float(inside.max() if len(inside) else maximum),
+        'outliers_count': int(len(values) - len(inside))
+    }
+
+
+def lttb_indices(y, threshold):
+    """Indices retenus par l'algorithme Largest-Triangle-Three-Buckets (abscisse = index)"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    # Bornes des seaux intermédiaires (le premier et le dernier point sont fixes)
+    bounds = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    previous = 0
+
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        next_start, next_end = bounds[i + 1], (bounds[i + 2] if i + 2 < len(bounds) else n)
+        avg_x = (next_start + next_end - 1) / 2.0
+        avg_y = y[next_start:next_end].mean() if next_end > next_start else y[n - 1]
+
+        xs = np.arange(start, end)
+        areas = np.abs((previous - avg_x) * (y[start:end] - y[previous])
+                       - (previous - xs) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def downsample(values, points=DEFAULT_POINTS):
+    """Sous-échantillonne une série pour un graphique en ligne en préservant sa forme (LTTB)"""
+    values = np.asarray(values, dtype=np.float64)
+    points = max(3, int(points))
+    indices = lttb_indices(values, points)
+    return {
+        'kind': 'downsample',
+        'method': 'lttb',
+        'total_points': int(len(values)),
+        'labels': indices.tolist(),
+        'data': [stats_utils.to_float(value) for value in values[indices]]
+    }
@@ -0,0 +1,139 @@
+import numpy as np
+from PIL import Image
+try:
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    print("Warning: scikit-learn not available, k-means clustering disabled")
+
+# Cube RGB grossier de la méthode par histogramme : 4 bits par canal (4096 cases)
+HISTOGRAM_BITS = 4
+# Itérations de k-means pondéré sur les cases de l'histogramme
+HISTOGRAM_ITERATIONS = 10
+# Pas de quantification de la méthode fréquentielle
+FREQUENCY_STEP = 32
+
+
+def _kmeans(pixels, n_colors):
+    """K-means complet de scikit-learn (10 initialisations)"""
+    model = KMeans(n_clusters=n_colors, random_state=42, n_init=10)
+    model.fit(pixels)
+    return model.cluster_centers_, np.bincount(model.labels_, minlength=n_colors)
+
+
+def _minibatch(pixels, n_colors):
+    """K-means par mini-lots (scikit-learn), 3 initialisations"""
+    model = MiniBatchKMeans(n_clusters=n_colors, random_state=42, n_init=3, batch_size=2048)
+    labels = model.fit_predict(pixels)
+    return model.cluster_centers_, np.bincount(labels, minlength=n_colors)
+
+
+def _median_cut(pixels, n_colors):
+    """Quantification median-cut de Pillow (Image.quantize)"""
+    image = Image.fromarray(np.ascontiguousarray(pixels.reshape(1, -1, 3)), 'RGB')
+    quantized = image.quantize(colors=n_colors, method=Image.Quantize.MEDIANCUT)
+    indices = np.asarray(quantized).ravel()
+    palette = np.asarray(quantized.getpalette()[:3 * 256], dtype=np.float64).reshape(-1, 3)
+    counts = np.bincount(indices, minlength=len(palette))
+    used = np.flatnonzero(counts)
+    return palette[used], counts[used]
+
+
+def _histogram(pixels, n_colors):
+    """Histogramme 3D sur un cube RGB grossier, puis k-means pondéré sur les cases non vides.
+
+    Chaque case est représentée par la moyenne de ses pixels ; l'initialisation est
+    déterministe (case la plus peuplée, puis de proche en proche la case maximisant
+    effectif × distance² aux centres déjà choisis).
+    """
+    shift = 8 - HISTOGRAM_BITS
+    levels = 1 << HISTOGRAM_BITS
+    values = pixels.astype(np.int64)
+    bins = ((values[:, 0] >> shift) * levels + (values[:, 1] >> shift)) * levels + (values[:, 2] >> shift)
+    size = levels ** 3
+    weights = np.bincount(bins, minlength=size)
+    used = np.flatnonzero(weights)
+    weights = weights[used].astype(np.float64)
+    points = np.stack([np.bincount(bins, weights=values[:, channel], minlength=size)[used]
+                       for channel in range(3)], axis=1) / weights[:, None]
+
+    k = min(n_colors, len(points))
+    centers = np.empty((k, 3))
+    centers[0] = points[np.argmax(weights)]
+    distances = ((points - centers[0]) ** 2).sum(axis=1)
+    for i in range(1, k):
+        centers[i] = points[np.argmax(weights * distances)]
+        distances = np.minimum(distances, ((points - centers[i]) ** 2).sum(axis=1))
+
+    for _ in range(HISTOGRAM_ITERATIONS):
+        labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        totals = np.bincount(labels, weights=weights, minlength=k)
+        updated = np.stack([np.bincount(labels, weights=weights * points[:, channel], minlength=k)
+                            for channel in range(3)], axis=1)
+        filled = totals > 0
+        updated[filled] /= totals[filled, None]
+        updated[~filled] = centers[~filled]
+        if np.allclose(updated, centers):
+            break
+        centers = updated
+
+    labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    counts = np.bincount(labels, weights=weights, minlength=k).astype(np.int64)
+    return centers, counts
+
+
+def _frequency(pixels, n_colors):
+    """Couleurs les plus fréquentes après quantification par pas de FREQUENCY_STEP"""
+    quantized = (pixels // FREQUENCY_STEP).astype(np.int64)
+    levels = 256 // FREQUENCY_STEP
+    codes = (quantized[:, 0] * levels + quantized[:, 1]) * levels + quantized[:, 2]
+    counts = np.bincount(codes, minlength=levels ** 3)
+    top = np.argsort(-counts, kind='stable')[:n_colors]
+    top = top[counts[top] > 0]
+    centers = np.stack([top // (levels * levels), (top // levels) % levels, top % levels], axis=1)
+    return centers * FREQUENCY_STEP, counts[top]
+
+
+# Moteurs de quantification : fonction (pixels uint8 (N, 3), nombre de couleurs) -> (centres, effectifs)
+COLOR_ENGINES = {
+    'kmeans': {'function': _kmeans, 'requires_sklearn': True},
+    'minibatch': {'function': _minibatch, 'requires_sklearn': True},
+    'median_cut': {'function': _median_cut, 'requires_sklearn': False},
+    'histogram': {'function': _histogram, 'requires_sklearn': False},
+    'frequency': {'function': _frequency, 'requires_sklearn': False},
+}
+
+
+def get_available_engines():
+    """Noms des moteurs utilisables (ceux de scikit-learn seulement s'il est installé)"""
+    return [name for name, spec in COLOR_ENGINES.items() if SKLEARN_AVAILABLE or not spec['requires_sklearn']]
+
+
+def resolve_engine(name, fallback='histogram'):
+    """Valide le nom d'un moteur ; un moteur scikit-learn sans scikit-learn est remplacé par `fallback`"""
+    if name not in COLOR_ENGINES:
+        raise ValueError(f"Moteur de couleurs non supporté: {name} (possibles: {', '.join(COLOR_ENGINES)})")
+    if COLOR_ENGINES[name]['requires_sklearn'] and not SKLEARN_AVAILABLE:
+        return fallback
+    return name
+
+
+def dominant_colors(pixels, n_colors, engine):
+    """Couleurs dominantes de pixels RGB, triées par pourcentage décroissant"""
+    k = min(n_colors, len(pixels))
+    centers, counts = COLOR_ENGINES[engine]['function'](pixels, k)
+    total = len(pixels)
+    colors = []
+    for center, count in zip(np.clip(np.asarray(centers, dtype=np.float64), 0, 255), counts):
+        if count == 0:
+            continue
+        r, g, b = (int(value) for value in center)
+        colors.append({
+            'rgb': [r, g, b],
+            'hex': '#{:02x}{:02x}{:02x}'.format(r, g, b),
+            'frequency': int(count),
+            'percentage': round(float(count) / total * 100, 2)
+        })
+    colors.sort(key=lambda x: x['percentage'], reverse=True)
+    return colors
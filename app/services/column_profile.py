@@ -0,0 +1,149 @@
+import pandas as pd
+from app.utils import stats_utils
+
+# Quantiles précalculés pour les colonnes numériques
+PROFILE_QUANTILES = {'q05': 0.05, 'q25': 0.25, 'q50': 0.5, 'q75': 0.75, 'q95': 0.95}
+# Nombre de valeurs les plus fréquentes conservées pour les colonnes catégorielles
+TOP_K = 10
+
+NUMERIC_CHART_TYPES = ['bar', 'line', 'histogram', 'box', 'scatter']
+CATEGORICAL_CHART_TYPES = ['bar', 'pie', 'donut']
+
+
+def _numeric_profiles(df, numeric_cols):
+    """Calcule les profils des colonnes numériques (une réduction vectorisée par statistique)"""
+    if not numeric_cols:
+        return {}
+
+    num = df[numeric_cols]
+    counts = num.count()
+    nulls = len(num) - counts
+    uniques = num.nunique()
+    mins = num.min()
+    maxs = num.max()
+    means = num.mean()
+    stds = num.std()
+    # En float64 quelle que soit la disposition des blocs (un bloc float32 isolé, comme après un
+    # ajout de lignes, serait sinon interpolé en float32)
+    quantiles = num.astype('float64').quantile(list(PROFILE_QUANTILES.values()))
+
+    profiles = {}
+    for col in numeric_cols:
+        profiles[col] = {
+            'name': col,
+            'type': str(df[col].dtype),
+            'is_numeric': True,
+            'count': int(counts[col]),
+            'unique_count': int(uniques[col]),
+            'null_count': int(nulls[col]),
+            'min': stats_utils.to_float(mins[col]),
+            'max': stats_utils.to_float(maxs[col]),
+            'mean': stats_utils.to_float(means[col]),
+            'std': stats_utils.to_float(stds[col]),
+            'quantiles': {
+                key: stats_utils.to_float(quantiles.at[q, col])
+                for key, q in PROFILE_QUANTILES.items()
+            },
+            'chart_types': list(NUMERIC_CHART_TYPES)
+        }
+    return profiles
+
+
+def _categorical_profile(df, col):
+    """Calcule le profil d'une colonne catégorielle"""
+    series = df[col]
+    counts = stats_utils.value_counts(series)
+    non_null = int(counts.sum())
+    return {
+        'name': col,
+        'type': str(series.dtype),
+        'is_numeric': False,
+        'count': non_null,
+        'unique_count': int(len(counts)),
+        'null_count': int(len(series) - non_null),
+        'top_values': [
+            {'value': str(value), 'count': int(count)}
+            for value, count in counts.head(TOP_K).items()
+        ],
+        'chart_types': list(CATEGORICAL_CHART_TYPES)
+    }
+
+
+def build_profiles(df):
+    """Construit l'index des profils de colonnes d'un DataFrame.
+
+    Retourne un dictionnaire contenant les profils dans l'ordre des colonnes
+    ('columns', 'by_name') et les totaux du dataset ('dataset').
+    """
+    numeric_cols, categorical_cols = stats_utils.split_columns(df)
+    numeric = _numeric_profiles(df, numeric_cols)
+
+    columns = []
+    for col in df.columns:
+        columns.append(numeric[col] if col in numeric else _categorical_profile(df, col))
+
+    return _assemble_profiles(columns, numeric_cols, categorical_cols, len(df))
+
+
+def _assemble_profiles(columns, numeric_cols, categorical_cols, rows):
+    """Assemble l'index des profils et les totaux du dataset"""
+    total_cells = rows * len(columns)
+    missing_total = sum(profile['null_count'] for profile in columns)
+
+    return {
+        'columns': columns,
+        'by_name': {profile['name']: profile for profile in columns},
+        'dataset': {
+            'total_rows': rows,
+            'total_columns': len(columns),
+            'numeric_columns': numeric_cols,
+            'categorical_columns': categorical_cols,
+            'numeric_columns_count': len(numeric_cols),
+            'categorical_columns_count': len(categorical_cols),
+            'total_cells': total_cells,
+            'missing_values_total': missing_total,
+            'missing_percentage': round(missing_total / total_cells * 100, 2) if total_cells else 0
+        }
+    }
+
+
+def profiles_from_accumulators(accumulators, rows):
+    """Construit l'index des profils à partir d'accumulateurs en flux (lecture par morceaux).
+
+    Même structure que build_profiles ; les quantiles (et les comptes de valeurs
+    distinctes des colonnes numériques) sont des estimations.
+    """
+    columns = []
+    for acc in accumulators:
+        profile = {
+            'name': acc.name,
+            'type': acc.dtype,
+            'is_numeric': acc.is_numeric,
+            'count': acc.rows - acc.null_count,
+            'unique_count': acc.unique_count,
+            'null_count': acc.null_count,
+            'approximate': True
+        }
+        if acc.is_numeric:
+            moments = acc.moments
+            quantiles = acc.sketch.quantiles(list(PROFILE_QUANTILES.values()))
+            profile.update({
+                'min': stats_utils.to_float(moments.min) if moments.count else None,
+                'max': stats_utils.to_float(moments.max) if moments.count else None,
+                'mean': stats_utils.to_float(moments.mean) if moments.count else None,
+                'std': stats_utils.to_float(moments.std),
+                'quantiles': {key: stats_utils.to_float(value)
+                              for key, value in zip(PROFILE_QUANTILES, quantiles)},
+                'chart_types': list(NUMERIC_CHART_TYPES)
+            })
+        else:
+            profile.update({
+                'top_values': [{'value': str(value), 'count': int(count)}
+                               for value, count in acc.counter.most_common(TOP_K)],
+                'chart_types': list(CATEGORICAL_CHART_TYPES)
+            })
+        columns.append(profile)
+
+    numeric_cols = [acc.name for acc in accumulators if acc.is_numeric]
+    categorical_cols = [acc.name for acc in accumulators if not acc.is_numeric]
+    return _assemble_profiles(columns, numeric_cols, categorical_cols, rows)
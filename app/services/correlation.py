@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from app.utils import stats_utils
+
+CORRELATION_METHODS = ['pearson', 'spearman']
+# Nombre minimal de lignes communes pour qu'un coefficient soit défini
+MIN_PERIODS = 3
+DIGITS = 4
+
+
+class NumericMatrix:
+    """Colonnes numériques du dataset en une matrice float32 (ordre Fortran : colonnes contiguës)"""
+
+    def __init__(self, df):
+        self.columns, _ = stats_utils.split_columns(df)
+        self.positions = {col: i for i, col in enumerate(self.columns)}
+        self.values = np.asfortranarray(df[self.columns].to_numpy(dtype=np.float32, na_value=np.nan))
+
+    def select(self, columns, rows=None):
+        """Sous-matrice float64 des colonnes demandées (et des lignes `rows` si données)"""
+        unknown = [col for col in columns if col not in self.positions]
+        if unknown:
+            raise ValueError(f"Colonnes numériques non trouvées: {', '.join(unknown)}")
+        values = self.values[:, [self.positions[col] for col in columns]]
+        if rows is not None:
+            values = values[rows]
+        return values.astype(np.float64)
+
+
+def build_numeric_matrix(df):
+    """Construit la matrice numérique d'un DataFrame normalisé"""
+    return NumericMatrix(df)
+
+
+def _rank_columns(values):
+    """Rangs moyens par colonne (les valeurs manquantes restent manquantes)"""
+    return pd.DataFrame(values).rank(method='average').to_numpy(dtype=np.float64)
+
+
+def pairwise_moments(values):
+    """Covariances et corrélations sur les lignes communes à chaque paire de colonnes.
+
+    Quatre produits matriciels (BLAS) suffisent : effectifs, sommes, sommes croisées
+    et sommes des carrés sur les lignes où les deux colonnes sont renseignées.
+    Retourne (corrélations, covariances, effectifs).
+    """
+    present = ~np.isnan(values)
+    # Centrage préalable pour limiter les pertes de précision dans les sommes
+    centered = values - np.nanmean(values, axis=0) if len(values) else values
+    filled = np.where(present, centered, 0.0)
+    weights = present.astype(np.float64)
+
+    counts = weights.T @ weights
+    sums = filled.T @ weights
+    cross = filled.T @ filled
+    squares = (filled * filled).T @ weights
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = (cross - sums * sums.T / counts) / (counts - 1)
+        variance_x = squares - sums * sums / counts
+        variance_y = variance_x.T
+        correlation = (cross - sums * sums.T / counts) / np.sqrt(variance_x * variance_y)
+
+    undefined = counts < MIN_PERIODS
+    covariance[undefined] = np.nan
+    correlation[undefined] = np.nan
+    correlation = np.clip(correlation, -1.0, 1.0)
+    np.fill_diagonal(correlation, np.where(np.diag(counts) >= MIN_PERIODS, 1.0, np.nan))
+    return correlation, covariance, counts
+
+
+def upper_triangle(matrix, digits=DIGITS):
+    """Triangle supérieur (diagonale comprise), ligne par ligne, arrondi (None si indéfini)"""
+    rows, cols = np.triu_indices(len(matrix))
+    return [None if value != value else round(float(value), digits) for value in matrix[rows, cols]]
+
+
+def spearman_moments(values):
+    """Corrélations de Spearman (et covariances des rangs) sur les lignes communes à chaque paire.
+
+    Les colonnes sont classées une fois sur toutes leurs lignes renseignées ; ces rangs
+    ne valent pour une paire que si les deux colonnes ont les mêmes valeurs manquantes.
+    Les autres paires sont reclassées sur leurs seules lignes communes, comme
+    DataFrame.corr(method='spearman') : les colonnes étant groupées par masque de
+    présence, un classement suffit pour chaque couple de groupes.
+    Retourne (corrélations, covariances, effectifs).
+    """
+    correlation, covariance, counts = pairwise_moments(_rank_columns(values))
+    present = ~np.isnan(values)
+    _, groups = np.unique(present.T, axis=0, return_inverse=True)
+    groups = np.ravel(groups)
+    for first, second in zip(*np.triu_indices(groups.max() + 1 if len(groups) else 0, 1)):
+        left = np.flatnonzero(groups == first)
+        right = np.flatnonzero(groups == second)
+        common = present[:, left[0]] & present[:, right[0]]
+        if common.sum() < MIN_PERIODS:
+            continue
+        columns = np.concatenate([left, right])
+        pair_correlation, pair_covariance, _ = pairwise_moments(_rank_columns(values[common][:, columns]))
+        block = np.ix_(left, right)
+        cross = np.ix_(np.arange(len(left)), np.arange(len(left), len(columns)))
+        correlation[block] = pair_correlation[cross]
+        covariance[block] = pair_covariance[cross]
+        correlation[np.ix_(right, left)] = pair_correlation[cross].T
+        covariance[np.ix_(right, left)] = pair_covariance[cross].T
+    return correlation, covariance, counts
+
+
+def correlate(values, method='pearson'):
+    """Corrélations (et covariances) des colonnes d'une matrice float64"""
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Méthode de corrélation non supportée: {method} (possibles: {', '.join(CORRELATION_METHODS)})")
+    if method == 'spearman':
+        return spearman_moments(values)
+    return pairwise_moments(values)
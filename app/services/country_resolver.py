@@ -0,0 +1,82 @@
+import os
+import re
+import json
+import threading
+import unicodedata
+
+# Référentiel des pays : codes FIFA/ISO, nom, alias et coordonnées (centre approximatif)
+def get_gazetteer_path():
+    """Retourne le chemin du fichier des pays"""
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    return os.path.join(base_dir, 'data', 'countries.json')
+
+GAZETTEER_FILE = get_gazetteer_path()
+
+# Ordre de priorité des clés : en cas de collision, la première clé indexée l'emporte
+KEY_FIELDS = ['fifa', 'name', 'iso3', 'aliases', 'iso2']
+# Codes à trois lettres acceptés comme dernier élément du format "xx ABC" (ex. "fr FRA", "eng ENG")
+CODE_FIELDS = ['fifa', 'iso3']
+PREFIXED_CODE = re.compile(r'^[a-z]{2,3} ([a-z]{3})$')
+
+
+def normalize_key(text):
+    """Normalise un nom ou code de pays (minuscules, sans accents ni ponctuation)"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    text = re.sub(r"[^a-z0-9]+", ' ', text.lower())
+    return text.strip()
+
+
+class CountryResolver:
+    """Résout codes FIFA/ISO, noms et alias de pays via un index précalculé (recherche O(1))"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self._index = {}
+        self._codes = {}
+        for field in CODE_FIELDS:
+            for entry in entries:
+                if entry.get(field):
+                    self._codes.setdefault(normalize_key(entry[field]), entry)
+        for field in KEY_FIELDS:
+            for entry in entries:
+                values = entry.get(field) or []
+                for value in (values if isinstance(values, list) else [values]):
+                    self._index.setdefault(normalize_key(value), entry)
+
+    def resolve(self, nation):
+        """Retourne l'entrée du pays correspondant (None si inconnu)"""
+        if nation is None:
+            return None
+        key = normalize_key(nation)
+        entry = self._index.get(key)
+        if entry is None:
+            # Format "fr FRA" seulement : le code FIFA / ISO3 final. Les mots d'un nom composé
+            # ne sont pas essayés seuls ("South Sudan" n'est pas "Sudan")
+            match = PREFIXED_CODE.match(key)
+            if match:
+                entry = self._codes.get(match.group(1))
+        return entry
+
+    def __len__(self):
+        return len(self._index)
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def load_resolver(path=None):
+    """Construit un résolveur à partir d'un fichier de pays"""
+    with open(path or GAZETTEER_FILE, 'r', encoding='utf-8') as f:
+        return CountryResolver(json.load(f))
+
+
+def get_resolver():
+    """Retourne le résolveur partagé (chargé une seule fois)"""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = load_resolver()
+    return _resolver
@@ -2,6 +2,12 @@ import pandas as pd
 import os
 import numpy as np
 from app.utils import stats_utils
+from app.config import Config
+from app.services.dataset_manager import DatasetManager
+from app.services import dataset_snapshot, player_schema, column_profile, query_filter, aggregation, binning, country_resolver
+from app.services import streaming_stats, similarity, leaderboard, player_index, percentile_rank, derived_metrics
+from app.services import correlation, ingestion
+from app.utils.lru_cache import LRUCache
 
 # Chemin relatif depuis la racine du projet
 def get_csv_path():
@@ -11,107 +17,377 @@ def get_csv_path():
 
 CSV_FILE = get_csv_path()
 
+def _read_csv(filename, **kwargs):
+    """Lit un CSV avec gestion des erreurs d'encodage"""
+    try:
+        return pd.read_csv(filename, encoding='utf-8', **kwargs)
+    except UnicodeDecodeError:
+        return pd.read_csv(filename, encoding='latin-1', **kwargs)
+
 def load_csv(filename=None):
-    """Charge le fichier CSV"""
+    """Charge le fichier CSV en appliquant le schéma déclaré en une seule passe"""
     if filename is None:
         filename = CSV_FILE
     
     if not os.path.exists(filename):
         raise FileNotFoundError(f"Fichier {filename} non trouvé")
     
-    # Charger avec gestion des erreurs d'encodage
+    raw_columns = _read_csv(filename, nrows=0).columns
+    dtypes = player_schema.get_read_dtypes(raw_columns)
+    
     try:
-        df = pd.read_csv(filename, encoding='utf-8')
-    except UnicodeDecodeError:
-        df = pd.read_csv(filename, encoding='latin-1')
+        df = _read_csv(filename, dtype=dtypes, thousands=player_schema.CSV_THOUSANDS,
+                       decimal=player_schema.CSV_DECIMAL)
+    except ValueError as e:
+        # Valeurs non numériques dans une colonne numérique : relecture en texte
+        # puis conversion explicite (les valeurs invalides deviennent NaN)
+        print(f"Warning: Valeurs non conformes au schéma dans {filename}: {e}")
+        text_dtypes = {name: (dtype if dtype == 'category' else str) for name, dtype in dtypes.items()}
+        df = _read_csv(filename, dtype=text_dtypes)
     
     return df
 
 def normalize_data(df):
-    """Normalise les données du CSV"""
-    df_normalized = df.copy()
-    
-    # Nettoyer les noms de colonnes (supprimer espaces)
-    df_normalized.columns = df_normalized.columns.str.strip()
-    
-    # Normaliser spécifiquement la colonne "age" si elle existe
-    if 'age' in df_normalized.columns or 'Age' in df_normalized.columns:
-        age_col = 'age' if 'age' in df_normalized.columns else 'Age'
-        # Extraire seulement la première valeur (avant le tiret si présent)
-        df_normalized[age_col] = df_normalized[age_col].astype(str).str.split('-').str[0].str.split('/').str[0]
-        # Convertir en float
-        df_normalized[age_col] = pd.to_numeric(df_normalized[age_col], errors='coerce')
-    
-    # Convertir les colonnes numériques (gérer les virgules comme séparateurs décimaux)
-    numeric_columns = df_normalized.select_dtypes(include=[object]).columns
-    for col in numeric_columns:
-        if col not in ['Player name', 'Nation', 'Position', 'Squad', 'Compition', 'age', 'Age']:
-            try:
-                # Remplacer les virgules par des points pour les nombres
-                df_normalized[col] = df_normalized[col].astype(str).str.replace(',', '.')
-                df_normalized[col] = pd.to_numeric(df_normalized[col], errors='coerce')
-            except:
-                pass
+    """Normalise les données du CSV selon le schéma déclaré (types compacts, valeurs manquantes à 0)"""
+    df_normalized = df.rename(columns=lambda name: name.strip())
+    
+    unexpected = player_schema.get_unexpected_columns(df_normalized.columns)
+    if unexpected:
+        print(f"Warning: Colonnes absentes du schéma (non converties): {unexpected}")
+    
+    return player_schema.apply_schema(df_normalized)
+
+def _build_schema_report(df):
+    """Rapport de schéma des colonnes natives (les métriques dérivées sont listées à part)"""
+    derived = [col for col in df.columns if col in derived_metrics.DERIVED_METRICS]
+    report = player_schema.build_schema_report(df.drop(columns=derived))
+    report['derived_columns'] = derived
+    return report
+
+def get_schema_report():
+    """Rapport de conformité au schéma et mémoire économisée par les types compacts"""
+    if use_chunked_ingestion():
+        return get_chunked_summary()['schema']
+    return _dataset.get_derived('schema_report', _build_schema_report)
+
+# Colonnes dérivées mémorisées par empreinte de leurs entrées, d'une version du dataset à l'autre
+_derived_store = derived_metrics.DerivedMetricsStore()
+
+def _load_dataset(filename):
+    """Charge les données normalisées et ajoute les métriques dérivées du registre"""
+    return _derived_store.add_columns(_load_normalized(filename))
+
+def _load_normalized(filename):
+    """Charge les données normalisées depuis l'instantané colonnaire, ou depuis le CSV"""
+    if not Config.CSV_SNAPSHOT_ENABLED:
+        return normalize_data(load_csv(filename))
+
+    if not os.path.exists(filename):
+        raise FileNotFoundError(f"Fichier {filename} non trouvé")
+
+    key = dataset_snapshot.source_key(filename)
+    df = dataset_snapshot.load_snapshot(Config.CSV_SNAPSHOT_DIR, key)
+    if df is not None:
+        return df
+
+    df = normalize_data(load_csv(filename))
+    try:
+        dataset_snapshot.write_snapshot(df, Config.CSV_SNAPSHOT_DIR, key)
+    except OSError as e:
+        print(f"Warning: Impossible d'écrire l'instantané du dataset: {e}")
+    return df
+
+def build_snapshot(filename=None, snapshot_dir=None):
+    """Construit (ou reconstruit) l'instantané colonnaire du CSV"""
+    if filename is None:
+        filename = CSV_FILE
+    if snapshot_dir is None:
+        snapshot_dir = Config.CSV_SNAPSHOT_DIR
+    df = normalize_data(load_csv(filename))
+    key = dataset_snapshot.source_key(filename)
+    return dataset_snapshot.write_snapshot(df, snapshot_dir, key, overwrite=True)
+
+_dataset = DatasetManager(CSV_FILE, _load_dataset)
+# Résultats des requêtes, indexés par (requête, version du dataset)
+_query_cache = LRUCache(Config.CSV_QUERY_CACHE_SIZE)
+
+def get_dataframe():
+    """Retourne une vue en lecture seule des données normalisées mises en cache"""
+    return _dataset.get_frame()
+
+def get_cache_stats():
+    """Retourne les compteurs du cache du dataset et du cache des requêtes"""
+    stats = _dataset.get_stats()
+    stats['queries'] = _query_cache.get_stats()
+    stats['derived_metrics'] = _derived_store.get_stats()
+    stats['ingestion_mode'] = 'chunked' if use_chunked_ingestion() else 'memory'
+    return stats
+
+def _cached_query(name, params, compute):
+    """Exécute une requête en la mettant en cache pour la version courante du dataset"""
+    key = (name, _dataset.version, params)
+    return _query_cache.get_or_compute(key, compute)
+
+# Lecture par morceaux : nombre de lignes échantillonnées pour estimer la taille d'une ligne,
+# et facteur couvrant les tampons du parseur et la copie normalisée d'un morceau
+CHUNK_SAMPLE_ROWS = 1000
+CHUNK_MEMORY_OVERHEAD = 4
+MIN_CHUNK_ROWS = 1000
+
+_chunked_summaries = LRUCache(4)
+
+def use_chunked_ingestion(filename=None):
+    """Indique si le fichier est traité par morceaux ('chunked', ou 'auto' au-delà du seuil de taille)"""
+    mode = Config.CSV_INGESTION_MODE
+    if mode == 'chunked':
+        return True
+    if mode != 'auto':
+        return False
+    filename = filename or CSV_FILE
+    return os.path.exists(filename) and os.path.getsize(filename) > Config.CSV_CHUNKED_THRESHOLD_MB * 1024 * 1024
+
+def estimate_chunk_rows(filename, memory_limit_mb, encoding='utf-8'):
+    """Estime le nombre de lignes par morceau respectant le plafond mémoire"""
+    raw_columns = pd.read_csv(filename, encoding=encoding, nrows=0).columns
+    sample = pd.read_csv(filename, encoding=encoding, nrows=CHUNK_SAMPLE_ROWS,
+                         dtype=player_schema.get_read_dtypes(raw_columns),
+                         thousands=player_schema.CSV_THOUSANDS, decimal=player_schema.CSV_DECIMAL)
+    if len(sample) == 0:
+        return MIN_CHUNK_ROWS
+    bytes_per_row = sample.memory_usage(deep=True, index=False).sum() / len(sample)
+    rows = int(memory_limit_mb * 1024 * 1024 / (bytes_per_row * CHUNK_MEMORY_OVERHEAD))
+    return max(MIN_CHUNK_ROWS, rows)
+
+def _summarize_chunks(filename, encoding, chunk_rows, strict=True):
+    """Parcourt le CSV morceau par morceau et alimente les accumulateurs en flux"""
+    raw_columns = pd.read_csv(filename, encoding=encoding, nrows=0).columns
+    dtypes = player_schema.get_read_dtypes(raw_columns)
+    if not strict:
+        dtypes = {name: (dtype if dtype == 'category' else str) for name, dtype in dtypes.items()}
+    
+    accumulators = None
+    rows = 0
+    chunks = 0
+    reader = pd.read_csv(filename, encoding=encoding, dtype=dtypes, chunksize=chunk_rows,
+                         thousands=player_schema.CSV_THOUSANDS, decimal=player_schema.CSV_DECIMAL)
+    with reader:
+        for chunk in reader:
+            chunk = player_schema.apply_schema(chunk.rename(columns=lambda name: name.strip()))
+            chunk = derived_metrics.add_derived_columns(chunk)
+            if accumulators is None:
+                accumulators = streaming_stats.build_accumulators(chunk)
+            streaming_stats.update_accumulators(accumulators, chunk)
+            rows += len(chunk)
+            chunks += 1
+    
+    summary = _summary_from_accumulators(accumulators or [], rows)
+    summary['ingestion'] = {
+        'mode': 'chunked',
+        'encoding': encoding,
+        'chunks': chunks,
+        'chunk_rows': chunk_rows
+    }
+    return summary
+
+def _summary_from_accumulators(accumulators, rows):
+    """Résumé du dataset (profils, nationalités, schéma) à partir des accumulateurs en flux"""
+    columns = [acc.name for acc in accumulators if acc.name not in derived_metrics.DERIVED_METRICS]
+    nation = next((acc for acc in accumulators if acc.name == 'Nation'), None)
+    return {
+        'rows': rows,
+        'accumulators': accumulators,
+        'profiles': _annotate_derived(column_profile.profiles_from_accumulators(accumulators, rows)),
+        'nationality_counts': dict(nation.counter.most_common()) if nation is not None else None,
+        'schema': {
+            'unexpected_columns': player_schema.get_unexpected_columns(columns),
+            'missing_columns': player_schema.get_missing_columns(columns),
+            'dtypes': {acc.name: acc.dtype for acc in accumulators if acc.name in columns},
+            'memory': None,
+            'derived_columns': [acc.name for acc in accumulators if acc.name not in columns]
+        }
+    }
+
+def summarize_chunked(filename=None, memory_limit_mb=None, chunk_rows=None):
+    """Calcule profils de colonnes et effectifs par nationalité en lisant le CSV par morceaux.
     
-    # Remplacer les valeurs manquantes par 0 pour les colonnes numériques
-    numeric_cols = df_normalized.select_dtypes(include=[np.number]).columns
-    df_normalized[numeric_cols] = df_normalized[numeric_cols].fillna(0)
+    La mémoire utilisée est bornée par la taille d'un morceau (déduite de
+    `memory_limit_mb`) et par les accumulateurs, de taille fixe.
+    """
+    filename = filename or CSV_FILE
+    if not os.path.exists(filename):
+        raise FileNotFoundError(f"Fichier {filename} non trouvé")
+    if memory_limit_mb is None:
+        memory_limit_mb = Config.CSV_CHUNK_MEMORY_MB
     
+    for encoding in ('utf-8', 'latin-1'):
+        try:
+            rows = chunk_rows or estimate_chunk_rows(filename, memory_limit_mb, encoding)
+            try:
+                return _summarize_chunks(filename, encoding, rows)
+            except UnicodeDecodeError:
+                raise
+            except ValueError as e:
+                print(f"Warning: Valeurs non conformes au schéma dans {filename}: {e}")
+                return _summarize_chunks(filename, encoding, rows, strict=False)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Encodage du fichier {filename} non reconnu")
+
+def get_chunked_summary():
+    """Retourne le résumé par morceaux du CSV courant (calculé une fois par version du fichier)"""
+    if not os.path.exists(CSV_FILE):
+        raise FileNotFoundError(f"Fichier {CSV_FILE} non trouvé")
+    key = dataset_snapshot.source_key(CSV_FILE)
+    return _chunked_summaries.get_or_compute(key, lambda: summarize_chunked(CSV_FILE))
+
+def get_filter_index():
+    """Index bitmap des colonnes catégorielles (construit une fois par version du dataset)"""
+    return _dataset.get_derived('filter_index', query_filter.build_index)
+
+def _filter_positions(df_normalized, filters):
+    """Positions des lignes satisfaisant les filtres (index bitmap pour les colonnes catégorielles)"""
+    if not filters:
+        return np.arange(len(df_normalized))
+    return query_filter.filter_positions(df_normalized, filters, get_filter_index())
+
+def _check_filters_available(filters):
+    """Refuse les filtres en lecture par morceaux (ValueError) : ils exigent le dataset en mémoire"""
+    if filters and use_chunked_ingestion():
+        raise ValueError("Les filtres ne sont pas disponibles en lecture par morceaux (CSV_INGESTION_MODE)")
+
+def _filtered_frame(filters):
+    """DataFrame restreint aux lignes satisfaisant les filtres"""
+    _check_filters_available(filters)
+    df_normalized = get_dataframe()
+    positions = _filter_positions(df_normalized, filters)
+    if len(positions) != len(df_normalized):
+        df_normalized = df_normalized.take(positions)
     return df_normalized
 
+def get_filter_options():
+    """Colonnes indexées et valeurs disponibles pour construire des filtres"""
+    index = get_filter_index()
+    summary = index.describe()
+    for col, info in summary['columns'].items():
+        info['values_list'] = index.get_values(col)
+        if info['multi_valued']:
+            info['tokens_list'] = index.get_tokens(col)
+    summary['operators'] = ['=', '!=', '>', '>=', '<', '<=', 'contains']
+    return summary
+
+def _json_ready(data):
+    """Élargit les colonnes float32 en float64 arrondis (évite 0.8999999761581421 en JSON)"""
+    if isinstance(data, pd.Series):
+        return data.astype('float64').round(6) if data.dtype == np.float32 else data
+    float32_cols = [col for col in data.columns if data[col].dtype == np.float32]
+    if not float32_cols:
+        return data
+    return data.astype({col: 'float64' for col in float32_cols}).round({col: 6 for col in float32_cols})
+
 def get_csv_data():
     """Récupère les données normalisées du CSV"""
-    df = load_csv()
-    df_normalized = normalize_data(df)
-    return df_normalized.to_dict(orient='records')
+    df_normalized = get_dataframe()
+    return _json_ready(df_normalized).to_dict(orient='records')
 
-def get_columns_info():
-    """Récupère les informations sur les colonnes"""
-    df = load_csv()
-    df_normalized = normalize_data(df)
-    
-    columns_info = []
-    for col in df_normalized.columns:
-        col_info = {
-            'name': col,
-            'type': str(df_normalized[col].dtype),
-            'is_numeric': pd.api.types.is_numeric_dtype(df_normalized[col]),
-            'unique_count': df_normalized[col].nunique(),
-            'null_count': int(df_normalized[col].isnull().sum())
+def _select_rows(columns=None, filters=None, offset=0, limit=None):
+    """Sélectionne colonnes et positions de lignes (sans copier les lignes retenues)"""
+    df_normalized = get_dataframe()
+    
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset et limit doivent être positifs")
+    
+    positions = _filter_positions(df_normalized, filters)
+    
+    if columns:
+        unknown = [col for col in columns if col not in df_normalized.columns]
+        if unknown:
+            raise ValueError(f"Colonnes non trouvées: {', '.join(unknown)}")
+        df_normalized = df_normalized[columns]
+    
+    total = len(positions)
+    end = total if limit is None else min(total, offset + limit)
+    return df_normalized, positions[offset:end], total
+
+def get_csv_page(columns=None, filters=None, offset=0, limit=None):
+    """Récupère une page de lignes (projection de colonnes, filtres, offset/limit)"""
+    df_normalized, positions, total = _select_rows(columns, filters, offset, limit)
+    page = _json_ready(df_normalized.take(positions))
+    next_offset = offset + len(positions)
+    
+    return {
+        'rows': page.to_dict(orient='records'),
+        'pagination': {
+            'offset': offset,
+            'limit': limit,
+            'returned': len(positions),
+            'total': total,
+            'next_offset': next_offset if next_offset < total else None
         }
-        
-        if col_info['is_numeric']:
-            col_info['min'] = float(df_normalized[col].min())
-            col_info['max'] = float(df_normalized[col].max())
-            col_info['mean'] = float(df_normalized[col].mean())
-            col_info['std'] = float(df_normalized[col].std())
-        
-        columns_info.append(col_info)
+    }
+
+def iter_csv_export(columns=None, filters=None, offset=0, limit=None, export_format='ndjson', chunk_size=None):
+    """Prépare un export en flux (NDJSON ou CSV) écrit par morceaux depuis le dataset en cache.
+    
+    La sélection est validée immédiatement ; le générateur retourné sérialise
+    ensuite `chunk_size` lignes à la fois sans construire la liste complète.
+    """
+    if export_format not in ('ndjson', 'csv'):
+        raise ValueError(f"Format d'export non supporté: {export_format}")
+    if chunk_size is None:
+        chunk_size = Config.CSV_EXPORT_CHUNK_SIZE
+    
+    df_normalized, positions, _ = _select_rows(columns, filters, offset, limit)
+    
+    def generate():
+        if export_format == 'csv' and len(positions) == 0:
+            yield df_normalized.iloc[0:0].to_csv(index=False)
+        for start in range(0, len(positions), chunk_size):
+            chunk = _json_ready(df_normalized.take(positions[start:start + chunk_size]))
+            if export_format == 'csv':
+                yield chunk.to_csv(index=False, header=(start == 0))
+            else:
+                yield chunk.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n'
     
-    return columns_info
+    return generate()
+
+def _annotate_derived(profiles):
+    """Signale les métriques dérivées dans les profils (expression, dépendances)"""
+    for profile in profiles['columns']:
+        profile['derived'] = profile['name'] in derived_metrics.DERIVED_METRICS
+        if profile['derived']:
+            profile.update(derived_metrics.describe(profile['name']))
+    return profiles
+
+def _build_column_profiles(df):
+    """Construit l'index des profils de colonnes, métriques dérivées comprises"""
+    return _annotate_derived(column_profile.build_profiles(df))
+
+def get_column_profiles(filters=None):
+    """Retourne l'index des profils de colonnes (construit une fois par version du dataset)
+    
+    Avec des filtres, les profils sont calculés sur les lignes retenues et mis en cache par requête.
+    """
+    if filters:
+        return _cached_query('column_profiles', tuple(filters),
+                             lambda: _build_column_profiles(_filtered_frame(filters)))
+    if use_chunked_ingestion():
+        return get_chunked_summary()['profiles']
+    return _dataset.get_derived('column_profiles', _build_column_profiles)
+
+def get_columns_info(filters=None):
+    """Récupère les informations sur les colonnes"""
+    return get_column_profiles(filters)['columns']
 
 def get_available_chart_types(column_name):
     """Détermine les types de graphiques disponibles pour une colonne"""
-    df = load_csv()
-    df_normalized = normalize_data(df)
-    
-    if column_name not in df_normalized.columns:
+    profile = get_column_profiles()['by_name'].get(column_name)
+    if profile is None:
         return []
-    
-    col = df_normalized[column_name]
-    chart_types = []
-    
-    if pd.api.types.is_numeric_dtype(col):
-        chart_types.extend(['bar', 'line', 'histogram', 'box', 'scatter'])
-    else:
-        chart_types.extend(['bar', 'pie', 'donut'])
-    
-    return chart_types
+    return profile['chart_types']
 
-def get_column_data(column_name, limit=100):
+def get_column_data(column_name, limit=100, filters=None):
     """Récupère les données d'une colonne pour visualisation"""
-    df = load_csv()
-    df_normalized = normalize_data(df)
+    df_normalized = _filtered_frame(filters)
     
     if column_name not in df_normalized.columns:
         raise ValueError(f"Colonne {column_name} non trouvée")
@@ -120,21 +396,20 @@ def get_column_data(column_name, limit=100):
     
     if pd.api.types.is_numeric_dtype(col):
         # Pour les colonnes numériques, retourner les valeurs
-        data = col.dropna().head(limit).tolist()
+        data = _json_ready(col.dropna().head(limit)).tolist()
         return {'type': 'numeric', 'data': data, 'labels': list(range(len(data)))}
     else:
         # Pour les colonnes catégorielles, compter les occurrences
-        value_counts = col.value_counts().head(limit)
+        value_counts = stats_utils.value_counts(col).head(limit)
         return {
             'type': 'categorical',
             'data': value_counts.values.tolist(),
             'labels': value_counts.index.tolist()
         }
 
-def get_multiple_columns_data(columns, limit=100):
+def get_multiple_columns_data(columns, limit=100, filters=None):
     """Récupère les données de plusieurs colonnes pour visualisation multi-colonnes"""
-    df = load_csv()
-    df_normalized = normalize_data(df)
+    df_normalized = _filtered_frame(filters)
     
     result = {}
     for col_name in columns:
@@ -143,14 +418,14 @@ def get_multiple_columns_data(columns, limit=100):
         
         col = df_normalized[col_name]
         if pd.api.types.is_numeric_dtype(col):
-            data = col.dropna().head(limit).tolist()
+            data = _json_ready(col.dropna().head(limit)).tolist()
             result[col_name] = {
                 'type': 'numeric',
                 'data': data,
                 'labels': list(range(len(data)))
             }
         else:
-            value_counts = col.value_counts().head(limit)
+            value_counts = stats_utils.value_counts(col).head(limit)
             result[col_name] = {
                 'type': 'categorical',
                 'data': value_counts.values.tolist(),
@@ -159,170 +434,83 @@ def get_multiple_columns_data(columns, limit=100):
     
     return result
 
-def get_nationality_map_data():
-    """Récupère les données pour la carte des nationalités avec coordonnées géographiques"""
-    df = load_csv()
-    df_normalized = normalize_data(df)
-    
-    if 'Nation' not in df_normalized.columns:
-        return {}
-    
-    # Mapping des pays vers leurs coordonnées (latitude, longitude)
-    # Coordonnées approximatives des capitales des pays
-    country_coordinates = {
-        'France': [46.2276, 2.2137],
-        'Brazil': [-14.2350, -51.9253],
-        'Argentina': [-38.4161, -63.6167],
-        'Spain': [40.4637, -3.7492],
-        'Germany': [51.1657, 10.4515],
-        'Italy': [41.8719, 12.5674],
-        'Portugal': [39.3999, -8.2245],
-        'England': [52.3555, -1.1743],
-        'Netherlands': [52.1326, 5.2913],
-        'Belgium': [50.5039, 4.4699],
-        'Croatia': [45.1000, 15.2000],
-        'Senegal': [14.4974, -14.4524],
-        'Morocco': [31.7917, -7.0926],
-        'Algeria': [28.0339, 1.6596],
-        'Tunisia': [33.8869, 9.5375],
-        'Cameroon': [7.3697, 12.3547],
-        'Ivory Coast': [7.5400, -5.5471],
-        'Ghana': [7.9465, -1.0232],
-        'Nigeria': [9.0820, 8.6753],
-        'Egypt': [26.0975, 30.0444],
-        'South Africa': [-30.5595, 22.9375],
-        'Mali': [17.5707, -3.9962],
-        'Burkina Faso': [12.2383, -1.5616],
-        'Guinea': [9.9456, -9.6966],
-        'Congo': [-4.0383, 21.7587],
-        'DR Congo': [-4.0383, 21.7587],
-        'Angola': [-11.2027, 17.8739],
-        'Gabon': [-0.8037, 11.6094],
-        'Togo': [8.6195, 0.8248],
-        'Benin': [9.3077, 2.3158],
-        'United States': [37.0902, -95.7129],
-        'Mexico': [23.6345, -102.5528],
-        'Canada': [56.1304, -106.3468],
-        'Colombia': [4.5709, -74.2973],
-        'Chile': [-35.6751, -71.5430],
-        'Uruguay': [-32.5228, -55.7658],
-        'Paraguay': [-23.4425, -58.4438],
-        'Peru': [-9.1900, -75.0152],
-        'Ecuador': [-1.8312, -78.1834],
-        'Venezuela': [6.4238, -66.5897],
-        'Bolivia': [-16.2902, -63.5887],
-        'Japan': [36.2048, 138.2529],
-        'South Korea': [35.9078, 127.7669],
-        'China': [35.8617, 104.1954],
-        'Australia': [-25.2744, 133.7751],
-        'New Zealand': [-40.9006, 174.8860],
-        'India': [20.5937, 78.9629],
-        'Thailand': [15.8700, 100.9925],
-        'Indonesia': [-0.7893, 113.9213],
-        'Philippines': [12.8797, 121.7740],
-        'Saudi Arabia': [23.8859, 45.0792],
-        'Iran': [32.4279, 53.6880],
-        'Iraq': [33.2232, 43.6793],
-        'Turkey': [38.9637, 35.2433],
-        'Russia': [61.5240, 105.3188],
-        'Ukraine': [48.3794, 31.1656],
-        'Poland': [51.9194, 19.1451],
-        'Czech Republic': [49.8175, 15.4730],
-        'Slovakia': [48.6690, 19.6990],
-        'Hungary': [47.1625, 19.5033],
-        'Romania': [45.9432, 24.9668],
-        'Bulgaria': [42.7339, 25.4858],
-        'Serbia': [44.0165, 21.0059],
-        'Bosnia': [43.9159, 17.6791],
-        'Greece': [39.0742, 21.8243],
-        'Sweden': [60.1282, 18.6435],
-        'Norway': [60.4720, 8.4689],
-        'Denmark': [56.2639, 9.5018],
-        'Finland': [61.9241, 25.7482],
-        'Iceland': [64.9631, -19.0208],
-        'Ireland': [53.4129, -8.2439],
-        'Scotland': [56.4907, -4.2026],
-        'Wales': [52.1307, -3.7837],
-        'Switzerland': [46.8182, 8.2275],
-        'Austria': [47.5162, 14.5501],
-        'Israel': [31.0461, 34.8516],
-        'Lebanon': [33.8547, 35.8623],
-        'Jordan': [30.5852, 36.2384],
-        'Qatar': [25.3548, 51.1839],
-        'UAE': [23.4241, 53.8478],
-        'Kuwait': [29.3117, 47.4818],
-        'Oman': [21.4735, 55.9754],
-        'Yemen': [15.5527, 48.5164],
-        'Syria': [34.8021, 38.9968],
-        'Palestine': [31.9522, 35.2332],
-    }
+def _nationality_map_from_counts(nationality_counts, total_players):
+    """Construit les données de la carte à partir des effectifs par nationalité"""
+    resolver = country_resolver.get_resolver()
     
-    nationality_counts = df_normalized['Nation'].value_counts().to_dict()
-    
-    # Préparer les données avec coordonnées
     map_points = []
+    unresolved = []
     for nation, count in nationality_counts.items():
-        # Nettoyer le nom du pays (supprimer espaces, normaliser)
         nation_clean = nation.strip() if isinstance(nation, str) else str(nation)
+        country = resolver.resolve(nation_clean)
         
-        # Chercher les coordonnées (essayer plusieurs variantes)
-        coords = None
-        if nation_clean in country_coordinates:
-            coords = country_coordinates[nation_clean]
-        else:
-            # Essayer de trouver une correspondance partielle
-            for country, coord in country_coordinates.items():
-                if country.lower() in nation_clean.lower() or nation_clean.lower() in country.lower():
-                    coords = coord
-                    break
-        
-        # Si pas de coordonnées trouvées, utiliser des coordonnées par défaut (centre du monde)
-        if coords is None:
-            # Coordonnées par défaut (centre de l'Afrique)
-            coords = [10.0, 10.0]
+        # Les nations inconnues du référentiel sont signalées au lieu d'être placées au hasard
+        if country is None:
+            unresolved.append({'nation': nation_clean, 'count': int(count)})
+            continue
         
         map_points.append({
             'nation': nation_clean,
+            'country': country['name'],
+            'code': country['fifa'],
             'count': int(count),
-            'lat': coords[0],
-            'lng': coords[1]
+            'lat': country['lat'],
+            'lng': country['lng']
         })
     
     return {
         'points': map_points,
-        'total_players': len(df_normalized),
-        'total_nations': len(map_points)
+        'unresolved': unresolved,
+        'total_players': total_players,
+        'total_nations': len(map_points) + len(unresolved),
+        'resolved_nations': len(map_points)
     }
 
-def get_stats():
-    """Calcule les statistiques détaillées du CSV"""
-    df = load_csv()
-    df_normalized = normalize_data(df)
-    
-    base_stats = stats_utils.calculate_stats(df_normalized)
-    
-    # Statistiques détaillées
-    numeric_cols = df_normalized.select_dtypes(include=[np.number]).columns
-    categorical_cols = df_normalized.select_dtypes(include=[object]).columns
+def _build_nationality_map(df_normalized):
+    """Construit les données de la carte des nationalités (une fois par version du dataset)"""
+    if 'Nation' not in df_normalized.columns:
+        return {}
+    counts = stats_utils.value_counts(df_normalized['Nation'])
+    return _nationality_map_from_counts(counts, len(df_normalized))
+
+def get_nationality_map_data(filters=None):
+    """Récupère les données pour la carte des nationalités avec coordonnées géographiques"""
+    if filters:
+        return _cached_query('nationality_map', tuple(filters),
+                             lambda: _build_nationality_map(_filtered_frame(filters)))
+    if use_chunked_ingestion():
+        summary = get_chunked_summary()
+        if summary['nationality_counts'] is None:
+            return {}
+        return _nationality_map_from_counts(summary['nationality_counts'], summary['rows'])
+    return _dataset.get_derived('nationality_map', _build_nationality_map)
+
+def get_stats(filters=None):
+    """Calcule les statistiques détaillées du CSV (sur les lignes retenues si des filtres sont donnés)"""
+    profiles = get_column_profiles(filters)
+    dataset = profiles['dataset']
+    file_size = os.path.getsize(CSV_FILE) if os.path.exists(CSV_FILE) else 0
     
     detailed_stats = {
         'file_info': {
             'filename': os.path.basename(CSV_FILE),
-            'file_size_bytes': os.path.getsize(CSV_FILE) if os.path.exists(CSV_FILE) else 0,
-            'file_size_mb': round(os.path.getsize(CSV_FILE) / (1024 * 1024), 2) if os.path.exists(CSV_FILE) else 0
+            'file_size_bytes': file_size,
+            'file_size_mb': round(file_size / (1024 * 1024), 2)
         },
         'dataset_info': {
-            'total_rows': len(df_normalized),
-            'total_columns': len(df_normalized.columns),
-            'numeric_columns_count': len(numeric_cols),
-            'categorical_columns_count': len(categorical_cols),
-            'total_cells': len(df_normalized) * len(df_normalized.columns),
-            'missing_values_total': int(df_normalized.isnull().sum().sum()),
-            'missing_percentage': round((df_normalized.isnull().sum().sum() / (len(df_normalized) * len(df_normalized.columns))) * 100, 2)
+            'total_rows': dataset['total_rows'],
+            'total_columns': dataset['total_columns'],
+            'numeric_columns_count': dataset['numeric_columns_count'],
+            'categorical_columns_count': dataset['categorical_columns_count'],
+            'total_cells': dataset['total_cells'],
+            'missing_values_total': dataset['missing_values_total'],
+            'missing_percentage': dataset['missing_percentage']
         },
-        'column_details': base_stats.get('columns', []),
-        'missing_values': base_stats.get('missing_values', {}),
-        'data_types': base_stats.get('dtypes', {})
+        'column_details': [profile['name'] for profile in profiles['columns']],
+        'missing_values': {profile['name']: profile['null_count'] for profile in profiles['columns']},
+        'data_types': {profile['name']: profile['type'] for profile in profiles['columns']},
+        'schema': get_schema_report(),
+        'filters': list(filters or [])
     }
     
     return detailed_stats
@@ -331,11 +519,9 @@ def get_random_visualization(chart_type=None):
     """Génère une visualisation aléatoire avec seulement des types significatifs"""
     import random
     
-    df = load_csv()
-    df_normalized = normalize_data(df)
-    
-    numeric_cols = df_normalized.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols = df_normalized.select_dtypes(include=[object]).columns.tolist()
+    dataset = get_column_profiles()['dataset']
+    numeric_cols = list(dataset['numeric_columns'])
+    categorical_cols = list(dataset['categorical_columns'])
     
     if not numeric_cols and not categorical_cols:
         return None
@@ -377,3 +563,387 @@ def get_random_visualization(chart_type=None):
         'column': selected_col,
         'chart_type': selected_chart_type
     }
+
+def get_aggregate(group_by, metrics=None, aggregations=None, filters=None, sort_by=None, ascending=False, limit=None):
+    """Regroupe les joueurs et agrège des métriques (résultat mis en cache par version du dataset)"""
+    group_by = list(group_by or [])
+    metrics = list(metrics or [])
+    aggregations = list(aggregations or ['sum'])
+    filters = list(filters or [])
+    params = (tuple(group_by), tuple(metrics), tuple(aggregations), tuple(filters), sort_by, ascending, limit)
+    
+    def compute():
+        df_normalized = _filtered_frame(filters)
+        groups = aggregation.aggregate(df_normalized, group_by, metrics, aggregations,
+                                       sort_by=sort_by, ascending=ascending, limit=limit)
+        return {
+            'group_by': group_by,
+            'metrics': metrics,
+            'aggregations': aggregations,
+            'total_rows': len(df_normalized),
+            'groups': groups
+        }
+    
+    return _cached_query('aggregate', params, compute)
+
+SUMMARY_KINDS = ['histogram', 'box', 'downsample']
+
+def get_column_summary(column_name, kind='histogram', method='fixed', bins=None, points=None, filters=None):
+    """Résumé compact d'une colonne numérique (histogramme, boîte à moustaches ou série sous-échantillonnée)
+    
+    Calculé sur toute la colonne et mis en cache par colonne, paramètres et version du dataset.
+    """
+    if kind not in SUMMARY_KINDS:
+        raise ValueError(f"Type de résumé non supporté: {kind} (possibles: {', '.join(SUMMARY_KINDS)})")
+    filters = list(filters or [])
+    _check_filters_available(filters)
+    params = (column_name, kind, method, bins, points, tuple(filters))
+    
+    def compute():
+        df_normalized = get_dataframe()
+        if column_name not in df_normalized.columns:
+            raise ValueError(f"Colonne {column_name} non trouvée")
+        col = df_normalized[column_name]
+        if not pd.api.types.is_numeric_dtype(col):
+            raise ValueError(f"La colonne {column_name} n'est pas numérique")
+        
+        values = col.to_numpy()
+        if filters:
+            values = values[_filter_positions(df_normalized, filters)]
+        
+        if kind == 'histogram':
+            summary = binning.histogram(values, method=method, bins=bins)
+        elif kind == 'box':
+            summary = binning.box_summary(values)
+        else:
+            summary = binning.downsample(values, points or binning.DEFAULT_POINTS)
+        summary['type'] = 'numeric'
+        summary['column'] = column_name
+        return summary
+    
+    return _cached_query('column_summary', params, compute)
+
+def get_similarity_index():
+    """Index des plus proches voisins (construit une fois par version du dataset)"""
+    return _dataset.get_derived('similarity_index', similarity.build_index)
+
+def get_similar_players(player_name, k=similarity.DEFAULT_K, positions=None, competitions=None, filters=None):
+    """Retourne les k joueurs les plus proches d'un joueur (caractéristiques standardisées)
+    
+    Filtres optionnels : postes (un joueur 'MF,FW' correspond à 'MF' et à 'FW'),
+    compétitions et conditions texte de l'API.
+    """
+    k = max(1, min(int(k or similarity.DEFAULT_K), similarity.MAX_K))
+    positions = list(positions or [])
+    competitions = list(competitions or [])
+    filters = list(filters or [])
+    params = (player_name, k, tuple(positions), tuple(competitions), tuple(filters))
+    
+    def compute():
+        df_normalized = get_dataframe()
+        index = get_similarity_index()
+        matches = get_name_index().lookup(player_name)
+        if len(matches) == 0:
+            raise ValueError(f"Joueur {player_name} non trouvé")
+        position = int(matches[0])
+        
+        mask = query_filter.compute_mask(df_normalized, query_filter.parse_filters(filters),
+                                         get_filter_index() if filters else None)
+        if positions:
+            if similarity.POSITION_COLUMN not in df_normalized.columns:
+                raise ValueError(f"Colonne {similarity.POSITION_COLUMN} non trouvée")
+            selected = similarity.position_mask(df_normalized[similarity.POSITION_COLUMN], positions)
+            mask = selected if mask is None else mask & selected
+        if competitions:
+            if similarity.COMPETITION_COLUMN not in df_normalized.columns:
+                raise ValueError(f"Colonne {similarity.COMPETITION_COLUMN} non trouvée")
+            selected = similarity.competition_mask(df_normalized[similarity.COMPETITION_COLUMN], competitions)
+            mask = selected if mask is None else mask & selected
+        
+        candidates = None if mask is None else np.flatnonzero(mask)
+        neighbors, distances = index.query(position, k, candidates)
+        return {
+            'player': similarity.player_info(df_normalized, position),
+            'features': index.features,
+            'method': 'brute' if candidates is not None else index.method,
+            'candidates': len(index) - 1 if candidates is None else len(candidates),
+            'similar': [
+                dict(similarity.player_info(df_normalized, neighbor),
+                     distance=round(float(distance), 4),
+                     similarity=round(1.0 / (1.0 + float(distance)), 4))
+                for neighbor, distance in zip(neighbors, distances)
+            ]
+        }
+    
+    return _cached_query('similar_players', params, compute)
+
+def get_leaderboard(metric, limit=leaderboard.DEFAULT_LIMIT, filters=None, min_minutes=None, per90=False, ascending=False):
+    """Classement des k meilleurs joueurs sur une métrique numérique (sélection partielle, sans tri complet)
+    
+    `min_minutes` écarte les joueurs sous un seuil de minutes jouées ; `per90` classe
+    la métrique ramenée à 90 minutes. Résultat mis en cache par requête et version du dataset.
+    """
+    limit = max(1, min(int(limit or leaderboard.DEFAULT_LIMIT), leaderboard.MAX_LIMIT))
+    filters = list(filters or [])
+    params = (metric, limit, tuple(filters), min_minutes, bool(per90), bool(ascending))
+    
+    def compute():
+        df_normalized = get_dataframe()
+        values = leaderboard.metric_values(df_normalized, metric, per90)
+        
+        conditions = list(filters)
+        if min_minutes is not None:
+            if leaderboard.MINUTES_COLUMN not in df_normalized.columns:
+                raise ValueError(f"Colonne {leaderboard.MINUTES_COLUMN} requise pour min_minutes")
+            conditions.append(f"{leaderboard.MINUTES_COLUMN}>={min_minutes}")
+        candidates = _filter_positions(df_normalized, conditions) if conditions else None
+        
+        positions = leaderboard.top_k_positions(values, limit, ascending, candidates)
+        columns = leaderboard.leaderboard_columns(df_normalized, metric)
+        rows = _json_ready(df_normalized[columns].take(positions)).to_dict(orient='records')
+        for rank, (row, value) in enumerate(zip(rows, values[positions]), start=1):
+            row['rank'] = rank
+            row['value'] = stats_utils.to_float(value, 4 if per90 else 6)
+        
+        return {
+            'metric': metric,
+            'per90': bool(per90),
+            'order': 'asc' if ascending else 'desc',
+            'min_minutes': min_minutes,
+            'filters': filters,
+            'candidates': len(values) if candidates is None else len(candidates),
+            'rows': rows
+        }
+    
+    return _cached_query('leaderboard', params, compute)
+
+def get_name_index():
+    """Index des noms de joueurs (construit une fois par version du dataset)"""
+    return _dataset.get_derived('name_index', player_index.build_name_index)
+
+def get_percentile_matrix():
+    """Matrice des percentiles par groupe de pairs (construite une fois par version du dataset)"""
+    return _dataset.get_derived('percentile_matrix', percentile_rank.build_percentiles)
+
+def get_player_profile(player_name):
+    """Profil d'un joueur : valeurs et percentiles parmi ses pairs (même poste principal et compétition)
+    
+    Un joueur transféré en cours de saison a une entrée par club.
+    """
+    positions = get_name_index().lookup(player_name)
+    if len(positions) == 0:
+        raise ValueError(f"Joueur {player_name} non trouvé")
+    
+    def compute():
+        df_normalized = get_dataframe()
+        percentiles = get_percentile_matrix()
+        rows = _json_ready(df_normalized.take(positions)).to_dict(orient='records')
+        
+        entries = []
+        for position, row in zip(positions, rows):
+            entries.append({
+                'player': {key: value for key, value in row.items() if key not in percentiles.columns},
+                'peer_group': percentiles.peer_group(position),
+                'values': {col: row[col] for col in percentiles.columns},
+                'percentiles': percentiles.row(position)
+            })
+        return {'name': rows[0].get(player_index.NAME_COLUMN, player_name), 'entries': entries}
+    
+    return _cached_query('player_profile', tuple(positions.tolist()), compute)
+
+def get_search_index():
+    """Index de recherche des noms de joueurs (construit une fois par version du dataset)"""
+    return _dataset.get_derived('name_search', player_index.build_search_index)
+
+def search_players(query, limit=player_index.DEFAULT_SEARCH_LIMIT):
+    """Recherche de joueurs par nom, sans accents ni casse : préfixe du nom ou d'un mot,
+    puis recherche approchée (trigrammes) tolérante aux fautes de frappe
+    
+    Chaque résultat est complété des clubs, postes et compétitions du joueur.
+    """
+    limit = max(1, min(int(limit or player_index.DEFAULT_SEARCH_LIMIT), player_index.MAX_SEARCH_LIMIT))
+    query = (query or '').strip()
+    if not query:
+        raise ValueError("Paramètre q requis")
+    
+    df_normalized = get_dataframe()
+    name_index = get_name_index()
+    results = get_search_index().search(query, limit)
+    for result in results:
+        entries = [similarity.player_info(df_normalized, int(position))
+                   for position in name_index.lookup(result['name'])]
+        for column in ('Squad', 'Position', 'Compition'):
+            values = [entry[column] for entry in entries if entry.get(column)]
+            result[column] = list(dict.fromkeys(values))
+    return {'query': query, 'results': results}
+
+def get_numeric_matrix():
+    """Colonnes numériques en matrice float32 (construite une fois par version du dataset)"""
+    return _dataset.get_derived('numeric_matrix', correlation.build_numeric_matrix)
+
+def get_correlation(columns=None, method='pearson', filters=None, include_covariance=False):
+    """Matrice de corrélation (Pearson ou Spearman) des colonnes numériques, triangle supérieur
+    
+    Les coefficients sont calculés sur les lignes communes à chaque paire de colonnes,
+    parmi les joueurs retenus par les filtres ; pour Spearman, les rangs sont recalculés
+    sur ces lignes communes (résultats identiques à DataFrame.corr). Résultat mis en cache par requête et version du dataset.
+    """
+    columns = list(columns or [])
+    filters = list(filters or [])
+    params = (tuple(columns), method, tuple(filters), bool(include_covariance))
+    
+    def compute():
+        matrix = get_numeric_matrix()
+        selected = columns or matrix.columns
+        if len(selected) < 2:
+            raise ValueError("Au moins deux colonnes numériques sont requises")
+        rows = _filter_positions(get_dataframe(), filters) if filters else None
+        values = matrix.select(selected, rows)
+        corr, cov, counts = correlation.correlate(values, method)
+        
+        result = {
+            'method': method,
+            'columns': list(selected),
+            'rows': len(values),
+            'layout': 'upper_triangle',
+            'correlation': correlation.upper_triangle(corr)
+        }
+        if include_covariance:
+            result['covariance'] = correlation.upper_triangle(cov, 6)
+        if not np.all(counts == len(values)):
+            result['pair_counts'] = [int(count) for count in counts[np.triu_indices(len(selected))]]
+        return result
+    
+    return _cached_query('correlation', params, compute)
+
+def _build_accumulators(df):
+    """Accumulateurs fusionnables des colonnes, alimentés par tout le dataset"""
+    return streaming_stats.update_accumulators(streaming_stats.build_accumulators(df), df)
+
+def _update_accumulators(accumulators, rows, frame, updated):
+    """Fusionne les lignes ajoutées dans les accumulateurs des colonnes (mis à jour sur place)"""
+    return streaming_stats.update_accumulators(accumulators, rows)
+
+def _exact_profiles_after_append(rows_total):
+    """Vrai si les profils sont recalculés exactement (au prochain accès) après un ajout"""
+    return rows_total <= Config.CSV_PROFILES_EXACT_MAX_ROWS
+
+def _update_column_profiles(profiles, rows, frame, updated):
+    """Profils recalculés à partir des accumulateurs fusionnés (quantiles estimés)
+    
+    Jusqu'à CSV_PROFILES_EXACT_MAX_ROWS lignes, rien n'est fusionné : les profils
+    sont reconstruits exactement au prochain accès.
+    """
+    accumulators = updated.get('column_accumulators')
+    if accumulators is None or _exact_profiles_after_append(len(frame)):
+        return None
+    return _annotate_derived(column_profile.profiles_from_accumulators(accumulators, len(frame)))
+
+def _update_nationality_map(map_data, rows, frame, updated):
+    """Ajoute les effectifs des lignes ajoutées aux points de la carte des nationalités"""
+    if not map_data or 'Nation' not in rows.columns:
+        return None
+    counts = {point['nation']: point['count'] for point in map_data['points']}
+    counts.update({entry['nation']: entry['count'] for entry in map_data['unresolved']})
+    for nation, count in stats_utils.value_counts(rows['Nation']).items():
+        if count == 0:
+            continue
+        nation = nation.strip() if isinstance(nation, str) else str(nation)
+        counts[nation] = counts.get(nation, 0) + int(count)
+    ordered = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+    return _nationality_map_from_counts(ordered, len(frame))
+
+# Mises à jour incrémentales des structures dérivées lors d'un ajout de lignes (dans cet ordre) ;
+# les autres structures (percentiles, similarité, matrices) sont reconstruites au prochain accès
+_APPEND_UPDATERS = {
+    'column_accumulators': _update_accumulators,
+    'column_profiles': _update_column_profiles,
+    'nationality_map': _update_nationality_map,
+    'filter_index': lambda index, rows, frame, updated: index.append(rows),
+    'name_index': lambda index, rows, frame, updated: index.append(
+        rows[player_index.NAME_COLUMN].to_numpy(dtype=object), len(frame) - len(rows)),
+}
+
+def _normalize_rows(raw_rows):
+    """Valide des lignes brutes et retourne leur version normalisée (métriques dérivées comprises)"""
+    errors = player_schema.validate_rows(raw_rows)
+    if errors:
+        raise ValueError("Lignes invalides: " + '; '.join(errors))
+    rows = player_schema.apply_schema(raw_rows.reset_index(drop=True))
+    return derived_metrics.add_derived_columns(rows)
+
+def _append_chunked_summary(old_key, rows):
+    """Fusionne les lignes ajoutées dans le résumé par morceaux en cache (s'il existe)"""
+    summary = _chunked_summaries.get(old_key)
+    if summary is None:
+        return False
+    accumulators = streaming_stats.update_accumulators(summary['accumulators'], rows)
+    updated = _summary_from_accumulators(accumulators, summary['rows'] + len(rows))
+    updated['ingestion'] = summary.get('ingestion')
+    _chunked_summaries.put(dataset_snapshot.source_key(CSV_FILE), updated)
+    return True
+
+def ingest_rows(raw_rows, mode='append'):
+    """Ajoute (ou met à jour, mode 'upsert') des lignes de joueurs dans le CSV.
+    
+    Les lignes sont validées contre le schéma puis ajoutées à la fin du fichier ; le
+    DataFrame en cache, la carte des nationalités et les index sont mis à jour à partir
+    des seules nouvelles lignes. Les profils de colonnes sont recalculés exactement au
+    prochain accès jusqu'à CSV_PROFILES_EXACT_MAX_ROWS lignes ; au-delà, ils sont
+    fusionnés depuis des accumulateurs et deviennent approximatifs (quantiles et valeurs
+    distinctes numériques estimés), ce qu'indique 'approximate_profiles'.
+    Un upsert qui remplace des joueurs existants (clé nom + club) réécrit le fichier
+    et entraîne un rechargement complet.
+    """
+    if mode not in ingestion.INGEST_MODES:
+        raise ValueError(f"Mode d'ingestion non supporté: {mode} (possibles: {', '.join(ingestion.INGEST_MODES)})")
+    if len(raw_rows) == 0:
+        raise ValueError("Aucune ligne à ingérer")
+    if len(raw_rows) > Config.CSV_INGEST_MAX_ROWS:
+        raise ValueError(f"Trop de lignes ({len(raw_rows)} > {Config.CSV_INGEST_MAX_ROWS})")
+    if not os.path.exists(CSV_FILE):
+        raise FileNotFoundError(f"Fichier {CSV_FILE} non trouvé")
+    
+    rows = _normalize_rows(raw_rows)
+    raw_rows = raw_rows.reset_index(drop=True)
+    chunked = use_chunked_ingestion()
+    
+    replacements = raw_rows.iloc[0:0]
+    if mode == 'upsert':
+        if chunked:
+            raise ValueError("L'upsert n'est pas disponible en lecture par morceaux (CSV_INGESTION_MODE)")
+        replacements, _ = ingestion.split_upsert(raw_rows, ingestion.frame_keys(get_dataframe()))
+    
+    if len(replacements):
+        replaced, appended = ingestion.rewrite_rows(CSV_FILE, replacements,
+                                                    raw_rows.drop(index=replacements.index))
+        _dataset.invalidate()
+        return {'mode': mode, 'appended': appended, 'replaced': replaced, 'incremental': False, 'updated': [],
+                'rows_total': None}
+    
+    old_key = dataset_snapshot.source_key(CSV_FILE)
+    if chunked:
+        ingestion.append_rows(CSV_FILE, raw_rows)
+        updated = ['chunked_summary'] if _append_chunked_summary(old_key, rows) else []
+        return {'mode': mode, 'appended': len(rows), 'replaced': 0, 'incremental': bool(updated), 'updated': updated,
+                'rows_total': None}
+    
+    # Les profils exacts ne sont pas fusionnables : sur un grand dataset, ils passent par des
+    # accumulateurs construits une fois, puis mis à jour à chaque ajout
+    dataset_stats = _dataset.get_stats()
+    approximate = not _exact_profiles_after_append(dataset_stats['rows'] + len(rows))
+    if approximate and 'column_profiles' in dataset_stats['derived']:
+        _dataset.get_derived('column_accumulators', _build_accumulators)
+    updated = _dataset.append(rows,
+                              write=lambda: ingestion.append_rows(CSV_FILE, raw_rows),
+                              combine=ingestion.append_frames,
+                              updaters=_APPEND_UPDATERS)
+    return {
+        'mode': mode,
+        'appended': len(rows),
+        'replaced': 0,
+        'incremental': updated is not None,
+        'updated': updated or [],
+        'rows_total': _dataset.get_stats()['rows'] if updated is not None else None,
+        'approximate_profiles': approximate and 'column_profiles' in (updated or [])
+    }
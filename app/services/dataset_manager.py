@@ -0,0 +1,135 @@
+import os
+import threading
+import pandas as pd
+
+# pandas >= 3 (requirements.txt) : copy-on-write toujours actif, une copie superficielle
+# partage les données sans pouvoir modifier le DataFrame mis en cache
+def _view(frame):
+    """Copie superficielle du DataFrame en cache, modifiable par l'appelant sans l'altérer"""
+    return frame.copy(deep=False)
+
+
+class DatasetManager:
+    """Charge et normalise un fichier une seule fois, puis sert des vues en lecture seule.
+
+    Le résultat est indexé par (chemin, mtime, taille) : toute modification du
+    fichier invalide le cache, ainsi que les structures dérivées associées.
+    """
+
+    def __init__(self, path, loader):
+        self.path = path
+        self._loader = loader
+        self._lock = threading.RLock()
+        self._key = None
+        self._frame = None
+        self._version = 0
+        self._derived = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _file_key(self):
+        """Retourne la clé de version du fichier (chemin, mtime, taille)"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Fichier {self.path} non trouvé")
+        return (os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size)
+
+    def _ensure_loaded(self, count_hit=True):
+        """Recharge le fichier si nécessaire et retourne le DataFrame en cache
+
+        Seules les lectures du DataFrame (`count_hit`) comptent comme des succès du
+        cache ; la lecture de la version ou d'une structure dérivée n'en est pas une.
+        """
+        key = self._file_key()
+        with self._lock:
+            if self._frame is not None and key == self._key:
+                if count_hit:
+                    self.hits += 1
+                return self._frame
+
+            if self._frame is not None:
+                self.invalidations += 1
+            self.misses += 1
+            self._frame = self._loader(self.path)
+            self._key = key
+            self._version += 1
+            self._derived = {}
+            return self._frame
+
+    def get_frame(self):
+        """Retourne une vue du DataFrame normalisé (copie superficielle sous copy-on-write)"""
+        return _view(self._ensure_loaded())
+
+    @property
+    def version(self):
+        """Numéro de version courant du dataset (incrémenté à chaque rechargement)"""
+        with self._lock:
+            self._ensure_loaded(count_hit=False)
+            return self._version
+
+    def get_derived(self, name, builder):
+        """Retourne une structure dérivée construite une seule fois par version du dataset"""
+        with self._lock:
+            frame = self._ensure_loaded(count_hit=False)
+            if name not in self._derived:
+                self._derived[name] = builder(_view(frame))
+            return self._derived[name]
+
+    def append(self, rows, write, combine, updaters=None):
+        """Ajoute des lignes sans recharger le fichier.
+
+        Sous le verrou : `write()` écrit les lignes dans le fichier, `combine(frame, rows)`
+        retourne le nouveau DataFrame et chaque `updaters[nom](ancien, rows, frame, mis_à_jour)`
+        met à jour incrémentalement une structure dérivée (dans l'ordre du dictionnaire ;
+        `mis_à_jour` contient les structures déjà mises à jour). Les structures sans
+        updater, ou dont l'updater retourne None, sont reconstruites au prochain accès.
+        Retourne les noms des structures mises à jour (None si rien n'était chargé).
+        """
+        with self._lock:
+            loaded = self._frame is not None and self._key == self._file_key()
+            write()
+            if not loaded:
+                self._frame = None
+                self._key = None
+                self._derived = {}
+                return None
+
+            frame = combine(self._frame, rows)
+            derived = {}
+            for name, updater in (updaters or {}).items():
+                if name in self._derived:
+                    value = updater(self._derived[name], rows, frame, derived)
+                    if value is not None:
+                        derived[name] = value
+            self._frame = frame
+            self._key = self._file_key()
+            self._version += 1
+            self._derived = derived
+            return list(derived)
+
+    def invalidate(self):
+        """Force le rechargement au prochain accès"""
+        with self._lock:
+            if self._frame is not None:
+                self.invalidations += 1
+            self._frame = None
+            self._key = None
+            self._derived = {}
+
+    def get_stats(self):
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'path': self.path,
+                'loaded': self._frame is not None,
+                'version': self._version,
+                'rows': len(self._frame) if self._frame is not None else 0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+                'derived': sorted(self._derived.keys())
+            }
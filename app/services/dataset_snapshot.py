@@ -0,0 +1,131 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+# Format d'instantané : un dossier par version du CSV source, contenant un fichier
+# .npy par colonne (projeté en mémoire au chargement) et un meta.json décrivant
+# l'ordre, le type et les catégories des colonnes.
+# À incrémenter à chaque changement de la normalisation (les anciens instantanés sont ignorés).
+SNAPSHOT_FORMAT_VERSION = 2
+META_FILENAME = 'meta.json'
+
+
+def source_key(csv_path):
+    """Retourne l'identifiant de version du CSV source (mtime en ns et taille)"""
+    stat = os.stat(csv_path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def get_snapshot_path(snapshot_root, key):
+    """Retourne le dossier de l'instantané correspondant à une version du CSV"""
+    return os.path.join(snapshot_root, key)
+
+
+def _column_kind(series):
+    """Détermine comment une colonne est stockée dans l'instantané"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return 'numeric'
+    return 'string'
+
+
+def write_snapshot(df, snapshot_root, key, overwrite=False):
+    """Écrit l'instantané colonnaire d'un DataFrame normalisé.
+
+    L'écriture se fait dans un dossier temporaire renommé atomiquement, pour que
+    les autres workers ne lisent jamais un instantané incomplet.
+    """
+    target = get_snapshot_path(snapshot_root, key)
+    if os.path.exists(os.path.join(target, META_FILENAME)) and not overwrite:
+        return target
+
+    os.makedirs(snapshot_root, exist_ok=True)
+    tmp_dir = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        series = df[name]
+        kind = _column_kind(series)
+        filename = f"col_{i:03d}.npy"
+        column_meta = {'name': name, 'kind': kind, 'file': filename, 'dtype': str(series.dtype)}
+
+        if kind == 'numeric':
+            np.save(os.path.join(tmp_dir, filename), series.to_numpy())
+        else:
+            categorical = series if kind == 'category' else series.astype('category')
+            codes = categorical.cat.codes.to_numpy().astype(np.int32)
+            np.save(os.path.join(tmp_dir, filename), codes)
+            column_meta['categories'] = [str(c) for c in categorical.cat.categories]
+            if kind == 'category':
+                column_meta['ordered'] = bool(categorical.cat.ordered)
+
+        columns.append(column_meta)
+
+    meta = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'source_key': key,
+        'rows': len(df),
+        'columns': columns
+    }
+    with open(os.path.join(tmp_dir, META_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    if overwrite and os.path.exists(target):
+        old_dir = f"{target}.tmp-old-{os.getpid()}"
+        os.rename(target, old_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    try:
+        os.rename(tmp_dir, target)
+    except OSError:
+        # Un autre worker a publié le même instantané entre-temps
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    remove_stale_snapshots(snapshot_root, key)
+    return target
+
+
+def load_snapshot(snapshot_root, key):
+    """Charge un instantané en projetant les colonnes en mémoire (None si absent ou obsolète)"""
+    path = get_snapshot_path(snapshot_root, key)
+    meta_path = os.path.join(path, META_FILENAME)
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION or meta.get('source_key') != key:
+        return None
+
+    data = {}
+    for column_meta in meta['columns']:
+        values = np.load(os.path.join(path, column_meta['file']), mmap_mode='r')
+        kind = column_meta['kind']
+
+        if kind == 'numeric':
+            data[column_meta['name']] = values
+        elif kind == 'category':
+            data[column_meta['name']] = pd.Categorical.from_codes(
+                values, categories=column_meta['categories'],
+                ordered=column_meta.get('ordered', False))
+        else:
+            categories = np.asarray(column_meta['categories'] + [np.nan], dtype=object)
+            # Le code -1 (valeur manquante) pointe sur le NaN ajouté en fin de tableau
+            data[column_meta['name']] = pd.array(categories[values], dtype=column_meta['dtype'])
+
+    # copy=False : les colonnes numériques restent des vues sur les fichiers projetés
+    return pd.DataFrame(data, copy=False)
+
+
+def remove_stale_snapshots(snapshot_root, current_key):
+    """Supprime les instantanés des versions précédentes du CSV"""
+    if not os.path.isdir(snapshot_root):
+        return
+    for entry in os.scandir(snapshot_root):
+        if entry.is_dir() and entry.name != current_key and '.tmp-' not in entry.name:
+            shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+
+# Colonne des matchs joués ramenés à 90 minutes (dénominateur des métriques per90)
+NINETIES_COLUMN = '90s'
+
+
+def _ratio(frame, numerator, denominator):
+    bottom = frame[denominator].to_numpy(dtype=np.float64)
+    return np.where(bottom > 0, frame[numerator].to_numpy(dtype=np.float64) / bottom, np.nan)
+
+
+def _difference(frame, left, right):
+    return frame[left].to_numpy(dtype=np.float64) - frame[right].to_numpy(dtype=np.float64)
+
+
+# Opérations vectorisées disponibles : (fonction, gabarit de l'expression affichée)
+OPERATIONS = {
+    'per90': (lambda frame, inputs: _ratio(frame, inputs[0], NINETIES_COLUMN), '{0} / ' + NINETIES_COLUMN),
+    'ratio': (lambda frame, inputs: _ratio(frame, inputs[0], inputs[1]), '{0} / {1}'),
+    'difference': (lambda frame, inputs: _difference(frame, inputs[0], inputs[1]), '{0} - {1}'),
+}
+
+
+def _metric(operation, inputs, dtype='float32'):
+    """Déclare une métrique dérivée : opération, colonnes d'entrée et type stocké"""
+    depends_on = list(inputs) + ([NINETIES_COLUMN] if operation == 'per90' else [])
+    return {
+        'operation': operation,
+        'inputs': list(inputs),
+        'depends_on': depends_on,
+        'dtype': dtype,
+        'expression': OPERATIONS[operation][1].format(*inputs)
+    }
+
+
+# Registre des métriques dérivées, calculées au chargement comme des colonnes natives
+DERIVED_METRICS = {
+    'Goal per 90': _metric('per90', ['Goal']),
+    'Assist per 90': _metric('per90', ['Assist']),
+    'Goal + Assist per 90': _metric('per90', ['Goal + Assist']),
+    'Expected Goal per 90': _metric('per90', ['Expected Goal']),
+    'Non-penalty Expected Goal per 90': _metric('per90', ['Non-penalty Expected Goal']),
+    'Expected Assisted Goal per 90': _metric('per90', ['Expected Assisted Goal']),
+    'Non-penalty Expected Goal + Expected Assisted Goal per 90':
+        _metric('per90', ['Non-penalty Expected Goal + Expected Assisted Goal']),
+    'Progressive Carries per 90': _metric('per90', ['Progressive Carries']),
+    'Progressive Passes per 90': _metric('per90', ['Progressive Passes']),
+    'Progressive Passes Receive per 90': _metric('per90', ['Progressive Passes Receive']),
+    'Goal minus Expected Goal': _metric('difference', ['Goal', 'Expected Goal']),
+    'Penalty conversion': _metric('ratio', ['Penalty Kick', 'Penalty Kick Attempted']),
+    'Minutes per match': _metric('ratio', ['MIn', 'Match played']),
+}
+
+
+def get_derived_names(columns=None):
+    """Noms des métriques dérivées calculables (toutes les dépendances présentes si `columns` est donné)"""
+    if columns is None:
+        return list(DERIVED_METRICS)
+    available = set(columns)
+    return [name for name, spec in DERIVED_METRICS.items() if set(spec['depends_on']) <= available]
+
+
+def compute_metric(frame, name):
+    """Calcule une métrique dérivée sur un DataFrame (tableau numpy du type déclaré)"""
+    spec = DERIVED_METRICS[name]
+    function = OPERATIONS[spec['operation']][0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = function(frame, spec['inputs'])
+    return values.astype(spec['dtype'])
+
+
+def _column_digest(frame, column):
+    """Empreinte du contenu d'une colonne d'entrée (détecte les entrées modifiées)"""
+    values = np.ascontiguousarray(frame[column].to_numpy())
+    return hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest()
+
+
+class DerivedMetricsStore:
+    """Mémorise les colonnes dérivées par empreinte de leurs entrées.
+
+    À chaque nouvelle version du dataset, seules les métriques dont une colonne
+    d'entrée a changé sont recalculées ; les autres réutilisent le tableau précédent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = {}
+        self.computed = 0
+        self.reused = 0
+
+    def add_columns(self, frame):
+        """Retourne le DataFrame complété des métriques dérivées calculables"""
+        new_columns = {}
+        digests = {}
+        with self._lock:
+            for name in get_derived_names(frame.columns):
+                if name in frame.columns:
+                    continue
+                for col in DERIVED_METRICS[name]['depends_on']:
+                    if col not in digests:
+                        digests[col] = _column_digest(frame, col)
+                fingerprint = (len(frame),) + tuple(digests[col] for col in DERIVED_METRICS[name]['depends_on'])
+                cached = self._columns.get(name)
+                if cached is not None and cached[0] == fingerprint:
+                    self.reused += 1
+                    values = cached[1]
+                else:
+                    self.computed += 1
+                    values = compute_metric(frame, name)
+                    self._columns[name] = (fingerprint, values)
+                new_columns[name] = values
+        if not new_columns:
+            return frame
+        return pd.concat([frame, pd.DataFrame(new_columns, index=frame.index)], axis=1)
+
+    def get_stats(self):
+        with self._lock:
+            return {'cached': len(self._columns), 'computed': self.computed, 'reused': self.reused}
+
+
+def add_derived_columns(frame):
+    """Complète un DataFrame des métriques dérivées, sans mémorisation (morceaux de lecture)"""
+    new_columns = {name: compute_metric(frame, name)
+                   for name in get_derived_names(frame.columns) if name not in frame.columns}
+    if not new_columns:
+        return frame
+    return pd.concat([frame, pd.DataFrame(new_columns, index=frame.index)], axis=1)
+
+
+def describe(name):
+    """Description d'une métrique dérivée pour l'API (expression, dépendances, type)"""
+    spec = DERIVED_METRICS[name]
+    return {'expression': spec['expression'], 'depends_on': list(spec['depends_on']), 'dtype': spec['dtype']}
@@ -0,0 +1,111 @@
+import base64
+from functools import lru_cache
+import numpy as np
+
+# Canaux et nombre de cases par défaut (format historique de l'API) :
+# RGB sur 0-255, teinte en degrés (0-360), saturation et valeur en pourcentage (0-100)
+DEFAULT_BINS = {'r': 256, 'g': 256, 'b': 256, 'h': 360, 's': 100, 'v': 100}
+# Échelle de chaque canal HSV (valeur uint8 0-255 -> unité affichée)
+HSV_SCALES = {'h': 360, 's': 100, 'v': 100}
+ENCODINGS = ['json', 'base64', 'quantized']
+MIN_BINS = 2
+MAX_BINS = 256
+
+
+@lru_cache(maxsize=64)
+def _bin_table(channel, bins):
+    """Case de chaque valeur uint8 (0-255) d'un canal, identique à np.histogram sur la valeur mise à l'échelle.
+
+    Les 256 valeurs possibles passent une fois par np.histogram (mêmes arrondis
+    flottants, dernière case fermée à droite) ; l'histogramme d'une image se réduit
+    ensuite au comptage de ses 256 valeurs puis à un np.bincount pondéré.
+    """
+    values = np.arange(256, dtype=np.float64)
+    if channel in HSV_SCALES:
+        scale = HSV_SCALES[channel]
+        values = (values / 255.0) * scale
+    else:
+        scale = 256
+    edges = np.histogram_bin_edges(values, bins=bins, range=(0, scale))
+    table = np.empty(256, dtype=np.intp)
+    for value in range(256):
+        counts = np.histogram(values[value:value + 1], bins=edges)[0]
+        table[value] = int(np.argmax(counts))
+    return table
+
+
+def _channel_histogram(counts, channel, bins):
+    """Regroupe le comptage des 256 valeurs d'un canal en `bins` cases"""
+    if bins == 256 and channel not in HSV_SCALES:
+        return counts
+    return np.bincount(_bin_table(channel, bins), weights=counts, minlength=bins).astype(np.int64)
+
+
+def resolve_bins(bins=None):
+    """Nombre de cases par canal : format historique si None, sinon `bins` pour chaque canal"""
+    if bins is None:
+        return dict(DEFAULT_BINS)
+    bins = int(bins)
+    if not MIN_BINS <= bins <= MAX_BINS:
+        raise ValueError(f"Nombre de cases invalide: {bins} (entre {MIN_BINS} et {MAX_BINS})")
+    return {channel: bins for channel in DEFAULT_BINS}
+
+
+def compute(rgb_image, bins=None):
+    """Histogrammes RGB et HSV (entiers) d'une image PIL en RGB, sans copie des pixels.
+
+    Le comptage des 256 valeurs de chaque bande est fait par Image.histogram (en C,
+    sur le tampon de l'image) ; seuls ces comptages passent ensuite par numpy.
+    """
+    channel_bins = resolve_bins(bins)
+    counts = {}
+    for mode, channels in (('RGB', 'rgb'), ('HSV', 'hsv')):
+        image = rgb_image if mode == 'RGB' else rgb_image.convert('HSV')
+        bands = np.asarray(image.histogram(), dtype=np.int64).reshape(3, 256)
+        for position, channel in enumerate(channels):
+            counts[channel] = _channel_histogram(bands[position], channel, channel_bins[channel])
+    return counts
+
+
+def _base64_dtype(values):
+    """Plus petit entier non signé little-endian contenant toutes les cases ('<u1', '<u2' ou '<u4')"""
+    peak = int(values.max()) if len(values) else 0
+    for dtype in ('<u1', '<u2'):
+        if peak <= np.iinfo(dtype).max:
+            return dtype
+    return '<u4'
+
+
+def _encode_channel(values, encoding):
+    if encoding == 'base64':
+        return base64.b64encode(np.asarray(values, dtype=_base64_dtype(values)).tobytes()).decode('ascii')
+    if encoding == 'quantized':
+        peak = int(values.max()) if len(values) else 0
+        if peak == 0:
+            return [0] * len(values)
+        return np.rint(values * (255.0 / peak)).astype(np.uint8).tolist()
+    return values.tolist()
+
+
+def encode(counts, encoding='json'):
+    """Réponse {'rgb': {r, g, b}, 'hsv': {h, s, v}} dans l'encodage demandé
+
+    'json' : listes d'entiers (format historique) ; 'base64' : tableaux d'entiers
+    non signés little-endian encodés en base64, sur le plus petit type contenant le
+    canal (donné dans 'dtypes') ; 'quantized' : listes 0-255 relatives au maximum
+    de chaque canal, donné dans 'peaks'.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Encodage d'histogramme non supporté: {encoding} (possibles: {', '.join(ENCODINGS)})")
+    payload = {
+        'rgb': {channel: _encode_channel(counts[channel], encoding) for channel in 'rgb'},
+        'hsv': {channel: _encode_channel(counts[channel], encoding) for channel in 'hsv'}
+    }
+    if encoding != 'json':
+        payload['encoding'] = encoding
+        payload['bins'] = {channel: len(counts[channel]) for channel in counts}
+        if encoding == 'base64':
+            payload['dtypes'] = {channel: _base64_dtype(counts[channel]) for channel in counts}
+        else:
+            payload['peaks'] = {channel: int(counts[channel].max()) for channel in counts}
+    return payload
@@ -1,14 +1,13 @@
 import os
+import time
+import threading
+from urllib.parse import quote
 from PIL import Image
 import numpy as np
 from collections import Counter
+from app.config import Config
 from app.utils import file_utils
-try:
-    from sklearn.cluster import KMeans
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
-    print("Warning: scikit-learn not available, k-means clustering disabled")
+from app.services import analysis_cache, batch_analysis, color_engines, histograms, logo_catalog, logo_derivatives
 
 # Chemin relatif depuis la racine du projet
 def get_logos_dir():
@@ -18,48 +17,153 @@ def get_logos_dir():
 
 LOGOS_DIR = get_logos_dir()
 
-def get_logos_list():
-    """Retourne la liste des logos disponibles avec leurs métadonnées"""
+# Paramètres de l'analyse des couleurs dominantes ; COLOR_ANALYSIS_VERSION fait partie de la
+# clé du cache persistant et doit être incrémentée si l'algorithme change
+ANALYSIS_SIZE = Config.IMAGE_ANALYSIS_SIZE
+ANALYSIS_FILTER = Config.IMAGE_ANALYSIS_FILTER
+DOMINANT_COLORS = 5
+# Nombre de couleurs de la palette globale (toutes images confondues)
+GLOBAL_COLORS = 10
+COLOR_ANALYSIS_VERSION = 5
+# Filtres de rééchantillonnage possibles pour la miniature d'analyse
+ANALYSIS_FILTERS = {
+    'nearest': Image.Resampling.NEAREST,
+    'box': Image.Resampling.BOX,
+    'bilinear': Image.Resampling.BILINEAR,
+    'bicubic': Image.Resampling.BICUBIC,
+    'lanczos': Image.Resampling.LANCZOS,
+}
+if ANALYSIS_FILTER not in ANALYSIS_FILTERS:
+    print(f"Warning: Filtre d'analyse inconnu ({ANALYSIS_FILTER}), utilisation de 'box'")
+    ANALYSIS_FILTER = 'box'
+# Côté minimal de l'image réduite sur laquelle les histogrammes peuvent être comptés
+MIN_HISTOGRAM_SIZE = 16
+
+# Résultats des analyses de couleurs, adressés par contenu du fichier et paramètres
+_color_cache = analysis_cache.PersistentCache(Config.IMAGE_COLOR_CACHE_PATH,
+                                              Config.IMAGE_COLOR_CACHE_MAX_ENTRIES,
+                                              Config.IMAGE_COLOR_CACHE_ENABLED)
+
+# Catalogues des dossiers de logos et statistiques calculées pour la dernière version du catalogue
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+_image_stats = {}
+
+# Miniatures des logos et durées de mise en cache HTTP : un an (immuable) quand l'URL porte la
+# révision du logo, une heure avec revalidation par ETag sinon
+_derivatives = logo_derivatives.LogoDerivatives(Config.IMAGE_DERIVATIVES_DIR, Config.IMAGE_DERIVATIVE_SIZES,
+                                                Config.IMAGE_MAX_PIXELS)
+THUMBNAIL_FORMAT = Config.IMAGE_DERIVATIVE_FORMAT
+if THUMBNAIL_FORMAT not in logo_derivatives.DERIVATIVE_FORMATS:
+    print(f"Warning: Format de miniature inconnu ({THUMBNAIL_FORMAT}), utilisation de 'webp'")
+    THUMBNAIL_FORMAT = 'webp'
+THUMBNAIL_MAX_AGE = 365 * 24 * 3600
+THUMBNAIL_REVALIDATE_AGE = 3600
+
+# Statistiques du dernier lot d'analyses (débit, répartition cache / calcul)
+_last_batch = {}
+_last_batch_lock = threading.Lock()
+
+def get_color_cache_stats():
+    """Retourne les compteurs du cache persistant des analyses de couleurs"""
+    return _color_cache.get_stats()
+
+def get_last_batch_stats():
+    """Retourne les statistiques du dernier lot d'analyses de logos"""
+    with _last_batch_lock:
+        return dict(_last_batch)
+
+def _get_catalog():
+    """Catalogue du dossier des logos courant (manifeste persistant pour le dossier configuré)"""
     logos_dir = get_logos_dir()
-    if not os.path.exists(logos_dir):
-        return []
+    with _catalogs_lock:
+        catalog = _catalogs.get(logos_dir)
+        if catalog is None:
+            manifest_path = Config.IMAGE_CATALOG_PATH if logos_dir == LOGOS_DIR else None
+            catalog = logo_catalog.LogoCatalog(logos_dir, manifest_path, Config.IMAGE_CATALOG_RESCAN_S)
+            _catalogs[logos_dir] = catalog
+        return catalog
+
+def get_logos_list():
+    """Retourne la liste des logos disponibles avec leurs métadonnées
     
-    logos = []
-    for filename in os.listdir(logos_dir):
-        if file_utils.allowed_image_file(filename):
-            filepath = os.path.join(logos_dir, filename)
-            try:
-                with Image.open(filepath) as img:
-                    width, height = img.size
-                    format_type = img.format
-                    mode = img.mode
-                    file_size = os.path.getsize(filepath)
-                    
-                    logos.append({
-                        'name': filename,
-                        'path': f'/static/assets/images_clubs/{filename}',
-                        'width': width,
-                        'height': height,
-                        'format': format_type,
-                        'mode': mode,
-                        'size_bytes': file_size,
-                        'size_kb': round(file_size / 1024, 2),
-                        'aspect_ratio': round(width / height, 2) if height > 0 else 0
-                    })
-            except Exception as e:
-                # Si l'image ne peut pas être lue, ajouter quand même les infos de base
-                logos.append({
-                    'name': filename,
-                    'path': f'/static/assets/images_clubs/{filename}',
-                    'error': str(e)
-                })
+    Servie par le catalogue : seuls les fichiers nouveaux ou modifiés depuis le
+    dernier parcours (ou depuis le manifeste enregistré) sont rouverts. Chaque
+    logo lisible porte les URL de ses miniatures ('thumbnails', par taille).
+    """
+    return [logo if 'error' in logo else dict(logo, thumbnails=_thumbnail_urls(logo))
+            for logo in _get_catalog().get_logos()]
+
+def _thumbnail_urls(logo):
+    """URL versionnées (révision du logo) des miniatures d'un logo, par taille"""
+    name = quote(logo['name'])
+    return {str(size): f"/api/image/thumbnail/{name}?size={size}&format={THUMBNAIL_FORMAT}&v={logo['revision']}"
+            for size in _derivatives.sizes}
+
+def get_logo_derivative(filename, size, fmt=None):
+    """Miniature d'un logo (générée au premier accès) : (chemin, ETag, type MIME)"""
+    fmt = fmt or THUMBNAIL_FORMAT
+    _derivatives.validate(size, fmt)
+    filepath = os.path.join(get_logos_dir(), filename)
+    if os.path.basename(filename) != filename or not file_utils.allowed_image_file(filename) \
+            or not os.path.isfile(filepath):
+        raise FileNotFoundError(f"Image non trouvée: {filename}")
+    return _derivatives.get(filepath, size, fmt)
+
+def _derive_item(item):
+    """Tâche d'un processus du pool : (chemin, taille, format) -> génération de la miniature"""
+    filepath, size, fmt = item
+    return _derivatives.get(filepath, size, fmt)[0]
+
+def build_logo_derivatives(formats=None, prune=False):
+    """Génère d'avance toutes les miniatures des logos (tailles configurées, formats demandés)
     
-    return logos
+    Les miniatures déjà présentes ne sont pas régénérées ; les autres sont réparties
+    sur le pool de processus de l'analyse par lots. Avec `prune`, les miniatures des
+    anciennes versions des logos sont supprimées. Retourne les statistiques du lot.
+    """
+    formats = formats or [THUMBNAIL_FORMAT]
+    for fmt in formats:
+        _derivatives.validate(_derivatives.sizes[0], fmt)
+    logos_dir = get_logos_dir()
+    paths = [os.path.join(logos_dir, logo['name']) for logo in _get_catalog().get_logos() if 'error' not in logo]
+    items = [(path, size, fmt) for path in paths for size in _derivatives.sizes for fmt in formats]
+    outcomes, stats = batch_analysis.run_batch(_derive_item, items,
+                                               workers=Config.IMAGE_BATCH_WORKERS,
+                                               chunk_size=Config.IMAGE_BATCH_CHUNK_SIZE,
+                                               min_parallel=Config.IMAGE_BATCH_MIN_PARALLEL)
+    errors = [f"{os.path.basename(item[0])} ({item[1]}px, {item[2]}): {value}"
+              for item, (ok, value) in zip(items, outcomes) if not ok]
+    stats.update(logos=len(paths), derivatives=len(items), failed=len(errors), errors=errors)
+    if prune:
+        stats['pruned'] = _derivatives.prune(paths)
+    return stats
+
+def get_derivative_stats():
+    """Retourne les compteurs des miniatures des logos"""
+    return _derivatives.get_stats()
+
+def get_catalog_stats():
+    """Retourne les compteurs du catalogue des logos"""
+    catalog = _get_catalog()
+    catalog.get_logos()
+    return catalog.get_stats()
 
 def get_image_stats():
-    """Calcule les statistiques globales des images"""
-    logos = get_logos_list()
-    
+    """Calcule les statistiques globales des images (recalculées seulement si le catalogue change)"""
+    catalog = _get_catalog()
+    logos = catalog.get_logos()
+    key = (catalog.directory, catalog.version)
+    with _catalogs_lock:
+        if _image_stats.get('key') == key:
+            return _image_stats['stats']
+    stats = _compute_image_stats(logos)
+    with _catalogs_lock:
+        _image_stats.update(key=key, stats=stats)
+    return stats
+
+def _compute_image_stats(logos):
+    """Statistiques globales d'une liste de logos"""
     if not logos:
         return {}
     
@@ -110,95 +214,186 @@ def get_image_stats():
         'formats': format_counts
     }
 
-def analyze_image_colors(filename, use_kmeans=True):
-    """Analyse les couleurs dominantes d'une image avec k-means ou méthode fréquentielle"""
+class ImageTooLargeError(ValueError):
+    """Image dont le décodage dépasserait Config.IMAGE_MAX_PIXELS pixels"""
+
+def _check_pixels(img):
+    """Refuse de décoder une image de plus de Config.IMAGE_MAX_PIXELS pixels (taille après draft)"""
+    width, height = img.size
+    if width * height > Config.IMAGE_MAX_PIXELS:
+        raise ImageTooLargeError(f"Image trop grande pour l'analyse: {width}x{height} pixels "
+                                 f"(maximum {Config.IMAGE_MAX_PIXELS})")
+
+def _decode_rgb(img, size=None):
+    """Décode une image ouverte en RGB ; avec `size`, un JPEG est décodé réduit (draft) à au moins `size` px"""
+    if size is not None:
+        # Sans effet hors JPEG ; la taille de l'image devient celle du décodage réduit
+        img.draft('RGB', (size, size))
+    _check_pixels(img)
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    img.load()
+    return img
+
+def _resolve_engine(engine=None):
+    """Moteur de couleurs demandé, ou celui de la configuration (ValueError si inconnu)"""
+    return color_engines.resolve_engine(engine or Config.IMAGE_COLOR_ENGINE)
+
+def analyze_image_colors(filename, use_kmeans=True, engine=None):
+    """Analyse les couleurs dominantes d'une image avec le moteur choisi
+    
+    `engine` : 'kmeans', 'minibatch', 'median_cut', 'histogram' ou 'frequency'
+    (Config.IMAGE_COLOR_ENGINE par défaut) ; `use_kmeans=False` force la méthode
+    fréquentielle. Le résultat est servi par le cache persistant quand le même
+    contenu a déjà été analysé avec les mêmes paramètres (quel que soit le nom du fichier).
+    """
     logos_dir = get_logos_dir()
     filepath = os.path.join(logos_dir, filename)
     
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"Image {filename} non trouvée")
     
+    method = _resolve_engine(engine) if use_kmeans else 'frequency'
+    key = _analysis_key(filepath, method, 'draft')
+    result = _color_cache.get_or_compute(key, lambda: _compute_image_colors(filepath, method, 'draft'))
+    return dict(result, filename=filename)
+
+def _analysis_key(filepath, method, decode):
+    """Clé du cache persistant : contenu du fichier + paramètres de l'analyse (dont le mode de décodage)"""
+    params = {'method': method, 'colors': DOMINANT_COLORS, 'size': ANALYSIS_SIZE,
+              'filter': ANALYSIS_FILTER, 'decode': decode, 'version': COLOR_ANALYSIS_VERSION}
+    return analysis_cache.make_key(analysis_cache.content_digest(filepath), params)
+
+def _analyze_item(item):
+    """Tâche d'un processus du pool : (chemin, moteur) -> analyse des couleurs (décodage réduit) sans cache"""
+    filepath, method = item
+    return _compute_image_colors(filepath, method, 'draft')
+
+def analyze_images_batch(filenames, engine=None):
+    """Analyse les couleurs dominantes de plusieurs logos
+    
+    Les résultats déjà en cache sont servis directement ; les autres logos (un seul
+    calcul par contenu identique) sont répartis sur un pool de processus
+    (IMAGE_BATCH_WORKERS, par morceaux de IMAGE_BATCH_CHUNK_SIZE). Retourne les
+    résultats dans l'ordre des fichiers, un échec donnant {'filename', 'error'},
+    et les statistiques du lot (dont le débit en images/s).
+    """
+    method = _resolve_engine(engine)
+    logos_dir = get_logos_dir()
+    start = time.perf_counter()
+
+    results = [None] * len(filenames)
+    pending = {}
+    cached_count = 0
+    for position, filename in enumerate(filenames):
+        filepath = os.path.join(logos_dir, filename)
+        try:
+            key = _analysis_key(filepath, method, 'draft')
+        except OSError as e:
+            results[position] = {'filename': filename, 'error': f"Image {filename} non trouvée: {e}"}
+            continue
+        if key in pending:
+            pending[key]['positions'].append(position)
+            continue
+        cached = _color_cache.get(key)
+        if cached is not None:
+            results[position] = dict(cached, filename=filename)
+            cached_count += 1
+        else:
+            pending[key] = {'filepath': filepath, 'positions': [position]}
+
+    outcomes, batch = batch_analysis.run_batch(
+        _analyze_item, [(task['filepath'], method) for task in pending.values()],
+        workers=Config.IMAGE_BATCH_WORKERS, chunk_size=Config.IMAGE_BATCH_CHUNK_SIZE,
+        min_parallel=Config.IMAGE_BATCH_MIN_PARALLEL
+    )
+    for (key, task), (ok, value) in zip(pending.items(), outcomes):
+        if ok:
+            _color_cache.put(key, value)
+        for position in task['positions']:
+            filename = filenames[position]
+            results[position] = dict(value, filename=filename) if ok else {'filename': filename, 'error': value}
+
+    seconds = time.perf_counter() - start
+    failed = sum(1 for result in results if 'error' in result)
+    stats = {
+        'images': len(filenames),
+        'cached': cached_count,
+        'computed': batch['items'] - batch['failed'],
+        'failed': failed,
+        'engine': method,
+        'mode': batch['mode'],
+        'workers': batch['workers'],
+        'chunk_size': batch['chunk_size'],
+        'seconds': round(seconds, 4),
+        'images_per_second': round(len(filenames) / seconds, 2) if seconds > 0 else 0.0
+    }
+    with _last_batch_lock:
+        _last_batch.clear()
+        _last_batch.update(stats)
+    return results, stats
+
+def _compute_image_colors(filepath, method, decode='draft'):
+    """Calcule les couleurs dominantes d'une image (sans cache)
+    
+    `decode` : 'draft' (JPEG décodé directement à résolution réduite, au moins
+    ANALYSIS_SIZE px) ou 'full' (décodage pleine résolution), voir ImageAnalysis.decode_mode.
+    """
     try:
-        with Image.open(filepath) as img:
-            # Convertir en RGB si nécessaire
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # Redimensionner pour accélérer l'analyse
-            img.thumbnail((200, 200), Image.Resampling.LANCZOS)
-            
-            # Convertir en numpy array
-            img_array = np.array(img)
-            pixels = img_array.reshape(-1, 3)
-            
-            if len(pixels) == 0:
-                raise ValueError("Image vide ou invalide")
-            
-            colors = []
-            
-            # Utiliser k-means si disponible, sinon méthode fréquentielle
-            if use_kmeans and SKLEARN_AVAILABLE:
-                # K-means clustering pour trouver les couleurs dominantes
-                n_clusters = min(5, len(pixels))
-                kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-                kmeans.fit(pixels)
-                
-                # Obtenir les centres de clusters (couleurs dominantes)
-                cluster_centers = kmeans.cluster_centers_
-                labels = kmeans.labels_
-                
-                # Calculer le pourcentage de chaque cluster
-                unique_labels, counts = np.unique(labels, return_counts=True)
-                
-                for i, (label, count) in enumerate(zip(unique_labels, counts)):
-                    center = cluster_centers[label]
-                    r, g, b = int(center[0]), int(center[1]), int(center[2])
-                    r = max(0, min(255, r))
-                    g = max(0, min(255, g))
-                    b = max(0, min(255, b))
-                    
-                    colors.append({
-                        'rgb': [r, g, b],
-                        'hex': '#{:02x}{:02x}{:02x}'.format(r, g, b),
-                        'frequency': int(count),
-                        'percentage': round((count / len(pixels)) * 100, 2)
-                    })
-                
-                # Trier par pourcentage décroissant
-                colors.sort(key=lambda x: x['percentage'], reverse=True)
-            else:
-                # Méthode fréquentielle (fallback)
-                quantized = (pixels // 32) * 32
-                color_counts = Counter(map(tuple, quantized))
-                top_colors = color_counts.most_common(5)
-                
-                for color, count in top_colors:
-                    r = int(color[0]) if not isinstance(color[0], str) else int(color[0])
-                    g = int(color[1]) if not isinstance(color[1], str) else int(color[1])
-                    b = int(color[2]) if not isinstance(color[2], str) else int(color[2])
-                    
-                    r = max(0, min(255, r))
-                    g = max(0, min(255, g))
-                    b = max(0, min(255, b))
-                    
-                    colors.append({
-                        'rgb': [r, g, b],
-                        'hex': '#{:02x}{:02x}{:02x}'.format(r, g, b),
-                        'frequency': int(count),
-                        'percentage': round((count / len(pixels)) * 100, 2)
-                    })
-            
-            return {
-                'filename': filename,
-                'colors': colors,
-                'total_pixels': len(pixels),
-                'method': 'kmeans' if (use_kmeans and SKLEARN_AVAILABLE) else 'frequency'
-            }
+        decode_size = {'draft': ANALYSIS_SIZE, 'full': None}[decode]
+        with ImageAnalysis(filepath, decode_size=decode_size) as analysis:
+            return _colors_from_pixels(analysis.thumbnail_pixels, method, decode)
+    except ImageTooLargeError:
+        raise
     except Exception as e:
         raise Exception(f"Erreur lors de l'analyse des couleurs: {str(e)}")
 
-def get_image_histograms(filename):
-    """Calcule les histogrammes RGB et HSV d'une image"""
+def _colors_from_pixels(pixels, method, decode):
+    """Couleurs dominantes de pixels RGB (N, 3) déjà réduits à ANALYSIS_SIZE"""
+    if len(pixels) == 0:
+        raise ValueError("Image vide ou invalide")
+    
+    colors = color_engines.dominant_colors(pixels, DOMINANT_COLORS, method)
+    
+    return {
+        'colors': colors,
+        'total_pixels': len(pixels),
+        'method': method,
+        'decode': decode
+    }
+
+def _histograms_payload(analysis, bins=None, encoding='json', size=None):
+    """Histogrammes RGB / HSV d'une image décodée, éventuellement réduite à `size` px de côté
+    
+    Sans réduction ni encodage particulier, la réponse garde le format historique
+    (256 cases RGB, 360 / 100 / 100 cases HSV, listes d'entiers).
+    """
+    image = analysis.rgb if size is None else analysis.reduced(size)
+    payload = histograms.encode(histograms.compute(image, bins), encoding)
+    if size is not None:
+        payload['sampled_size'] = list(image.size)
+    return payload
+
+def _histogram_options(bins=None, encoding='json', size=None):
+    """Options des histogrammes validées (ValueError si invalides)"""
+    histograms.resolve_bins(bins)
+    if encoding not in histograms.ENCODINGS:
+        raise ValueError(f"Encodage d'histogramme non supporté: {encoding} "
+                         f"(possibles: {', '.join(histograms.ENCODINGS)})")
+    if size is not None:
+        size = int(size)
+        if size < MIN_HISTOGRAM_SIZE:
+            raise ValueError(f"Taille de réduction invalide: {size} (minimum {MIN_HISTOGRAM_SIZE})")
+    return {'bins': bins, 'encoding': encoding, 'size': size}
+
+def get_image_histograms(filename, bins=None, encoding='json', size=None):
+    """Calcule les histogrammes RGB et HSV d'une image
+    
+    `bins` : nombre de cases de chaque canal (format historique si None) ;
+    `encoding` : 'json', 'base64' ou 'quantized' ; `size` : côté maximal d'une
+    version réduite de l'image sur laquelle compter (pleine résolution si None).
+    """
+    options = _histogram_options(bins, encoding, size)
     logos_dir = get_logos_dir()
     filepath = os.path.join(logos_dir, filename)
     
@@ -206,72 +401,208 @@ def get_image_histograms(filename):
         raise FileNotFoundError(f"Image {filename} non trouvée")
     
     try:
-        with Image.open(filepath) as img:
-            # Convertir en RGB
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            img_array = np.array(img)
-            
-            # Histogramme RGB
-            r_hist = np.histogram(img_array[:, :, 0].flatten(), bins=256, range=(0, 256))[0]
-            g_hist = np.histogram(img_array[:, :, 1].flatten(), bins=256, range=(0, 256))[0]
-            b_hist = np.histogram(img_array[:, :, 2].flatten(), bins=256, range=(0, 256))[0]
-            
-            # Convertir en HSV en utilisant PIL (plus rapide)
-            hsv_img = img.convert('HSV')
-            hsv_array = np.array(hsv_img)
-            
-            # Convertir les valeurs HSV
-            # H: 0-255 -> 0-360, S: 0-255 -> 0-100, V: 0-255 -> 0-100
-            hsv_normalized = np.zeros_like(hsv_array, dtype=float)
-            hsv_normalized[:, :, 0] = (hsv_array[:, :, 0] / 255.0) * 360  # H
-            hsv_normalized[:, :, 1] = (hsv_array[:, :, 1] / 255.0) * 100   # S
-            hsv_normalized[:, :, 2] = (hsv_array[:, :, 2] / 255.0) * 100   # V
-            
-            # Histogramme HSV (utiliser les valeurs normalisées)
-            h_hist = np.histogram(hsv_normalized[:, :, 0].flatten(), bins=360, range=(0, 360))[0]
-            s_hist = np.histogram(hsv_normalized[:, :, 1].flatten(), bins=100, range=(0, 100))[0]
-            v_hist = np.histogram(hsv_normalized[:, :, 2].flatten(), bins=100, range=(0, 100))[0]
-            
-            return {
-                'rgb': {
-                    'r': r_hist.tolist(),
-                    'g': g_hist.tolist(),
-                    'b': b_hist.tolist()
-                },
-                'hsv': {
-                    'h': h_hist.tolist(),
-                    's': s_hist.tolist(),
-                    'v': v_hist.tolist()
-                }
-            }
+        with ImageAnalysis(filepath, decode_size=options['size']) as analysis:
+            return _histograms_payload(analysis, **options)
+    except ImageTooLargeError:
+        raise
     except Exception as e:
         raise Exception(f"Erreur lors du calcul des histogrammes: {str(e)}")
 
-def get_clubs_comparison(limit=10):
+class ImageAnalysis:
+    """Image décodée une seule fois, partagée par les étapes d'analyse
+    
+    L'en-tête, le décodage RGB et la miniature d'analyse sont produits à la demande
+    puis réutilisés ; `timings` cumule leur durée (ms). Avec `decode_size`, un JPEG
+    est décodé directement à résolution réduite (1/2, 1/4 ou 1/8, au moins
+    `decode_size` px de côté) ; sinon l'image est décodée en pleine résolution.
+    La miniature d'analyse des couleurs est tirée de ce même décodage ; le décodage
+    réduit de libjpeg ne donnant pas les mêmes pixels, `decode_mode` ('draft' ou
+    'full') fait partie de la clé des couleurs en cache.
+    Au-delà de Config.IMAGE_MAX_PIXELS pixels à décoder, ImageTooLargeError.
+    """
+    
+    def __init__(self, filepath, decode_size=None):
+        self.filepath = filepath
+        self.decode_size = decode_size
+        self.timings = {}
+        self.header = None
+        self._image = None
+        self._rgb = None
+        self._reduced = {}
+        self._thumbnail_pixels = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        if self._image is not None:
+            self._image.close()
+    
+    def _timed(self, name, function):
+        start = time.perf_counter()
+        result = function()
+        self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+        return result
+    
+    @property
+    def image(self):
+        """Image ouverte (en-tête lu, pixels non décodés)"""
+        if self._image is None:
+            self._image = self._timed('open', lambda: Image.open(self.filepath))
+            # Caractéristiques du fichier, avant un éventuel décodage réduit
+            self.header = {'size': self._image.size, 'format': self._image.format, 'mode': self._image.mode}
+        return self._image
+    
+    @property
+    def rgb(self):
+        """Image décodée en RGB (pleine résolution, ou réduite au décodage si decode_size)"""
+        if self._rgb is None:
+            img = self.image
+            self._rgb = self._timed('decode', lambda: _decode_rgb(img, self.decode_size))
+        return self._rgb
+    
+    def reduced(self, size):
+        """Image RGB réduite d'un facteur entier (moyenne par blocs) pour tenir dans `size` px"""
+        if size not in self._reduced:
+            rgb = self.rgb
+            factor = -(-max(rgb.size) // size)
+            self._reduced[size] = rgb if factor <= 1 else self._timed('reduce', lambda: rgb.reduce(factor))
+        return self._reduced[size]
+    
+    @property
+    def decode_mode(self):
+        """Mode de décodage : 'full', 'draft' (réduit pour ANALYSIS_SIZE px) ou 'draft:<px>'"""
+        if self.decode_size is None:
+            return 'full'
+        return 'draft' if self.decode_size == ANALYSIS_SIZE else f'draft:{self.decode_size}'
+    
+    @property
+    def thumbnail_pixels(self):
+        """Pixels (N, 3) de la miniature d'analyse (ANALYSIS_SIZE px, filtre ANALYSIS_FILTER)"""
+        if self._thumbnail_pixels is None:
+            if self.decode_size is not None and self.decode_size < ANALYSIS_SIZE:
+                raise ValueError(f"La miniature d'analyse exige un décodage d'au moins {ANALYSIS_SIZE} px")
+            rgb = self.rgb
+            def reduce():
+                thumbnail = rgb.copy()
+                thumbnail.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE), ANALYSIS_FILTERS[ANALYSIS_FILTER])
+                return np.array(thumbnail).reshape(-1, 3)
+            self._thumbnail_pixels = self._timed('thumbnail', reduce)
+        return self._thumbnail_pixels
+
+def _stage_metadata(analysis, filename, options):
+    """Étape métadonnées : dimensions, format, mode et taille du fichier"""
+    analysis.image
+    header = analysis.header
+    width, height = header['size']
+    file_size = os.path.getsize(analysis.filepath)
+    return {
+        'width': width,
+        'height': height,
+        'format': header['format'],
+        'mode': header['mode'],
+        'size_bytes': file_size,
+        'size_kb': round(file_size / 1024, 2),
+        'aspect_ratio': round(width / height, 2) if height > 0 else 0
+    }
+
+def _stage_colors(analysis, filename, options):
+    """Étape couleurs dominantes (servie par le cache persistant si possible, sans décodage)"""
+    method = options['engine']
+    decode = analysis.decode_mode
+    key = _analysis_key(analysis.filepath, method, decode)
+    result = _color_cache.get_or_compute(key, lambda: _colors_from_pixels(analysis.thumbnail_pixels, method, decode))
+    return result.get('colors', [])
+
+def _stage_histograms(analysis, filename, options):
+    """Étape histogrammes RGB / HSV (options 'bins', 'encoding' et 'size' de options['histograms'])"""
+    return _histograms_payload(analysis, **options.get('histograms', {}))
+
+# Étapes d'analyse d'une image, dans l'ordre d'exécution :
+# nom -> (fonction, valeur en cas d'échec, résolution utile selon les options).
+# La résolution utile est 0 sans décodage, None pour la pleine résolution, sinon le côté en px
+# nécessaire. Une nouvelle caractéristique s'ajoute ici et réutilise le décodage partagé.
+ANALYSIS_STAGES = {
+    'metadata': (_stage_metadata, None, lambda options: 0),
+    'colors': (_stage_colors, [], lambda options: ANALYSIS_SIZE),
+    'histograms': (_stage_histograms, None, lambda options: options.get('histograms', {}).get('size')),
+}
+
+def _decode_size(stages, options):
+    """Côté du décodage réduit suffisant pour les étapes (None si l'une exige la pleine résolution)"""
+    sizes = [ANALYSIS_STAGES[stage][2](options) for stage in stages]
+    if any(size is None for size in sizes):
+        return None
+    return max(sizes, default=0) or None
+
+def parse_stages(stages):
+    """Liste d'étapes ('colors,histograms' ou liste) validée ; toutes les étapes si vide"""
+    if not stages:
+        return list(ANALYSIS_STAGES)
+    if isinstance(stages, str):
+        stages = [stage.strip() for stage in stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in ANALYSIS_STAGES]
+    if unknown:
+        raise ValueError(f"Étapes d'analyse inconnues: {', '.join(unknown)} (possibles: {', '.join(ANALYSIS_STAGES)})")
+    return [stage for stage in ANALYSIS_STAGES if stage in stages]
+
+def run_analysis(filepath, filename, stages, options):
+    """Exécute les étapes demandées sur une image décodée une seule fois
+    
+    Le décodage est réduit autant que le permettent les étapes demandées. L'échec
+    d'une étape (autre que les métadonnées ou une image trop grande) est signalé et
+    remplacé par sa valeur par défaut. Retourne (résultats par étape, durées en ms par étape et pour
+    l'ouverture, le décodage et la miniature partagés).
+    """
+    results = {}
+    timings = {}
+    with ImageAnalysis(filepath, decode_size=_decode_size(stages, options)) as analysis:
+        for stage in stages:
+            function, default, _ = ANALYSIS_STAGES[stage]
+            shared_before = sum(analysis.timings.values())
+            start = time.perf_counter()
+            try:
+                results[stage] = function(analysis, filename, options)
+            except Exception as e:
+                if stage == 'metadata' or isinstance(e, ImageTooLargeError):
+                    raise
+                print(f"Warning: Étape {stage} impossible pour {filename}: {e}")
+                results[stage] = default
+            elapsed = (time.perf_counter() - start) * 1000
+            timings[stage] = round(elapsed - (sum(analysis.timings.values()) - shared_before), 3)
+        for name, value in analysis.timings.items():
+            timings[name] = round(value, 3)
+    timings['total'] = round(sum(timings.values()), 3)
+    return results, timings
+
+def get_clubs_comparison(limit=10, engine=None):
     """Récupère les couleurs dominantes de plusieurs clubs pour comparaison"""
+    engine = _resolve_engine(engine)
     logos = get_logos_list()
     valid_logos = [logo for logo in logos if 'error' not in logo][:limit]
     
+    results, _ = analyze_images_batch([logo['name'] for logo in valid_logos], engine=engine)
+    
     clubs_data = []
-    for logo in valid_logos:
-        try:
-            colors_data = analyze_image_colors(logo['name'], use_kmeans=True)
-            clubs_data.append({
-                'name': logo['name'].replace('.png', '').replace('.jpg', '').replace('.jpeg', ''),
-                'filename': logo['name'],
-                'path': logo['path'],
-                'colors': colors_data.get('colors', [])[:3]  # Top 3 couleurs
-            })
-        except Exception as e:
-            print(f"Erreur pour {logo['name']}: {e}")
+    for logo, colors_data in zip(valid_logos, results):
+        if 'error' in colors_data:
+            print(f"Erreur pour {logo['name']}: {colors_data['error']}")
             continue
+        clubs_data.append({
+            'name': logo['name'].replace('.png', '').replace('.jpg', '').replace('.jpeg', ''),
+            'filename': logo['name'],
+            'path': logo['path'],
+            'colors': colors_data.get('colors', [])[:3]  # Top 3 couleurs
+        })
     
     return clubs_data
 
-def get_all_images_analysis():
+def get_all_images_analysis(engine=None):
     """Analyse globale de toutes les images combinées"""
+    engine = _resolve_engine(engine)
     logos = get_logos_list()
     valid_logos = [logo for logo in logos if 'error' not in logo]
     
@@ -284,65 +615,37 @@ def get_all_images_analysis():
             'size_distribution': {}
         }
     
+    # Analyser les couleurs de toutes les images (cache + pool de processus)
+    results, batch_stats = analyze_images_batch([logo['name'] for logo in valid_logos], engine=engine)
+    
     # Collecter toutes les couleurs de toutes les images
     all_colors_rgb = []
     all_colors_hex = []
     format_counts = {}
     sizes = []
     
-    for logo in valid_logos:
-        try:
-            # Analyser les couleurs
-            colors_data = analyze_image_colors(logo['name'], use_kmeans=True)
-            colors = colors_data.get('colors', [])
-            
-            for color in colors:
-                all_colors_rgb.append(color['rgb'])
-                all_colors_hex.append(color['hex'])
-            
-            # Compter les formats
-            fmt = logo.get('format', 'UNKNOWN')
-            format_counts[fmt] = format_counts.get(fmt, 0) + 1
-            
-            # Collecter les tailles
-            sizes.append(logo.get('size_kb', 0))
-            
-        except Exception as e:
-            print(f"Erreur lors de l'analyse de {logo['name']}: {e}")
+    for logo, colors_data in zip(valid_logos, results):
+        if 'error' in colors_data:
+            print(f"Erreur lors de l'analyse de {logo['name']}: {colors_data['error']}")
             continue
+        
+        for color in colors_data.get('colors', []):
+            all_colors_rgb.append(color['rgb'])
+            all_colors_hex.append(color['hex'])
+        
+        # Compter les formats
+        fmt = logo.get('format', 'UNKNOWN')
+        format_counts[fmt] = format_counts.get(fmt, 0) + 1
+        
+        # Collecter les tailles
+        sizes.append(logo.get('size_kb', 0))
     
-    # Trouver les couleurs globales dominantes avec k-means sur toutes les couleurs
+    # Trouver les couleurs globales dominantes avec le même moteur, sur toutes les couleurs
     global_colors = []
-    if all_colors_rgb and SKLEARN_AVAILABLE:
+    if all_colors_rgb:
         try:
-            colors_array = np.array(all_colors_rgb)
-            n_clusters = min(10, len(colors_array))
-            if n_clusters > 0:
-                kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-                kmeans.fit(colors_array)
-                
-                cluster_centers = kmeans.cluster_centers_
-                labels = kmeans.labels_
-                
-                unique_labels, counts = np.unique(labels, return_counts=True)
-                
-                for label, count in zip(unique_labels, counts):
-                    center = cluster_centers[label]
-                    r, g, b = int(center[0]), int(center[1]), int(center[2])
-                    r = max(0, min(255, r))
-                    g = max(0, min(255, g))
-                    b = max(0, min(255, b))
-                    
-                    percentage = round((count / len(all_colors_rgb)) * 100, 2)
-                    
-                    global_colors.append({
-                        'rgb': [r, g, b],
-                        'hex': '#{:02x}{:02x}{:02x}'.format(r, g, b),
-                        'frequency': int(count),
-                        'percentage': percentage
-                    })
-                
-                global_colors.sort(key=lambda x: x['percentage'], reverse=True)
+            colors_array = np.array(all_colors_rgb, dtype=np.uint8)
+            global_colors = color_engines.dominant_colors(colors_array, GLOBAL_COLORS, engine)
         except Exception as e:
             print(f"Erreur lors du clustering global: {e}")
             # Fallback: utiliser les couleurs les plus fréquentes
@@ -380,11 +683,21 @@ def get_all_images_analysis():
             'max': round(max(sizes), 2) if sizes else 0,
             'mean': round(np.mean(sizes), 2) if sizes else 0,
             'median': round(np.median(sizes), 2) if sizes else 0
-        }
+        },
+        'batch': batch_stats
     }
 
-def get_image_details(filename):
-    """Récupère les détails complets d'une image"""
+def get_image_details(filename, engine=None, stages=None, timings=False, histogram_options=None):
+    """Récupère les détails complets d'une image
+    
+    Les étapes demandées (`stages`, toutes par défaut : métadonnées, couleurs,
+    histogrammes) partagent un seul décodage du fichier ; avec `timings=True`, la
+    réponse inclut la durée de chaque étape. `histogram_options` : 'bins',
+    'encoding' et 'size' (voir get_image_histograms).
+    """
+    engine = _resolve_engine(engine)
+    stages = parse_stages(stages)
+    histogram_options = _histogram_options(**(histogram_options or {}))
     logos_dir = get_logos_dir()
     filepath = os.path.join(logos_dir, filename)
     
@@ -392,50 +705,27 @@ def get_image_details(filename):
         raise FileNotFoundError(f"Image {filename} non trouvée dans {logos_dir}")
     
     try:
-        with Image.open(filepath) as img:
-            width, height = img.size
-            format_type = img.format
-            mode = img.mode
-            file_size = os.path.getsize(filepath)
-            
-            # Analyser les couleurs (avec gestion d'erreur)
-            colors = []
-            histograms = None
-            try:
-                colors_data = analyze_image_colors(filename, use_kmeans=True)
-                colors = colors_data.get('colors', [])
-            except Exception as color_error:
-                # Si l'analyse des couleurs échoue, on continue quand même avec les autres infos
-                print(f"Warning: Impossible d'analyser les couleurs pour {filename}: {color_error}")
-                colors = []
-            
-            # Calculer les histogrammes
-            try:
-                histograms = get_image_histograms(filename)
-            except Exception as hist_error:
-                print(f"Warning: Impossible de calculer les histogrammes pour {filename}: {hist_error}")
-                histograms = None
-            
-            return {
-                'name': filename,
-                'path': f'/static/assets/images_clubs/{filename}',
-                'width': width,
-                'height': height,
-                'format': format_type,
-                'mode': mode,
-                'size_bytes': file_size,
-                'size_kb': round(file_size / 1024, 2),
-                'aspect_ratio': round(width / height, 2) if height > 0 else 0,
-                'colors': colors,
-                'histograms': histograms
-            }
-    except FileNotFoundError:
+        results, stage_timings = run_analysis(filepath, filename, stages,
+                                              {'engine': engine, 'histograms': histogram_options})
+    except ImageTooLargeError:
         raise
     except Exception as e:
         import traceback
         error_details = traceback.format_exc()
         print(f"Erreur lors de la lecture de l'image {filename}: {error_details}")
         raise Exception(f"Erreur lors de la lecture de l'image: {str(e)}")
+    
+    details = {
+        'name': filename,
+        'path': f'/static/assets/images_clubs/{filename}'
+    }
+    details.update(results.get('metadata') or {})
+    for stage in stages:
+        if stage != 'metadata':
+            details[stage] = results[stage]
+    if timings:
+        details['timings'] = stage_timings
+    return details
 
 def process_image(files):
     """Traite une image uploadée"""
@@ -0,0 +1,174 @@
+import io
+import os
+import csv
+import codecs
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+# Clé d'un joueur pour l'upsert : un joueur transféré a une ligne par club
+KEY_COLUMNS = ['Player name', 'Squad']
+INGEST_MODES = ['append', 'upsert']
+
+_encodings = {}
+_encodings_lock = threading.Lock()
+
+
+def detect_encoding(filename, block_size=1024 * 1024):
+    """Encodage du fichier ('utf-8', sinon 'latin-1' comme à la lecture), mémorisé par chemin"""
+    path = os.path.abspath(filename)
+    with _encodings_lock:
+        if path in _encodings:
+            return _encodings[path]
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    encoding = 'utf-8'
+    try:
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        encoding = 'latin-1'
+    with _encodings_lock:
+        _encodings[path] = encoding
+    return encoding
+
+
+def read_header(filename, encoding):
+    """En-têtes bruts du fichier (ex. 'Player name ' avec son espace final)"""
+    with open(filename, 'r', encoding=encoding, newline='') as f:
+        return next(csv.reader(f))
+
+
+def rows_from_records(records):
+    """DataFrame texte à partir d'une liste de dictionnaires (noms de colonnes sans espaces superflus)"""
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        raise ValueError("Les lignes doivent être une liste d'objets {colonne: valeur}")
+    frame = pd.DataFrame.from_records(records)
+    frame = frame.rename(columns=lambda name: str(name).strip())
+    return frame.map(lambda value: None if value is None else str(value))
+
+
+def rows_from_csv_text(text):
+    """DataFrame texte à partir d'un contenu CSV (avec en-tête)"""
+    frame = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+    return frame.rename(columns=lambda name: name.strip())
+
+
+def split_upsert(rows, existing_keys):
+    """Sépare les lignes remplaçant un joueur existant de celles à ajouter"""
+    keys = list(zip(*(rows[col].str.strip() for col in KEY_COLUMNS)))
+    replace = np.array([key in existing_keys for key in keys], dtype=bool)
+    return rows[replace], rows[~replace]
+
+
+def frame_keys(df):
+    """Ensemble des clés (nom, club) d'un DataFrame normalisé"""
+    columns = [df[col].astype(str).str.strip() for col in KEY_COLUMNS]
+    return set(zip(*columns))
+
+
+def _ordered_values(rows, header):
+    """Valeurs des lignes dans l'ordre des en-têtes bruts du fichier"""
+    names = [name.strip() for name in header]
+    values = rows.reindex(columns=names)
+    return [['' if value is None or value != value else value for value in record]
+            for record in values.itertuples(index=False, name=None)]
+
+
+def _encode_check(lines, encoding):
+    """Vérifie que les nouvelles lignes sont représentables dans l'encodage du fichier"""
+    for line in lines:
+        for value in line:
+            try:
+                value.encode(encoding)
+            except UnicodeEncodeError:
+                raise ValueError(f"Valeur non représentable en {encoding}: {value!r}")
+
+
+def append_rows(filename, rows):
+    """Ajoute des lignes brutes à la fin du CSV (ordre des colonnes et encodage du fichier)"""
+    encoding = detect_encoding(filename)
+    header = read_header(filename, encoding)
+    lines = _ordered_values(rows, header)
+    _encode_check(lines, encoding)
+
+    with open(filename, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+        else:
+            needs_newline = False
+    with open(filename, 'a', encoding=encoding, newline='') as f:
+        if needs_newline:
+            f.write('\n')
+        csv.writer(f, lineterminator='\n').writerows(lines)
+    return len(lines)
+
+
+def rewrite_rows(filename, replacements, additions):
+    """Réécrit le CSV en remplaçant les lignes des joueurs existants (upsert) puis en ajoutant les autres.
+
+    Écriture dans un fichier temporaire puis remplacement atomique.
+    """
+    encoding = detect_encoding(filename)
+    header = read_header(filename, encoding)
+    names = [name.strip() for name in header]
+    key_positions = [names.index(col) for col in KEY_COLUMNS]
+
+    replacement_lines = {}
+    for key, line in zip(zip(*(replacements[col].str.strip() for col in KEY_COLUMNS)),
+                         _ordered_values(replacements, header)):
+        replacement_lines[key] = line
+    addition_lines = _ordered_values(additions, header)
+    _encode_check(list(replacement_lines.values()) + addition_lines, encoding)
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    replaced = 0
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, newline='') as out, \
+                open(filename, 'r', encoding=encoding, newline='') as source:
+            reader = csv.reader(source)
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(next(reader))
+            written = set()
+            for record in reader:
+                key = tuple(record[position].strip() if position < len(record) else ''
+                            for position in key_positions)
+                if key in replacement_lines:
+                    # Une seule ligne par clé remplacée ; les doublons éventuels sont retirés
+                    if key not in written:
+                        writer.writerow(replacement_lines[key])
+                        written.add(key)
+                        replaced += 1
+                    continue
+                writer.writerow(record)
+            writer.writerows(addition_lines)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return replaced, len(addition_lines)
+
+
+def append_frames(frame, rows):
+    """Concatène des lignes normalisées au DataFrame en cache (catégories fusionnées)"""
+    columns = {}
+    for col in frame.columns:
+        old = frame[col]
+        new = rows[col] if col in rows.columns else pd.Series(np.nan, index=rows.index)
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            # Les nouvelles catégories sont ajoutées à la fin : les codes existants restent valides
+            new_values = pd.Index(new.astype(object))
+            categories = old.cat.categories.append(
+                pd.Index(new_values.dropna().unique()).difference(old.cat.categories, sort=False)
+            )
+            codes = np.concatenate([old.cat.codes.to_numpy(), categories.get_indexer(new_values)])
+            columns[col] = pd.Categorical.from_codes(codes, categories=categories)
+        else:
+            columns[col] = pd.concat([old, new.astype(old.dtype)], ignore_index=True)
+    return pd.DataFrame(columns)
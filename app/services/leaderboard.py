@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+# Colonnes d'identification renvoyées avec chaque ligne du classement
+LEADERBOARD_COLUMNS = ['Player name', 'Nation', 'Position', 'Squad', 'Compition', 'Age']
+# Minutes jouées (seuil min_minutes) et matchs ramenés à 90 minutes (valeurs per90)
+MINUTES_COLUMN = 'MIn'
+NINETIES_COLUMN = '90s'
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 500
+
+
+def metric_values(df, metric, per90=False):
+    """Valeurs float64 d'une métrique numérique, éventuellement ramenées à 90 minutes"""
+    if metric not in df.columns:
+        raise ValueError(f"Colonne {metric} non trouvée")
+    if not pd.api.types.is_numeric_dtype(df[metric]):
+        raise ValueError(f"La colonne {metric} n'est pas numérique")
+    values = df[metric].to_numpy(dtype=np.float64, na_value=np.nan)
+    if per90:
+        if NINETIES_COLUMN not in df.columns:
+            raise ValueError(f"Colonne {NINETIES_COLUMN} requise pour les valeurs per90")
+        nineties = df[NINETIES_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.where(nineties > 0, values / nineties, np.nan)
+    return values
+
+
+def top_k_positions(values, k, ascending=False, candidates=None):
+    """Positions des k meilleures valeurs par sélection partielle (argpartition), sans tri complet.
+
+    Les valeurs manquantes sont ignorées ; à valeur égale, l'ordre du dataset est conservé.
+    """
+    if candidates is not None:
+        values = values[candidates]
+    valid = np.flatnonzero(~np.isnan(values))
+    keys = values[valid] if ascending else -values[valid]
+    k = min(k, len(valid))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if k < len(valid):
+        # Seuil = k-ième meilleure clé ; les ex aequo au seuil sont tous retenus puis départagés par position
+        threshold = keys[np.argpartition(keys, k - 1)[k - 1]]
+        selected = np.flatnonzero(keys <= threshold)
+    else:
+        selected = np.arange(len(valid))
+    selected = selected[np.lexsort((valid[selected], keys[selected]))][:k]
+    positions = valid[selected]
+    return positions if candidates is None else candidates[positions]
+
+
+def leaderboard_columns(df, metric):
+    """Colonnes renvoyées pour chaque joueur classé (identité, métrique, temps de jeu)"""
+    columns = [col for col in LEADERBOARD_COLUMNS if col in df.columns]
+    for col in (metric, MINUTES_COLUMN, NINETIES_COLUMN):
+        if col in df.columns and col not in columns:
+            columns.append(col)
+    return columns
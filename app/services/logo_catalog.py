@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from PIL import Image
+from app.utils import file_utils
+
+# Version du format du manifeste : un manifeste d'une autre version est ignoré (reconstruit)
+MANIFEST_VERSION = 2
+
+
+def _read_entry(path, name, size, mtime_ns):
+    """Métadonnées d'un logo (ouverture de l'en-tête seulement, sans décoder les pixels)
+
+    `revision` change avec la taille ou le mtime du fichier : elle sert de jeton de
+    version dans les URL des miniatures, mises en cache longtemps par les navigateurs.
+    """
+    info = {
+        'name': name,
+        'path': f'/static/assets/images_clubs/{name}',
+        'revision': f'{mtime_ns:x}-{size:x}',
+    }
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            info.update({
+                'width': width,
+                'height': height,
+                'format': img.format,
+                'mode': img.mode,
+                'size_bytes': size,
+                'size_kb': round(size / 1024, 2),
+                'aspect_ratio': round(width / height, 2) if height > 0 else 0
+            })
+    except Exception as e:
+        # Si l'image ne peut pas être lue, garder quand même les infos de base
+        info['error'] = str(e)
+    return info
+
+
+class LogoCatalog:
+    """Catalogue des logos d'un dossier, tenu à jour par un manifeste persistant.
+
+    Le manifeste associe à chaque fichier sa taille, son mtime et ses métadonnées
+    (dimensions, format, mode) : une actualisation parcourt le dossier avec
+    os.scandir et ne rouvre que les fichiers nouveaux ou modifiés. Tant que le
+    mtime du dossier ne change pas (aucun ajout, retrait ni renommage), la liste
+    en mémoire est servie telle quelle pendant `rescan_interval` secondes.
+    `version` est incrémentée à chaque changement du contenu du catalogue.
+    """
+
+    def __init__(self, directory, manifest_path=None, rescan_interval=10):
+        self.directory = directory
+        self.manifest_path = manifest_path
+        self.rescan_interval = rescan_interval
+        self.version = 0
+        self._lock = threading.Lock()
+        self._records = None
+        self._logos = []
+        self._directory_mtime = None
+        self._scanned_at = 0.0
+        self.scans = 0
+        self.reads = 0
+
+    def _load_manifest(self):
+        """Enregistrements du manifeste persistant ({} s'il est absent, illisible ou d'un autre dossier)"""
+        if not self.manifest_path or not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Manifeste des logos illisible ({self.manifest_path}): {e}")
+            return {}
+        if manifest.get('version') != MANIFEST_VERSION or \
+                manifest.get('directory') != os.path.abspath(self.directory):
+            return {}
+        return manifest.get('entries', {})
+
+    def _save_manifest(self):
+        """Écrit le manifeste (fichier temporaire puis remplacement atomique)"""
+        if not self.manifest_path:
+            return
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'directory': os.path.abspath(self.directory),
+            'entries': self._records
+        }
+        tmp_path = None
+        try:
+            directory = os.path.dirname(os.path.abspath(self.manifest_path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                # json.dumps (encodeur C) plutôt que json.dump, qui encode morceau par morceau en Python
+                f.write(json.dumps(manifest, separators=(',', ':')))
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Warning: Manifeste des logos non enregistré ({self.manifest_path}): {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _scan(self):
+        """Parcourt le dossier et ne relit que les fichiers dont (taille, mtime) a changé"""
+        if self._records is None:
+            self._records = self._load_manifest()
+        records = {}
+        changed = False
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not file_utils.allowed_image_file(entry.name) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                record = self._records.get(entry.name)
+                if record is None or record['size'] != stat.st_size or record['mtime_ns'] != stat.st_mtime_ns:
+                    record = {
+                        'size': stat.st_size,
+                        'mtime_ns': stat.st_mtime_ns,
+                        'info': _read_entry(entry.path, entry.name, stat.st_size, stat.st_mtime_ns)
+                    }
+                    self.reads += 1
+                    changed = True
+                records[entry.name] = record
+        changed = changed or len(records) != len(self._records)
+        self._records = records
+        self.scans += 1
+        return changed
+
+    def get_logos(self):
+        """Liste des logos (ordre alphabétique) avec leurs métadonnées"""
+        with self._lock:
+            try:
+                directory_mtime = os.stat(self.directory).st_mtime_ns
+            except FileNotFoundError:
+                if self._logos:
+                    self._logos = []
+                    self.version += 1
+                self._records = {}
+                self._directory_mtime = None
+                return []
+            now = time.monotonic()
+            if directory_mtime == self._directory_mtime and now - self._scanned_at < self.rescan_interval:
+                return list(self._logos)
+            changed = self._scan()
+            if changed or self.version == 0:
+                self._logos = [self._records[name]['info'] for name in sorted(self._records)]
+                self.version += 1
+            if changed:
+                self._save_manifest()
+            self._directory_mtime = directory_mtime
+            self._scanned_at = now
+            return list(self._logos)
+
+    def get_stats(self):
+        """Compteurs du catalogue : logos, version, parcours du dossier et fichiers relus"""
+        with self._lock:
+            return {
+                'directory': self.directory,
+                'manifest_path': self.manifest_path,
+                'logos': len(self._logos),
+                'version': self.version,
+                'scans': self.scans,
+                'reads': self.reads
+            }
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import threading
+from PIL import Image
+from app.services import analysis_cache
+
+# Formats des dérivés : nom -> (format Pillow, type MIME, options d'enregistrement)
+DERIVATIVE_FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 85, 'method': 4}),
+    'png': ('PNG', 'image/png', {'optimize': True}),
+}
+# Version du rendu des dérivés : fait partie du nom des fichiers et de l'ETag
+DERIVATIVE_VERSION = 1
+
+
+def _has_alpha(img):
+    return img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+
+
+class LogoDerivatives:
+    """Miniatures des logos (plusieurs tailles, WebP / PNG) générées une fois et conservées sur disque.
+
+    Un dérivé est adressé par l'empreinte du contenu du logo source, sa taille, son
+    format et DERIVATIVE_VERSION : un logo modifié obtient de nouveaux dérivés au
+    premier accès, sans invalidation explicite. Les fichiers sont écrits de façon
+    atomique (fichier temporaire puis remplacement), donc partageables entre processus.
+    """
+
+    def __init__(self, cache_dir, sizes, max_pixels):
+        self.cache_dir = cache_dir
+        self.sizes = sorted(sizes)
+        self.max_pixels = max_pixels
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self.hits = 0
+        self.generated = 0
+
+    def validate(self, size, fmt):
+        """Vérifie la taille et le format demandés (ValueError sinon)"""
+        if size not in self.sizes:
+            raise ValueError(f"Taille de miniature non supportée: {size} "
+                             f"(possibles: {', '.join(str(value) for value in self.sizes)})")
+        if fmt not in DERIVATIVE_FORMATS:
+            raise ValueError(f"Format de miniature non supporté: {fmt} (possibles: {', '.join(DERIVATIVE_FORMATS)})")
+
+    def _path(self, digest, size, fmt):
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}-{size}-v{DERIVATIVE_VERSION}.{fmt}")
+
+    def _key_lock(self, path):
+        """Verrou propre à un dérivé : deux requêtes simultanées ne le génèrent qu'une fois"""
+        with self._lock:
+            return self._key_locks.setdefault(path, threading.Lock())
+
+    def get(self, source_path, size, fmt):
+        """Chemin du dérivé (généré s'il manque), ETag et type MIME"""
+        self.validate(size, fmt)
+        digest = analysis_cache.content_digest(source_path)
+        path = self._path(digest, size, fmt)
+        if os.path.exists(path):
+            with self._lock:
+                self.hits += 1
+        else:
+            with self._key_lock(path):
+                if not os.path.exists(path):
+                    self._generate(source_path, path, size, fmt)
+                    with self._lock:
+                        self.generated += 1
+            with self._lock:
+                self._key_locks.pop(path, None)
+        etag = f"{digest[:20]}-{size}-{fmt}-v{DERIVATIVE_VERSION}"
+        return path, etag, DERIVATIVE_FORMATS[fmt][1]
+
+    def _generate(self, source_path, path, size, fmt):
+        """Réduit le logo (décodage JPEG réduit, transparence conservée) et l'enregistre de façon atomique"""
+        pil_format, _, options = DERIVATIVE_FORMATS[fmt]
+        with Image.open(source_path) as img:
+            img.draft('RGB', (size, size))
+            width, height = img.size
+            if width * height > self.max_pixels:
+                raise ValueError(f"Image trop grande pour une miniature: {width}x{height} pixels "
+                                 f"(maximum {self.max_pixels})")
+            derivative = img.convert('RGBA' if _has_alpha(img) else 'RGB')
+            derivative.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                derivative.save(f, format=pil_format, **options)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def prune(self, source_paths):
+        """Supprime les dérivés qui ne correspondent plus au contenu actuel d'aucun logo"""
+        keep = {analysis_cache.content_digest(path) for path in source_paths}
+        removed = 0
+        if not os.path.isdir(self.cache_dir):
+            return removed
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                digest = name.split('-', 1)[0]
+                if digest not in keep or not name.endswith(tuple(f"-v{DERIVATIVE_VERSION}.{fmt}"
+                                                                  for fmt in DERIVATIVE_FORMATS)):
+                    os.remove(os.path.join(root, name))
+                    removed += 1
+        return removed
+
+    def get_stats(self):
+        """Compteurs du processus courant et contenu du dossier (fichiers, octets)"""
+        files = 0
+        size = 0
+        if os.path.isdir(self.cache_dir):
+            for root, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    files += 1
+                    size += os.path.getsize(os.path.join(root, name))
+        with self._lock:
+            return {
+                'cache_dir': self.cache_dir,
+                'sizes': self.sizes,
+                'formats': list(DERIVATIVE_FORMATS),
+                'hits': self.hits,
+                'generated': self.generated,
+                'files': files,
+                'bytes': size
+            }
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from app.utils import stats_utils
+
+# Groupe de pairs : poste principal (premier poste de 'MF,FW') et compétition
+POSITION_COLUMN = 'Position'
+COMPETITION_COLUMN = 'Compition'
+# Colonnes numériques sans intérêt comme percentile
+EXCLUDED_COLUMNS = ['Born year']
+# Valeur stockée pour un percentile indéfini (valeur manquante)
+MISSING_PERCENTILE = 255
+
+
+def primary_position(series):
+    """Poste principal de chaque joueur (premier jeton de la colonne multi-valuée)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Une évaluation par catégorie, puis projection sur les codes (-1 = manquant -> None)
+        primaries = np.array([str(category).split(',')[0].strip() for category in series.cat.categories] + [None],
+                             dtype=object)
+        values = primaries[series.cat.codes.to_numpy()]
+    else:
+        values = series.map(lambda value: value.split(',')[0].strip() if isinstance(value, str) else None)
+    return pd.Series(values, index=series.index, name=series.name, dtype='category')
+
+
+class PercentileMatrix:
+    """Percentiles (0-100, uint8) de chaque joueur pour chaque colonne numérique, parmi ses pairs.
+
+    Le percentile est le rang moyen du joueur dans son groupe de pairs (même poste
+    principal et même compétition), rapporté à l'effectif du groupe. Une seule passe
+    groupby/rank vectorisée calcule toutes les colonnes et tous les groupes.
+    """
+
+    def __init__(self, df):
+        numeric_cols, _ = stats_utils.split_columns(df)
+        self.columns = [col for col in numeric_cols if col not in EXCLUDED_COLUMNS]
+        self.rows = len(df)
+
+        keys = []
+        if POSITION_COLUMN in df.columns:
+            keys.append(primary_position(df[POSITION_COLUMN]))
+        if COMPETITION_COLUMN in df.columns:
+            keys.append(df[COMPETITION_COLUMN])
+        self.group_columns = [key.name for key in keys]
+
+        if keys:
+            grouped = df[self.columns].groupby(keys, observed=True, dropna=False, sort=False)
+            ranks = grouped.rank(method='average', pct=True)
+            self.group_ids = grouped.ngroup().to_numpy()
+            self.group_sizes = np.bincount(self.group_ids[self.group_ids >= 0])
+            self.group_keys = [tuple(str(key.iat[i]) for key in keys) for i in self._first_rows()]
+        else:
+            ranks = df[self.columns].rank(method='average', pct=True)
+            self.group_ids = np.zeros(self.rows, dtype=np.int64)
+            self.group_sizes = np.array([self.rows])
+            self.group_keys = [()]
+
+        values = ranks.to_numpy(dtype=np.float64, na_value=np.nan) * 100
+        matrix = np.full(values.shape, MISSING_PERCENTILE, dtype=np.uint8)
+        valid = ~np.isnan(values)
+        matrix[valid] = np.rint(values[valid]).astype(np.uint8)
+        self.matrix = matrix
+
+    def _first_rows(self):
+        """Première ligne de chaque groupe (pour retrouver les clés du groupe)"""
+        groups, first = np.unique(self.group_ids, return_index=True)
+        return first[groups >= 0]
+
+    def row(self, position):
+        """Percentiles d'une ligne : {colonne: percentile ou None}"""
+        values = self.matrix[position]
+        return {col: (None if value == MISSING_PERCENTILE else int(value))
+                for col, value in zip(self.columns, values)}
+
+    def peer_group(self, position):
+        """Groupe de pairs d'une ligne : clés et effectif"""
+        group = int(self.group_ids[position])
+        if group < 0:
+            return {'keys': {}, 'size': 0}
+        return {
+            'keys': dict(zip(self.group_columns, self.group_keys[group])),
+            'size': int(self.group_sizes[group])
+        }
+
+    @property
+    def nbytes(self):
+        return int(self.matrix.nbytes)
+
+
+def build_percentiles(df):
+    """Construit la matrice des percentiles d'un DataFrame normalisé"""
+    return PercentileMatrix(df)
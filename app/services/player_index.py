@@ -0,0 +1,281 @@
+import re
+import bisect
+import functools
+import unicodedata
+import numpy as np
+import pandas as pd
+
+NAME_COLUMN = 'Player name'
+
+# Recherche : nombre de résultats par défaut / maximal
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+# Recherche approchée : nombre maximal d'entrées de listes de trigrammes parcourues par requête
+# (les trigrammes les plus rares d'abord), nombre de candidats rescorés et similarité minimale
+MAX_TRIGRAM_POSTINGS = 20000
+FUZZY_CANDIDATES = 30
+MIN_SIMILARITY = 0.35
+
+# Lettres sans décomposition Unicode (ø, ł, ...) ramenées à leur équivalent ASCII
+_FOLD_TABLE = str.maketrans({'ø': 'o', 'Ø': 'o', 'ł': 'l', 'Ł': 'l', 'đ': 'd', 'Đ': 'd',
+                             'æ': 'ae', 'Æ': 'ae', 'œ': 'oe', 'Œ': 'oe', 'ı': 'i'})
+_COMBINING_PATTERN = re.compile('[\u0300-\u036f]')
+WORD_PATTERN = re.compile(r'\w+')
+# Séparateurs de mots pour les trigrammes (le caractère nul sépare les noms entre eux)
+_NON_WORD_PATTERN = re.compile(r'[^\w\x00]+')
+
+
+def normalize_name(name):
+    """Normalise un nom de joueur pour la recherche exacte (casse et espaces)"""
+    return ' '.join(str(name).split()).casefold()
+
+
+def fold_name(name):
+    """Forme de recherche d'un nom : sans accents, en minuscules, espaces normalisés"""
+    return _fold(normalize_name(name))
+
+
+def _fold(normalized):
+    """Retire les accents d'un nom déjà normalisé (chemin rapide pour les noms ASCII)"""
+    if normalized.isascii():
+        return normalized
+    return _COMBINING_PATTERN.sub('', unicodedata.normalize('NFKD', normalized.translate(_FOLD_TABLE)))
+
+
+def _word_suffixes(folded):
+    """Fins d'un nom replié commençant à chacun de ses mots suivants ('de bruyne', 'bruyne')"""
+    suffixes = []
+    position = folded.find(' ')
+    while position >= 0:
+        suffixes.append(folded[position + 1:])
+        position = folded.find(' ', position + 1)
+    return suffixes
+
+
+def _trigram_keys(text):
+    """Trigrammes d'un texte dont les mots sont séparés par au moins trois espaces, encodés
+    en entiers (points de code sur 21 bits).
+
+    Chaque mot est entouré d'espaces comme pour pg_trgm ('  mot ') ; les fenêtres finissant
+    par deux espaces (à cheval sur deux mots) sont écartées.
+    Retourne (clés uint64, position de départ de chaque trigramme, points de code).
+    """
+    codes = np.frombuffer(('  ' + text + ' ').encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    first, middle, last = codes[:-2], codes[1:-1], codes[2:]
+    valid = ~((middle == 32) & (last == 32))
+    keys = (first << np.uint64(42)) | (middle << np.uint64(21)) | last
+    return keys[valid], np.flatnonzero(valid), codes
+
+
+def _query_trigram_keys(folded):
+    """Clés distinctes des trigrammes d'une requête repliée"""
+    return np.unique(_trigram_keys(_NON_WORD_PATTERN.sub('   ', folded))[0])
+
+
+@functools.lru_cache(maxsize=65536)
+def _trigrams(word):
+    """Ensemble des trigrammes (chaînes) d'un mot, mémorisé : les mots se répètent d'un nom à l'autre"""
+    padded = '  ' + word + ' '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _word_trigrams(folded):
+    """Ensembles de trigrammes de chaque mot d'un nom replié"""
+    return [_trigrams(word) for word in WORD_PATTERN.findall(folded)]
+
+
+def _similarity(query_words, name_words):
+    """Moyenne, sur les mots de la requête, de la meilleure similarité de Jaccard avec un mot du nom"""
+    if not query_words or not name_words:
+        return 0.0
+    total = 0.0
+    for query in query_words:
+        total += max(len(query & word) / len(query | word) for word in name_words)
+    return total / len(query_words)
+
+
+class NameIndex:
+    """Index nom de joueur -> positions des lignes (un joueur transféré en cours de saison a plusieurs lignes)"""
+
+    def __init__(self, names):
+        groups = {}
+        for position, name in enumerate(names):
+            if isinstance(name, str) and name.strip():
+                groups.setdefault(normalize_name(name), []).append(position)
+        self._positions = {key: np.asarray(value, dtype=np.int64) for key, value in groups.items()}
+
+    def lookup(self, name):
+        """Positions des lignes du joueur (tableau vide si inconnu)"""
+        if name is None:
+            return np.empty(0, dtype=np.int64)
+        return self._positions.get(normalize_name(name), np.empty(0, dtype=np.int64))
+
+    def append(self, names, offset):
+        """Nouvel index incluant des lignes ajoutées à partir de la position `offset`"""
+        index = NameIndex([])
+        index._positions = dict(self._positions)
+        added = NameIndex(names)
+        for key, positions in added._positions.items():
+            positions = positions + offset
+            previous = index._positions.get(key)
+            index._positions[key] = positions if previous is None else np.concatenate([previous, positions])
+        return index
+
+    def __len__(self):
+        return len(self._positions)
+
+
+class NameSearchIndex:
+    """Index de recherche des noms de joueurs, construit une fois par version du dataset.
+
+    Les noms distincts sont repliés (sans accents ni casse) puis indexés de deux façons :
+    - listes triées du nom complet et de ses fins à partir de chaque mot, pour la recherche par
+      préfixe par dichotomie (saisie au fil de la frappe) ;
+    - listes de trigrammes (format CSR : clés triées, bornes, identifiants), pour la
+      recherche approchée tolérante aux fautes de frappe.
+    """
+
+    def __init__(self, names):
+        display = {}
+        for name in names:
+            if isinstance(name, str) and name.strip():
+                display.setdefault(normalize_name(name), ' '.join(name.split()))
+        self.names = list(display.values())
+        self.folded = [_fold(key) for key in display]
+
+        # Préfixes du nom complet et de ses suffixes à partir de chaque mot suivant
+        # ('messi' trouve 'Lionel Messi', 'de b' trouve 'Kevin De Bruyne')
+        order = sorted(range(len(self.folded)), key=self.folded.__getitem__)
+        self._full_keys = [self.folded[i] for i in order]
+        self._full_ids = np.asarray(order, dtype=np.int32)
+        suffixes = []
+        owners = []
+        for i, folded in enumerate(self.folded):
+            if ' ' in folded:
+                found = _word_suffixes(folded)
+                suffixes.extend(found)
+                owners.extend([i] * len(found))
+        order = sorted(range(len(suffixes)), key=suffixes.__getitem__)
+        self._token_keys = [suffixes[i] for i in order]
+        self._token_ids = np.asarray(owners, dtype=np.int32)[order] if order else np.empty(0, dtype=np.int32)
+
+        self._build_trigrams()
+
+    def _build_trigrams(self):
+        # Tous les noms en un seul texte (séparateur nul entouré d'espaces), découpé en trigrammes
+        # d'un coup ; le propriétaire d'un trigramme est le nombre de séparateurs qui le précèdent
+        text = _NON_WORD_PATTERN.sub('   ', '\x00'.join(self.folded)).replace('\x00', ' \x00  ')
+        keys, starts, codes = _trigram_keys(text)
+        owners = np.cumsum(codes == 0, dtype=np.int32)[starts]
+        valid = (codes[starts] != 0) & (codes[starts + 1] != 0) & (codes[starts + 2] != 0)
+        keys, owners = keys[valid], owners[valid]
+
+        # Tri stable : les identifiants restent croissants au sein de chaque trigramme
+        order = np.argsort(keys, kind='stable')
+        keys, owners = keys[order], owners[order]
+        # Un trigramme répété dans un même nom n'est compté qu'une fois
+        distinct = np.ones(len(keys), dtype=bool)
+        distinct[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+        keys, owners = keys[distinct], owners[distinct]
+
+        bounds = np.flatnonzero(np.diff(keys)) + 1 if len(keys) else np.empty(0, dtype=np.int64)
+        self._trigram_keys = keys[np.concatenate([[0], bounds])] if len(keys) else keys
+        self._trigram_offsets = np.concatenate([[0], bounds, [len(keys)]]).astype(np.int64)
+        self._trigram_ids = owners
+        self._trigram_counts = np.bincount(owners, minlength=len(self.folded)).astype(np.int32)
+
+    def _prefix_range(self, keys, ids, prefix, limit):
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', start)
+        return ids[start:min(end, start + limit)]
+
+    def _postings(self, keys):
+        """Listes des noms contenant chaque trigramme connu, de la plus courte à la plus longue"""
+        positions = np.searchsorted(self._trigram_keys, keys)
+        known = positions < len(self._trigram_keys)
+        positions = positions[known]
+        positions = positions[self._trigram_keys[positions] == keys[known]]
+        starts = self._trigram_offsets[positions]
+        ends = self._trigram_offsets[positions + 1]
+        order = np.argsort(ends - starts, kind='stable')
+        return [self._trigram_ids[start:end] for start, end in zip(starts[order].tolist(), ends[order].tolist())]
+
+    def _fuzzy(self, folded, limit, exclude):
+        """Noms partageant le plus de trigrammes avec la requête, rescorés par similarité de mots"""
+        if not len(self._trigram_keys):
+            return []
+        query_keys = _query_trigram_keys(folded)
+        total_keys = len(query_keys)
+        selected = []
+        total = 0
+        for posting in self._postings(query_keys):
+            if selected and total + len(posting) > MAX_TRIGRAM_POSTINGS:
+                break
+            selected.append(posting[:MAX_TRIGRAM_POSTINGS])
+            total += len(selected[-1])
+        if not selected:
+            return []
+
+        # Présélection vectorisée (Jaccard des trigrammes du nom complet), puis score par mot
+        candidates, counts = np.unique(np.concatenate(selected), return_counts=True)
+        if len(candidates) > FUZZY_CANDIDATES:
+            jaccard = counts / (total_keys + self._trigram_counts[candidates] - counts)
+            best = np.argpartition(-jaccard, FUZZY_CANDIDATES - 1)[:FUZZY_CANDIDATES]
+            candidates = candidates[best]
+
+        query_words = _word_trigrams(folded)
+        scored = []
+        for candidate in candidates.tolist():
+            if candidate in exclude:
+                continue
+            score = _similarity(query_words, _word_trigrams(self.folded[candidate]))
+            if score >= MIN_SIMILARITY:
+                scored.append((-score, self.folded[candidate], candidate))
+        scored.sort()
+        return [(candidate, -score) for score, _, candidate in scored[:limit]]
+
+    def search(self, query, limit=DEFAULT_SEARCH_LIMIT):
+        """Noms correspondant à la requête, classés : exact, préfixe du nom, préfixe d'un mot, approché.
+
+        Retourne une liste de dictionnaires {name, match, score} (score entre 0 et 1).
+        """
+        folded = fold_name(query or '')
+        if not folded:
+            return []
+        results = []
+        seen = set()
+
+        def add(ids, match):
+            for i in ids.tolist():
+                if len(results) >= limit:
+                    return
+                if i not in seen:
+                    seen.add(i)
+                    exact = self.folded[i] == folded
+                    # Score d'un préfixe : part du nom déjà saisie
+                    results.append({'name': self.names[i], 'match': 'exact' if exact else match,
+                                    'score': round(len(folded) / len(self.folded[i]), 3)})
+
+        add(self._prefix_range(self._full_keys, self._full_ids, folded, limit), 'prefix')
+        add(self._prefix_range(self._token_keys, self._token_ids, folded, 2 * limit), 'word_prefix')
+        if len(results) < limit:
+            for i, score in self._fuzzy(folded, limit - len(results), seen):
+                results.append({'name': self.names[i], 'match': 'fuzzy', 'score': round(score, 3)})
+        return results
+
+    def __len__(self):
+        return len(self.names)
+
+
+def build_name_index(df):
+    """Construit l'index des noms de joueurs d'un DataFrame normalisé"""
+    if NAME_COLUMN not in df.columns:
+        return NameIndex([])
+    return NameIndex(df[NAME_COLUMN].to_numpy(dtype=object))
+
+
+def build_search_index(df):
+    """Construit l'index de recherche des noms de joueurs d'un DataFrame normalisé"""
+    if NAME_COLUMN not in df.columns:
+        return NameSearchIndex([])
+    return NameSearchIndex(pd.unique(df[NAME_COLUMN].to_numpy(dtype=object)))
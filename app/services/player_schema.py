@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+# Schéma déclaratif de data/player_stats.csv
+#   kind : 'string' (texte libre), 'category', 'numeric' ou 'age' ("22-157" -> 22)
+#   dtype : type compact final des colonnes numériques
+# Les noms sont ceux du CSV après suppression des espaces ('Player name ' -> 'Player name').
+PLAYER_STATS_SCHEMA = {
+    'Player name': {'kind': 'string'},
+    'Nation': {'kind': 'category'},
+    'Position': {'kind': 'category'},
+    'Squad': {'kind': 'category'},
+    'Compition': {'kind': 'category'},
+    'Age': {'kind': 'age', 'dtype': 'int16'},
+    'Born year': {'kind': 'numeric', 'dtype': 'int16'},
+    'Match played': {'kind': 'numeric', 'dtype': 'int16'},
+    'Starts': {'kind': 'numeric', 'dtype': 'int16'},
+    'MIn': {'kind': 'numeric', 'dtype': 'float32'},
+    '90s': {'kind': 'numeric', 'dtype': 'float32'},
+    'Goal': {'kind': 'numeric', 'dtype': 'float32'},
+    'Assist': {'kind': 'numeric', 'dtype': 'float32'},
+    'Goal + Assist': {'kind': 'numeric', 'dtype': 'float32'},
+    'Goal+Penalty kick': {'kind': 'numeric', 'dtype': 'float32'},
+    'Penalty Kick': {'kind': 'numeric', 'dtype': 'float32'},
+    'Penalty Kick Attempted': {'kind': 'numeric', 'dtype': 'float32'},
+    'Yellow Card': {'kind': 'numeric', 'dtype': 'float32'},
+    'Red Card': {'kind': 'numeric', 'dtype': 'float32'},
+    'Expected Goal': {'kind': 'numeric', 'dtype': 'float32'},
+    'Non-penalty Expected Goal': {'kind': 'numeric', 'dtype': 'float32'},
+    'Expected Assisted Goal': {'kind': 'numeric', 'dtype': 'float32'},
+    'Non-penalty Expected Goal + Expected Assisted Goal': {'kind': 'numeric', 'dtype': 'float32'},
+    'Progressive Carries': {'kind': 'numeric', 'dtype': 'float32'},
+    'Progressive Passes': {'kind': 'numeric', 'dtype': 'float32'},
+    'Progressive Passes Receive': {'kind': 'numeric', 'dtype': 'float32'},
+}
+
+# Séparateurs du fichier : "1,948" minutes -> 1948
+CSV_THOUSANDS = ','
+CSV_DECIMAL = '.'
+
+
+def get_read_dtypes(raw_columns):
+    """Construit l'argument dtype de read_csv à partir des en-têtes bruts du fichier"""
+    dtypes = {}
+    for raw_name in raw_columns:
+        spec = PLAYER_STATS_SCHEMA.get(raw_name.strip())
+        if spec is None:
+            continue
+        if spec['kind'] == 'category':
+            dtypes[raw_name] = 'category'
+        elif spec['kind'] == 'numeric':
+            # Lecture en float32 (NaN possibles), conversion en entier compact après remplissage
+            dtypes[raw_name] = 'float32'
+        else:
+            dtypes[raw_name] = str
+    return dtypes
+
+
+def parse_age(series):
+    """Extrait l'âge en années du format "années-jours" ("22-157" -> 22)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    return pd.to_numeric(series.astype(str).str.extract(r'^\s*(\d+)', expand=False), errors='coerce')
+
+
+def coerce_numeric(series):
+    """Convertit une colonne texte en nombres (séparateur de milliers retiré)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    cleaned = series.astype(str).str.replace(CSV_THOUSANDS, '', regex=False)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def apply_schema(df):
+    """Applique les types compacts du schéma (colonnes inconnues laissées telles quelles)"""
+    columns = {}
+    for name in df.columns:
+        spec = PLAYER_STATS_SCHEMA.get(name)
+        col = df[name]
+        if spec is None or spec['kind'] == 'string':
+            columns[name] = col
+        elif spec['kind'] == 'category':
+            columns[name] = col if isinstance(col.dtype, pd.CategoricalDtype) else col.astype('category')
+        else:
+            values = parse_age(col) if spec['kind'] == 'age' else coerce_numeric(col)
+            columns[name] = values.fillna(0).astype(spec['dtype'])
+    return pd.DataFrame(columns, index=df.index)
+
+
+def get_unexpected_columns(columns):
+    """Colonnes présentes dans le fichier mais absentes du schéma"""
+    return [name for name in columns if name not in PLAYER_STATS_SCHEMA]
+
+
+def get_missing_columns(columns):
+    """Colonnes du schéma absentes du fichier"""
+    present = set(columns)
+    return [name for name in PLAYER_STATS_SCHEMA if name not in present]
+
+
+def validate_rows(df, max_errors=20):
+    """Vérifie des lignes brutes avant ingestion (colonnes du schéma, valeurs convertibles).
+
+    Retourne la liste des erreurs (vide si les lignes sont conformes).
+    """
+    errors = []
+    missing = get_missing_columns(df.columns)
+    if missing:
+        errors.append(f"Colonnes manquantes: {', '.join(missing)}")
+    unexpected = get_unexpected_columns(df.columns)
+    if unexpected:
+        errors.append(f"Colonnes absentes du schéma: {', '.join(unexpected)}")
+
+    for name, spec in PLAYER_STATS_SCHEMA.items():
+        if name not in df.columns:
+            continue
+        col = df[name]
+        blank = (col.isna() | (col.astype(str).str.strip() == '')).to_numpy()
+        if spec['kind'] == 'string':
+            invalid = blank
+        elif spec['kind'] in ('numeric', 'age'):
+            text = col.astype(str).where(~blank)
+            parsed = parse_age(text) if spec['kind'] == 'age' else coerce_numeric(text)
+            invalid = parsed.isna().to_numpy() & ~blank
+        else:
+            continue
+        for row in np.flatnonzero(invalid):
+            errors.append(f"Ligne {int(row) + 1}, colonne {name}: valeur invalide {col.iat[row]!r}")
+            if len(errors) >= max_errors:
+                return errors
+    return errors
+
+
+def _wide_memory_usage(series):
+    """Mémoire qu'occuperait la colonne avec les types par défaut (float64 / objet)"""
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(series.dtype, pd.CategoricalDtype):
+        return len(series) * np.dtype('float64').itemsize
+    return int(series.astype(object).memory_usage(deep=True, index=False))
+
+
+def build_schema_report(df):
+    """Rapport de conformité au schéma et mémoire économisée par les types compacts"""
+    compact_bytes = int(df.memory_usage(deep=True, index=False).sum())
+    wide_bytes = int(sum(_wide_memory_usage(df[name]) for name in df.columns))
+    return {
+        'unexpected_columns': get_unexpected_columns(df.columns),
+        'missing_columns': get_missing_columns(df.columns),
+        'dtypes': {name: str(dtype) for name, dtype in df.dtypes.items()},
+        'memory': {
+            'compact_bytes': compact_bytes,
+            'default_bytes': wide_bytes,
+            'saved_bytes': wide_bytes - compact_bytes,
+            'saved_percentage': round((1 - compact_bytes / wide_bytes) * 100, 2) if wide_bytes else 0
+        }
+    }
@@ -0,0 +1,275 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Condition simple : "<colonne><opérateur><valeur>", ex. "Compition=Ligue 1" ou "Goal>=10"
+CONDITION_PATTERN = re.compile(r'^\s*(.+?)\s*(>=|<=|!=|=|>|<)\s*(.*?)\s*$')
+# Appartenance : "<colonne> contains <valeur>" (jeton d'un champ multi-valué, sous-chaîne sinon)
+CONTAINS_PATTERN = re.compile(r'^\s*(.+?)\s+contains\s+(.*?)\s*$', re.IGNORECASE)
+# Séparateur des conditions d'une expression (en majuscules pour ne pas couper les noms contenant "and")
+AND_PATTERN = re.compile(r'\s+AND\s+')
+
+# Colonnes catégorielles indexées par bitmap (un bitmap par valeur)
+INDEXED_COLUMNS = ['Squad', 'Nation', 'Position', 'Compition']
+# Colonnes multi-valuées ('MF,FW') : indexées en plus par jeton, pour l'opérateur contains
+MULTI_VALUED_COLUMNS = {'Position': ','}
+
+# Une condition non indexée n'est évaluée que sur les lignes déjà retenues
+# quand celles-ci représentent moins de 1/SUBSET_SCAN_RATIO du dataset
+SUBSET_SCAN_RATIO = 4
+
+
+def parse_condition(text):
+    """Découpe une condition texte en (colonne, opérateur, valeur)"""
+    match = CONTAINS_PATTERN.match(text)
+    if match and match.group(1):
+        return match.group(1), 'contains', match.group(2)
+    match = CONDITION_PATTERN.match(text)
+    if not match or not match.group(1):
+        raise ValueError(f"Filtre invalide: {text}")
+    return match.group(1), match.group(2), match.group(3)
+
+
+def parse_expression(text):
+    """Découpe une expression "cond AND cond ..." en liste de conditions"""
+    return [parse_condition(part) for part in AND_PATTERN.split(text) if part.strip()]
+
+
+def parse_filters(filters):
+    """Convertit une liste d'expressions texte en conditions (toutes combinées par ET)"""
+    conditions = []
+    for text in filters:
+        if text and text.strip():
+            conditions.extend(parse_expression(text))
+    return conditions
+
+
+def _split_tokens(value, separator):
+    """Jetons normalisés (majuscules) d'une valeur multi-valuée"""
+    return [token.strip().upper() for token in str(value).split(separator) if token.strip()]
+
+
+class FilterIndex:
+    """Index bitmap des colonnes catégorielles, construit une fois par version du dataset.
+
+    Chaque valeur (et chaque jeton des colonnes multi-valuées) est associée à un
+    bitmap compressé (np.packbits) des lignes qui la portent : les conditions
+    '=', '!=' et 'contains' sur ces colonnes se combinent par opérations bit à bit,
+    sans parcourir les données.
+    """
+
+    def __init__(self, df, columns=None):
+        self.rows = len(df)
+        self.values = {}
+        self.tokens = {}
+        self.counts = {}
+        for col in columns or INDEXED_COLUMNS:
+            if col in df.columns:
+                self._index_column(col, df[col])
+
+    def _empty(self):
+        return np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+
+    def _index_column(self, col, series):
+        codes, uniques = pd.factorize(series)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        values = {}
+        counts = {}
+        for code, value in enumerate(uniques):
+            mask = np.zeros(self.rows, dtype=bool)
+            mask[order[bounds[code]:bounds[code + 1]]] = True
+            key = str(value).strip()
+            bitmap = np.packbits(mask)
+            values[key] = values[key] | bitmap if key in values else bitmap
+            counts[key] = counts.get(key, 0) + int(bounds[code + 1] - bounds[code])
+        self.values[col] = values
+        self.counts[col] = counts
+
+        separator = MULTI_VALUED_COLUMNS.get(col)
+        if separator:
+            tokens = {}
+            for key, bitmap in values.items():
+                for token in _split_tokens(key, separator):
+                    tokens[token] = tokens[token] | bitmap if token in tokens else bitmap
+            self.tokens[col] = tokens
+
+    def append(self, rows):
+        """Nouvel index couvrant les lignes ajoutées (coût proportionnel au nombre de lignes ajoutées,
+        hors recopie des bitmaps existants)"""
+        index = FilterIndex.__new__(FilterIndex)
+        index.rows = self.rows + len(rows)
+        index.values = {}
+        index.tokens = {}
+        index.counts = {}
+        for col, values in self.values.items():
+            added = FilterIndex(rows, [col]) if col in rows.columns else None
+            added_values = added.values.get(col, {}) if added else {}
+            index.values[col] = self._extend(values, added_values, len(rows))
+            counts = dict(self.counts[col])
+            for key, count in (added.counts.get(col, {}) if added else {}).items():
+                counts[key] = counts.get(key, 0) + count
+            index.counts[col] = counts
+            if col in self.tokens:
+                added_tokens = added.tokens.get(col, {}) if added else {}
+                index.tokens[col] = self._extend(self.tokens[col], added_tokens, len(rows))
+        return index
+
+    def _extend(self, bitmaps, added, added_rows):
+        """Prolonge chaque bitmap avec les bits des lignes ajoutées (zéros si la valeur est absente)"""
+        empty = np.zeros((added_rows + 7) // 8, dtype=np.uint8)
+        extended = {}
+        for key in list(bitmaps) + [key for key in added if key not in bitmaps]:
+            old = bitmaps.get(key)
+            if old is None:
+                old = self._empty()
+            extended[key] = _append_bits(old, self.rows, added.get(key, empty), added_rows)
+        return extended
+
+    def lookup(self, column, operator, value):
+        """Bitmap des lignes satisfaisant la condition, None si la condition n'est pas indexée"""
+        values = self.values.get(column)
+        if values is None or operator not in ('=', '!=', 'contains'):
+            return None
+
+        if operator == 'contains':
+            if column in self.tokens:
+                return self.tokens[column].get(value.strip().upper(), self._empty())
+            needle = value.strip().lower()
+            bitmap = self._empty()
+            for key, value_bitmap in values.items():
+                if needle in key.lower():
+                    bitmap = bitmap | value_bitmap
+            return bitmap
+
+        bitmap = values.get(value.strip(), self._empty())
+        return bitmap if operator == '=' else ~bitmap
+
+    def get_values(self, column):
+        """Valeurs indexées d'une colonne avec leurs effectifs (ordre décroissant)"""
+        counts = self.counts.get(column, {})
+        return [{'value': value, 'count': count}
+                for value, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)]
+
+    def get_tokens(self, column):
+        """Jetons d'une colonne multi-valuée avec leurs effectifs"""
+        tokens = self.tokens.get(column, {})
+        counts = {token: int(np.unpackbits(bitmap, count=self.rows).sum()) for token, bitmap in tokens.items()}
+        return [{'value': token, 'count': count}
+                for token, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)]
+
+    def describe(self):
+        """Résumé de l'index : colonnes, nombre de valeurs et de jetons, taille mémoire"""
+        columns = {}
+        for col, values in self.values.items():
+            bitmaps = list(values.values()) + list(self.tokens.get(col, {}).values())
+            columns[col] = {
+                'values': len(values),
+                'tokens': len(self.tokens.get(col, {})),
+                'multi_valued': col in self.tokens,
+                'bytes': int(sum(bitmap.nbytes for bitmap in bitmaps))
+            }
+        return {'rows': self.rows, 'columns': columns}
+
+
+def _append_bits(bitmap, rows, added, added_rows):
+    """Concatène deux bitmaps compressés de `rows` et `added_rows` bits"""
+    tail = rows % 8
+    if tail == 0:
+        return np.concatenate([bitmap[:(rows + 7) // 8], added])
+    # Dernier octet partiel : recomposer les bits de fin avec ceux des lignes ajoutées
+    bits = np.concatenate([np.unpackbits(bitmap[-1:])[:tail], np.unpackbits(added, count=added_rows)])
+    return np.concatenate([bitmap[:-1], np.packbits(bits)])
+
+
+def build_index(df):
+    """Construit l'index bitmap des colonnes catégorielles d'un DataFrame normalisé"""
+    return FilterIndex(df)
+
+
+def _condition_mask(series, column, operator, value):
+    """Évalue une condition sur une colonne et retourne un masque booléen numpy"""
+    if operator == 'contains':
+        separator = MULTI_VALUED_COLUMNS.get(column)
+        needle = value.strip()
+        if separator:
+            matches = lambda item: needle.upper() in _split_tokens(item, separator)
+        else:
+            matches = lambda item: needle.lower() in str(item).lower()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Une évaluation par catégorie, puis projection sur les codes (-1 = manquant -> False)
+            per_category = np.array([matches(category) for category in series.cat.categories] + [False])
+            return per_category[series.cat.codes.to_numpy()]
+        return series.map(lambda item: isinstance(item, str) and matches(item)).to_numpy(dtype=bool)
+
+    if pd.api.types.is_numeric_dtype(series):
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"Valeur numérique attendue pour {column}: {value}")
+        values = series.to_numpy()
+    else:
+        if operator not in ('=', '!='):
+            raise ValueError(f"Opérateur {operator} non supporté pour la colonne catégorielle {column}")
+        equal = (series == value).to_numpy(dtype=bool, na_value=False)
+        return equal if operator == '=' else ~equal
+
+    if operator == '=':
+        mask = values == value
+    elif operator == '!=':
+        mask = values != value
+    elif operator == '>=':
+        mask = values >= value
+    elif operator == '<=':
+        mask = values <= value
+    elif operator == '>':
+        mask = values > value
+    else:
+        mask = values < value
+    return np.asarray(mask, dtype=bool)
+
+
+def compute_mask(df, conditions, index=None):
+    """Combine les conditions par ET et retourne un masque booléen (None si aucune condition).
+
+    Les conditions couvertes par l'index bitmap sont résolues en premier par
+    opérations bit à bit ; les autres sont évaluées ensuite, sur les seules lignes
+    retenues si la sélection est déjà étroite.
+    """
+    if not conditions:
+        return None
+    for column, _, _ in conditions:
+        if column not in df.columns:
+            raise ValueError(f"Colonne {column} non trouvée")
+
+    bitmap = None
+    scanned = []
+    for condition in conditions:
+        resolved = index.lookup(*condition) if index is not None else None
+        if resolved is None:
+            scanned.append(condition)
+        else:
+            bitmap = resolved if bitmap is None else bitmap & resolved
+
+    if bitmap is None:
+        mask = np.ones(len(df), dtype=bool)
+    else:
+        mask = np.unpackbits(bitmap, count=len(df)).view(bool)
+
+    for column, operator, value in scanned:
+        positions = np.flatnonzero(mask)
+        if len(positions) * SUBSET_SCAN_RATIO < len(mask):
+            subset = df[column].take(positions)
+            mask[positions] = _condition_mask(subset, column, operator, value)
+        else:
+            mask &= _condition_mask(df[column], column, operator, value)
+    return mask
+
+
+def filter_positions(df, filters, index=None):
+    """Retourne les positions des lignes satisfaisant les expressions de filtre"""
+    mask = compute_mask(df, parse_filters(filters or []), index)
+    if mask is None:
+        return np.arange(len(df))
+    return np.flatnonzero(mask)
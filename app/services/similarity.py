@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+from app.services import derived_metrics
+from app.utils import stats_utils
+try:
+    from sklearn.neighbors import NearestNeighbors
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+    print("Warning: scikit-learn not available, similarity search uses brute force only")
+
+# Colonnes numériques exclues des caractéristiques : 'Born year' (redondante avec 'Age') et les
+# métriques dérivées du registre, copies remises à l'échelle ou combinaisons de colonnes natives
+# qui compteraient deux fois la même statistique dans la distance (à passer via `features`)
+EXCLUDED_FEATURES = ['Born year'] + list(derived_metrics.DERIVED_METRICS)
+POSITION_COLUMN = 'Position'
+COMPETITION_COLUMN = 'Compition'
+# Informations renvoyées pour chaque joueur
+INFO_COLUMNS = ['Player name', 'Nation', 'Position', 'Squad', 'Compition', 'Age']
+
+# En dessous de ce nombre de joueurs, un produit matriciel (BLAS) est plus rapide qu'un arbre
+BRUTE_FORCE_MAX_ROWS = 200000
+DEFAULT_K = 10
+MAX_K = 100
+
+
+def get_feature_columns(df):
+    """Retourne les colonnes numériques natives utilisées comme caractéristiques par défaut"""
+    numeric_cols, _ = stats_utils.split_columns(df)
+    return [col for col in numeric_cols if col not in EXCLUDED_FEATURES]
+
+
+class SimilarityIndex:
+    """Index des plus proches voisins sur les caractéristiques standardisées des joueurs.
+
+    Les caractéristiques sont centrées-réduites (valeurs manquantes à la moyenne) ;
+    la distance est euclidienne. Au-delà de BRUTE_FORCE_MAX_ROWS joueurs, les requêtes
+    sans filtre passent par un arbre KD de scikit-learn ; les requêtes filtrées et les
+    petits jeux de données utilisent un calcul de distances par produit matriciel.
+    """
+
+    def __init__(self, df, features=None):
+        self.features = list(features or get_feature_columns(df))
+        if not self.features:
+            raise ValueError("Aucune colonne numérique disponible pour la similarité")
+
+        values = df[self.features].to_numpy(dtype=np.float64, na_value=np.nan)
+        means = np.nanmean(values, axis=0)
+        stds = np.nanstd(values, axis=0)
+        stds[~(stds > 0)] = 1.0
+        matrix = (values - np.nan_to_num(means)) / stds
+        self.matrix = np.nan_to_num(matrix).astype(np.float32)
+        self.squared_norms = np.einsum('ij,ij->i', self.matrix, self.matrix)
+
+        self.tree = None
+        if SKLEARN_AVAILABLE and len(self.matrix) > BRUTE_FORCE_MAX_ROWS:
+            self.tree = NearestNeighbors(algorithm='kd_tree').fit(self.matrix)
+
+    @property
+    def method(self):
+        return 'kd_tree' if self.tree is not None else 'brute'
+
+    def __len__(self):
+        return len(self.matrix)
+
+    def _brute_force(self, query, k, candidates=None):
+        """Distances par produit matriciel : |x|² - 2 x·q + |q|²"""
+        matrix = self.matrix if candidates is None else self.matrix[candidates]
+        norms = self.squared_norms if candidates is None else self.squared_norms[candidates]
+        distances = norms - 2.0 * (matrix @ query) + float(query @ query)
+        k = min(k, len(distances))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        positions = nearest if candidates is None else candidates[nearest]
+        return positions, np.sqrt(np.maximum(distances[nearest], 0.0))
+
+    def query(self, position, k=DEFAULT_K, candidates=None):
+        """Retourne (positions, distances) des k joueurs les plus proches (hors joueur lui-même).
+
+        `candidates` restreint la recherche à un sous-ensemble de positions (filtres).
+        """
+        query = self.matrix[position]
+        if candidates is not None:
+            candidates = candidates[candidates != position]
+            return self._brute_force(query, k, candidates)
+
+        if self.tree is not None:
+            distances, positions = self.tree.kneighbors(query[np.newaxis, :], n_neighbors=min(k + 1, len(self)))
+            positions, distances = positions[0], distances[0]
+        else:
+            positions, distances = self._brute_force(query, k + 1)
+        keep = positions != position
+        return positions[keep][:k], distances[keep][:k]
+
+
+def build_index(df):
+    """Construit l'index de similarité d'un DataFrame normalisé"""
+    return SimilarityIndex(df)
+
+
+def position_mask(series, positions):
+    """Masque des joueurs occupant au moins un des postes demandés (ex. 'MF' pour 'MF,FW')"""
+    wanted = {position.strip().upper() for position in positions if position.strip()}
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        matches = np.array([bool(wanted & {token.strip().upper() for token in str(category).split(',')})
+                            for category in categories] + [False])
+        # Le code -1 (valeur manquante) pointe sur le dernier élément (False)
+        return matches[series.cat.codes.to_numpy()]
+    return series.map(
+        lambda value: isinstance(value, str) and bool(wanted & {token.strip().upper() for token in value.split(',')})
+    ).to_numpy(dtype=bool)
+
+
+def competition_mask(series, competitions):
+    """Masque des joueurs appartenant à une des compétitions demandées"""
+    wanted = [competition.strip() for competition in competitions if competition.strip()]
+    return series.isin(wanted).to_numpy(dtype=bool, na_value=False)
+
+
+def player_info(df, position):
+    """Informations d'affichage d'un joueur"""
+    info = {}
+    for col in INFO_COLUMNS:
+        if col in df.columns:
+            value = df[col].iat[position]
+            if pd.isna(value):
+                info[col] = None
+            elif isinstance(value, (int, float, np.number)):
+                info[col] = stats_utils.to_float(value)
+            else:
+                info[col] = str(value).strip()
+    return info
@@ -0,0 +1,262 @@
+import math
+import numpy as np
+import pandas as pd
+
+# Accumulateurs fusionnables pour calculer des statistiques en flux, morceau par
+# morceau, avec une mémoire bornée indépendante de la taille du fichier.
+
+
+class RunningMoments:
+    """Moyenne, variance (Welford / Chan), min, max et nombre de valeurs manquantes"""
+
+    def __init__(self):
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, values):
+        """Ajoute un lot de valeurs (les NaN sont comptés comme manquants)"""
+        values = np.asarray(values, dtype=np.float64)
+        valid = values[~np.isnan(values)]
+        self.nulls += len(values) - len(valid)
+        if len(valid) == 0:
+            return
+        batch = RunningMoments()
+        batch.count = len(valid)
+        batch.mean = float(valid.mean())
+        batch.m2 = float(((valid - batch.mean) ** 2).sum())
+        batch.min = float(valid.min())
+        batch.max = float(valid.max())
+        self.merge(batch)
+
+    def merge(self, other):
+        """Fusionne un autre accumulateur (formule parallèle de Chan)"""
+        self.nulls += other.nulls
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        """Écart-type corrigé (ddof=1, comme pandas)"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else math.nan
+
+
+class ValueCounter:
+    """Comptage fusionnable des valeurs, borné à `max_items` valeurs distinctes.
+
+    Au-delà de la borne, les valeurs les moins fréquentes sont abandonnées
+    (élagage de type Misra–Gries) : les comptes deviennent alors approximatifs.
+    """
+
+    def __init__(self, max_items=10000):
+        self.max_items = max_items
+        self.counts = {}
+        self.nulls = 0
+        self.truncated = False
+
+    def update(self, series):
+        """Ajoute les valeurs d'une série"""
+        counts = series.value_counts(dropna=True)
+        self.nulls += int(series.isna().sum())
+        self._add(zip(counts.index, counts.values))
+
+    def _add(self, items):
+        counts = self.counts
+        for value, count in items:
+            if count:
+                counts[value] = counts.get(value, 0) + int(count)
+        if len(counts) > self.max_items:
+            self._prune()
+
+    def _prune(self):
+        """Conserve les valeurs les plus fréquentes (la moitié de la borne)"""
+        kept = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:self.max_items // 2]
+        self.counts = dict(kept)
+        self.truncated = True
+
+    def merge(self, other):
+        """Fusionne un autre compteur"""
+        self.nulls += other.nulls
+        self.truncated = self.truncated or other.truncated
+        self._add(other.counts.items())
+
+    def most_common(self, n=None):
+        """Retourne les valeurs triées par fréquence décroissante"""
+        items = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        return items if n is None else items[:n]
+
+
+class HyperLogLog:
+    """Estimation du nombre de valeurs distinctes (HyperLogLog, 2^p registres)"""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def update(self, series):
+        """Ajoute les valeurs (non manquantes) d'une série"""
+        values = series.dropna()
+        if len(values) == 0:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest_bits = 64 - self.p
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # Rang = position du premier bit à 1 dans les bits restants
+        _, exponent = np.frexp(rest.astype(np.float64))
+        rank = np.where(rest == 0, rest_bits + 1, rest_bits - exponent + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """Fusionne un autre estimateur de même précision"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self):
+        """Retourne le nombre estimé de valeurs distinctes"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            raw = m * math.log(m / zeros)
+        return int(round(raw))
+
+
+class QuantileSketch:
+    """Esquisse de quantiles fusionnable (compacteurs de type KLL, capacité k par niveau)
+
+    L'erreur de rang est de l'ordre de 1/k ; la mémoire est O(k log(n / k)).
+    """
+
+    def __init__(self, k=256, seed=0):
+        self.k = k
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Ajoute un lot de valeurs (les NaN sont ignorés)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def _compress(self):
+        """Compacte chaque niveau plein : une valeur sur deux monte au niveau supérieur"""
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                keep_odd = len(items) % 2
+                carry, items = (items[:-1], items[-1:]) if keep_odd else (items, items[:0])
+                offset = int(self._rng.integers(0, 2))
+                promoted = carry[offset::2]
+                self.levels[level] = items
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def merge(self, other):
+        """Fusionne une autre esquisse"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+
+    def quantiles(self, qs):
+        """Retourne les quantiles estimés pour les probabilités `qs`"""
+        if self.count == 0:
+            return [math.nan for _ in qs]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level, dtype=np.float64)
+                                  for level, items in enumerate(self.levels)])
+        order = np.argsort(values)
+        values, cumulative = values[order], np.cumsum(weights[order])
+        cumulative /= cumulative[-1]
+        positions = np.searchsorted(cumulative, np.asarray(qs, dtype=np.float64), side='left')
+        return values[np.minimum(positions, len(values) - 1)].tolist()
+
+
+class ColumnAccumulator:
+    """Regroupe les accumulateurs nécessaires au profil d'une colonne"""
+
+    def __init__(self, name, is_numeric, max_items=10000, sketch_k=256):
+        self.name = name
+        self.is_numeric = is_numeric
+        self.dtype = None
+        self.rows = 0
+        self.distinct = HyperLogLog()
+        if is_numeric:
+            self.moments = RunningMoments()
+            self.sketch = QuantileSketch(sketch_k)
+        else:
+            self.counter = ValueCounter(max_items)
+
+    def update(self, series):
+        """Ajoute un morceau de la colonne"""
+        self.dtype = str(series.dtype)
+        self.rows += len(series)
+        self.distinct.update(series)
+        if self.is_numeric:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            self.moments.update(values)
+            self.sketch.update(values)
+        else:
+            self.counter.update(series)
+
+    def merge(self, other):
+        """Fusionne l'accumulateur d'un autre morceau ou d'un autre worker"""
+        self.rows += other.rows
+        self.dtype = self.dtype or other.dtype
+        self.distinct.merge(other.distinct)
+        if self.is_numeric:
+            self.moments.merge(other.moments)
+            self.sketch.merge(other.sketch)
+        else:
+            self.counter.merge(other.counter)
+
+    @property
+    def null_count(self):
+        return self.moments.nulls if self.is_numeric else self.counter.nulls
+
+    @property
+    def unique_count(self):
+        """Nombre exact de valeurs distinctes si connu, sinon estimation HyperLogLog"""
+        if not self.is_numeric and not self.counter.truncated:
+            return len(self.counter.counts)
+        return self.distinct.estimate()
+
+
+def build_accumulators(df, max_items=10000, sketch_k=256):
+    """Crée un accumulateur par colonne d'un DataFrame (numérique ou non selon son type)"""
+    return [ColumnAccumulator(col, pd.api.types.is_numeric_dtype(df[col]), max_items, sketch_k)
+            for col in df.columns]
+
+
+def update_accumulators(accumulators, df):
+    """Ajoute un DataFrame (morceau ou lignes nouvelles) aux accumulateurs de ses colonnes"""
+    for acc in accumulators:
+        if acc.name in df.columns:
+            acc.update(df[acc.name])
+    return accumulators
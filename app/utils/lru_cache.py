@@ -0,0 +1,59 @@
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """Cache LRU borné et thread-safe avec compteurs de succès/échecs"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Retourne la valeur associée à la clé (et la marque comme récemment utilisée)"""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Ajoute une valeur, en évinçant la moins récemment utilisée si le cache est plein"""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Retourne la valeur en cache ou la calcule avec compute()"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Vide le cache"""
+        with self._lock:
+            self._items.clear()
+
+    def get_stats(self):
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0
+            }
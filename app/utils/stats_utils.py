@@ -1,3 +1,5 @@
+import pandas as pd
+
 def calculate_stats(df):
     """Calcule les statistiques d'un DataFrame"""
     return {
@@ -7,3 +9,19 @@ def calculate_stats(df):
         'dtypes': df.dtypes.astype(str).to_dict(),
         'missing_values': df.isnull().sum().to_dict()
     }
+
+def split_columns(df):
+    """Sépare les colonnes numériques et catégorielles (texte ou category)"""
+    numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    categorical_cols = [col for col in df.columns if col not in numeric_cols]
+    return numeric_cols, categorical_cols
+
+def value_counts(col):
+    """Compte les occurrences (sans les catégories absentes du dataset)"""
+    counts = col.value_counts()
+    return counts[counts > 0]
+
+def to_float(value, digits=6):
+    """Convertit un scalaire numpy en float Python arrondi (None si NaN)"""
+    value = float(value)
+    return None if value != value else round(value, digits)
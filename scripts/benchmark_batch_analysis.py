@@ -0,0 +1,69 @@
+"""
+Benchmark de l'analyse des logos par lots (pool de processus)
+
+Duplique les logos des clubs dans un dossier temporaire (chaque copie reçoit
+des octets de fin distincts pour ne pas être dédoublonnée par empreinte), puis
+mesure le débit (images/s) de analyze_images_batch, cache désactivé, pour
+plusieurs nombres de processus.
+"""
+
+import sys
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.services import image_service
+
+
+def make_logos(directory, count):
+    """Copie les logos jusqu'à `count` fichiers au contenu distinct"""
+    sources = sorted(path for path in Path(image_service.LOGOS_DIR).iterdir()
+                     if path.suffix.lower() in ('.png', '.jpg', '.jpeg'))
+    names = []
+    for i in range(count):
+        source = sources[i % len(sources)]
+        name = f"{i:05d}{source.suffix.lower()}"
+        data = source.read_bytes() + i.to_bytes(4, 'little')
+        (directory / name).write_bytes(data)
+        names.append(name)
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'analyse des logos par lots")
+    parser.add_argument('--images', type=int, default=240, help='Nombre de logos analysés')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Nombres de processus comparés')
+    parser.add_argument('--engine', default='kmeans', help='Moteur de couleurs')
+    parser.add_argument('--chunk-size', type=int, default=Config.IMAGE_BATCH_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix='logos_batch_'))
+    try:
+        names = make_logos(directory, args.images)
+        image_service.get_logos_dir = lambda: str(directory)
+        image_service._color_cache.enabled = False
+        Config.IMAGE_BATCH_CHUNK_SIZE = args.chunk_size
+
+        print(f"{args.images} logos, moteur {args.engine}, morceaux de {args.chunk_size}")
+        print(f"{'processus':>10} {'mode':>10} {'durée (s)':>10} {'images/s':>10} {'échecs':>7} {'accélération':>13}")
+        baseline = None
+        for workers in args.workers:
+            Config.IMAGE_BATCH_WORKERS = workers
+            # Premier lot à blanc : démarrage des processus du pool
+            image_service.analyze_images_batch(names[:Config.IMAGE_BATCH_MIN_PARALLEL], engine=args.engine)
+            _, stats = image_service.analyze_images_batch(names, engine=args.engine)
+            baseline = baseline or stats['images_per_second']
+            print(f"{workers:>10} {stats['mode']:>10} {stats['seconds']:>10.2f} "
+                  f"{stats['images_per_second']:>10.2f} {stats['failed']:>7} "
+                  f"{stats['images_per_second'] / baseline:>12.1f}x")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark des moteurs de couleurs dominantes sur les logos des clubs
+
+Chaque logo est décodé et réduit une seule fois (comme pour l'analyse), puis
+chaque moteur est mesuré sur les mêmes pixels : temps médian par image, erreur
+de quantification (distance RGB moyenne de chaque pixel à la couleur la plus
+proche de la palette) et écart à la palette du k-means de référence.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import image_service, color_engines
+
+
+def load_pixels(path, size):
+    """Pixels RGB (N, 3) du logo réduit comme pour l'analyse"""
+    with Image.open(path) as img:
+        img = img.convert('RGB')
+        img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        return np.asarray(img).reshape(-1, 3)
+
+
+def quantization_error(pixels, colors):
+    """Distance RGB moyenne de chaque pixel à la couleur la plus proche de la palette"""
+    palette = np.array([color['rgb'] for color in colors], dtype=np.float64)
+    values = pixels.astype(np.float64)
+    distances = ((values[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+    return float(np.sqrt(distances.min(axis=1)).mean())
+
+
+def palette_distance(colors, reference):
+    """Distance moyenne (pondérée par pourcentage) de chaque couleur à la plus proche de la référence"""
+    palette = np.array([color['rgb'] for color in reference], dtype=np.float64)
+    total = sum(color['percentage'] for color in colors)
+    distance = 0.0
+    for color in colors:
+        nearest = np.sqrt(((palette - np.array(color['rgb'])) ** 2).sum(axis=1)).min()
+        distance += nearest * color['percentage']
+    return distance / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark des moteurs de couleurs dominantes')
+    parser.add_argument('--repeat', type=int, default=3, help='Répétitions par image et par moteur')
+    parser.add_argument('--colors', type=int, default=image_service.DOMINANT_COLORS,
+                        help='Nombre de couleurs dominantes')
+    args = parser.parse_args()
+
+    logos_dir = Path(image_service.get_logos_dir())
+    paths = sorted(path for path in logos_dir.iterdir()
+                   if path.suffix.lower() in ('.png', '.jpg', '.jpeg', '.gif', '.webp'))
+    images = [load_pixels(path, image_service.ANALYSIS_SIZE) for path in paths]
+    engines = color_engines.get_available_engines()
+    reference = 'kmeans' if 'kmeans' in engines else None
+
+    palettes = {}
+    timings = {}
+    for engine in engines:
+        palettes[engine] = []
+        timings[engine] = []
+        for pixels in images:
+            best = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                colors = color_engines.dominant_colors(pixels, args.colors, engine)
+                best = min(best, time.perf_counter() - start)
+            palettes[engine].append(colors)
+            timings[engine].append(best * 1000)
+
+    print(f"{len(images)} logos, {args.colors} couleurs, {image_service.ANALYSIS_SIZE}px")
+    print(f"{'moteur':>12} {'médiane (ms)':>13} {'total (ms)':>11} {'accélération':>13} "
+          f"{'erreur RGB':>11} {'écart k-means':>14}")
+    reference_total = sum(timings[reference]) if reference else None
+    for engine in engines:
+        total = sum(timings[engine])
+        speedup = f"{reference_total / total:.1f}x" if reference else '-'
+        error = np.mean([quantization_error(pixels, colors)
+                         for pixels, colors in zip(images, palettes[engine])])
+        if reference:
+            gap = f"{np.mean([palette_distance(colors, ref) for colors, ref in zip(palettes[engine], palettes[reference])]):.2f}"
+        else:
+            gap = '-'
+        print(f"{engine:>12} {np.median(timings[engine]):>13.2f} {total:>11.1f} {speedup:>13} "
+              f"{error:>11.2f} {gap:>14}")
+
+
+if __name__ == '__main__':
+    main()
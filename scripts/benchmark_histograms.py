@@ -0,0 +1,86 @@
+"""
+Benchmark des histogrammes RGB / HSV sur de grands logos
+
+Agrandit chaque logo des clubs (par défaut à 2000 px de côté) puis compare
+l'ancien calcul (np.histogram sur des copies flottantes) au comptage entier
+actuel, en pleine résolution et sur une version réduite, et mesure la taille de
+la réponse JSON selon l'encodage.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import histograms, image_service
+from app.utils import file_utils
+
+
+def legacy_histograms(img):
+    """Ancien calcul : six np.histogram et une copie float64 de l'image HSV"""
+    img_array = np.array(img)
+    r_hist = np.histogram(img_array[:, :, 0].flatten(), bins=256, range=(0, 256))[0]
+    g_hist = np.histogram(img_array[:, :, 1].flatten(), bins=256, range=(0, 256))[0]
+    b_hist = np.histogram(img_array[:, :, 2].flatten(), bins=256, range=(0, 256))[0]
+    hsv_array = np.array(img.convert('HSV'))
+    hsv_normalized = np.zeros_like(hsv_array, dtype=float)
+    hsv_normalized[:, :, 0] = (hsv_array[:, :, 0] / 255.0) * 360
+    hsv_normalized[:, :, 1] = (hsv_array[:, :, 1] / 255.0) * 100
+    hsv_normalized[:, :, 2] = (hsv_array[:, :, 2] / 255.0) * 100
+    h_hist = np.histogram(hsv_normalized[:, :, 0].flatten(), bins=360, range=(0, 360))[0]
+    s_hist = np.histogram(hsv_normalized[:, :, 1].flatten(), bins=100, range=(0, 100))[0]
+    v_hist = np.histogram(hsv_normalized[:, :, 2].flatten(), bins=100, range=(0, 100))[0]
+    return {
+        'rgb': {'r': r_hist.tolist(), 'g': g_hist.tolist(), 'b': b_hist.tolist()},
+        'hsv': {'h': h_hist.tolist(), 's': s_hist.tolist(), 'v': v_hist.tolist()}
+    }
+
+
+def timed_ms(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark des histogrammes RGB / HSV')
+    parser.add_argument('--size', type=int, default=2000, help='Côté des logos agrandis (px)')
+    parser.add_argument('--reduced', type=int, default=512, help='Côté maximal de la version réduite (px)')
+    args = parser.parse_args()
+
+    paths = sorted(path for path in Path(image_service.LOGOS_DIR).iterdir()
+                   if file_utils.allowed_image_file(path.name))
+    timings = {'ancien (np.histogram)': [], 'comptage entier': [], f'réduit à {args.reduced}px': []}
+    sizes = {encoding: [] for encoding in histograms.ENCODINGS}
+    identical = 0
+    for path in paths:
+        with Image.open(path) as source:
+            img = source.convert('RGB').resize((args.size, args.size), Image.Resampling.LANCZOS)
+        legacy_ms, legacy = timed_ms(lambda: legacy_histograms(img))
+        counts_ms, counts = timed_ms(lambda: histograms.compute(img))
+        factor = -(-args.size // args.reduced)
+        reduced_ms, _ = timed_ms(lambda: histograms.compute(img.reduce(factor)))
+        timings['ancien (np.histogram)'].append(legacy_ms)
+        timings['comptage entier'].append(counts_ms)
+        timings[f'réduit à {args.reduced}px'].append(reduced_ms)
+        identical += histograms.encode(counts) == legacy
+        for encoding in histograms.ENCODINGS:
+            sizes[encoding].append(len(json.dumps(histograms.encode(counts, encoding), separators=(',', ':'))))
+
+    print(f"{len(paths)} logos agrandis à {args.size}x{args.size}, résultats identiques : {identical}/{len(paths)}")
+    baseline = np.median(timings['ancien (np.histogram)'])
+    for label, values in timings.items():
+        print(f"{label:>24} {np.median(values):>9.1f} ms (médiane)  {baseline / np.median(values):>6.1f}x")
+    print("taille JSON des histogrammes (médiane) :")
+    for encoding, values in sizes.items():
+        print(f"{encoding:>24} {int(np.median(values)):>9} octets")
+
+
+if __name__ == '__main__':
+    main()
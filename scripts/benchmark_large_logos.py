@@ -0,0 +1,86 @@
+"""
+Benchmark de l'analyse des couleurs sur de très grands logos
+
+Agrandit quelques logos des clubs (par défaut à 4000 px, en JPEG et en PNG) et
+compare l'analyse précédente (décodage complet puis miniature LANCZOS) à
+l'analyse seule des couleurs actuelle (décodage JPEG réduit, filtre
+IMAGE_ANALYSIS_FILTER) : durée et taille du tampon décodé (PIL stocke 4 octets
+par pixel RGB).
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import image_service, color_engines
+
+
+def previous_analysis(path, engine):
+    """Analyse précédente : décodage pleine résolution puis miniature LANCZOS"""
+    with Image.open(path) as img:
+        rgb = img.convert('RGB')
+        decoded = rgb.size
+        rgb.thumbnail((image_service.ANALYSIS_SIZE, image_service.ANALYSIS_SIZE), Image.Resampling.LANCZOS)
+        pixels = np.asarray(rgb).reshape(-1, 3)
+    return color_engines.dominant_colors(pixels, image_service.DOMINANT_COLORS, engine), decoded
+
+
+def current_analysis(path, engine):
+    """Analyse seule des couleurs actuelle (ImageAnalysis avec décodage réduit)"""
+    with image_service.ImageAnalysis(str(path), decode_size=image_service.ANALYSIS_SIZE) as analysis:
+        pixels = analysis.thumbnail_pixels
+        decoded = analysis.rgb.size
+    return color_engines.dominant_colors(pixels, image_service.DOMINANT_COLORS, engine), decoded
+
+
+def best_ms(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'analyse des couleurs sur de grands logos")
+    parser.add_argument('--size', type=int, default=4000, help='Côté des logos agrandis (px)')
+    parser.add_argument('--logos', nargs='+', default=['OM.jpg', 'ASSE.jpg', 'psg.png'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    engine = image_service._resolve_engine()
+    workdir = Path(tempfile.mkdtemp(prefix='large_logos_'))
+    try:
+        print(f"logos agrandis à {args.size}px, miniature {image_service.ANALYSIS_SIZE}px "
+              f"({image_service.ANALYSIS_FILTER}), moteur {engine}")
+        print(f"{'fichier':>14} {'avant (ms)':>11} {'après (ms)':>11} {'décodé avant':>14} {'décodé après':>14} "
+              f"{'écart palette':>14}")
+        for name in args.logos:
+            with Image.open(Path(image_service.LOGOS_DIR) / name) as source:
+                big = source.convert('RGB').resize((args.size, args.size), Image.Resampling.LANCZOS)
+            for suffix in ('.jpg', '.png'):
+                path = workdir / (Path(name).stem + suffix)
+                big.save(path, quality=92) if suffix == '.jpg' else big.save(path)
+                before_ms, (before, before_size) = best_ms(lambda: previous_analysis(path, engine), args.repeat)
+                after_ms, (after, after_size) = best_ms(lambda: current_analysis(path, engine), args.repeat)
+                palette = np.array([color['rgb'] for color in before], dtype=np.float64)
+                gap = sum(np.sqrt(((palette - color['rgb']) ** 2).sum(axis=1)).min() * color['percentage']
+                          for color in after) / 100
+                print(f"{path.name:>14} {before_ms:>11.1f} {after_ms:>11.1f} "
+                      f"{before_size[0] * before_size[1] * 4 / 2**20:>11.1f} Mo "
+                      f"{after_size[0] * after_size[1] * 4 / 2**20:>11.1f} Mo {gap:>14.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark du catalogue des logos (manifeste persistant)
+
+Copie les logos des clubs jusqu'à plusieurs milliers de fichiers dans un dossier
+temporaire, puis mesure : l'ancienne liste (ouverture de chaque image à chaque
+appel), la construction du catalogue, le redémarrage depuis le manifeste, un
+appel servi en mémoire, un reparcours sans changement et un reparcours après
+modification d'un fichier.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import image_service, logo_catalog
+from app.utils import file_utils
+
+
+def list_by_opening(directory):
+    """Liste des logos en ouvrant chaque image (comportement précédent du service)"""
+    logos = []
+    for filename in os.listdir(directory):
+        if file_utils.allowed_image_file(filename):
+            with Image.open(os.path.join(directory, filename)) as img:
+                logos.append((filename, img.size, img.format, img.mode))
+    return logos
+
+
+def timed_ms(function):
+    start = time.perf_counter()
+    result = function()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du catalogue des logos')
+    parser.add_argument('--logos', type=int, default=5000, help='Nombre de fichiers de logos')
+    args = parser.parse_args()
+
+    sources = sorted(path for path in Path(image_service.LOGOS_DIR).iterdir()
+                     if file_utils.allowed_image_file(path.name))
+    workdir = Path(tempfile.mkdtemp(prefix='logo_catalog_'))
+    directory = workdir / 'logos'
+    directory.mkdir()
+    manifest = str(workdir / 'manifest.json')
+    try:
+        for i in range(args.logos):
+            source = sources[i % len(sources)]
+            shutil.copyfile(source, directory / f"{i:05d}{source.suffix.lower()}")
+
+        rows = []
+        rows.append(('ouverture de chaque image', timed_ms(lambda: list_by_opening(directory))[0]))
+        catalog = logo_catalog.LogoCatalog(str(directory), manifest)
+        rows.append(('construction du catalogue', timed_ms(catalog.get_logos)[0]))
+        restarted = logo_catalog.LogoCatalog(str(directory), manifest)
+        rows.append(('redémarrage (manifeste)', timed_ms(restarted.get_logos)[0]))
+        reads_after_restart = restarted.get_stats()['reads']
+        rows.append(('appel servi en mémoire', timed_ms(restarted.get_logos)[0]))
+        restarted.rescan_interval = 0
+        rows.append(('reparcours sans changement', timed_ms(restarted.get_logos)[0]))
+        os.utime(directory / f"{0:05d}{sources[0].suffix.lower()}", ns=(0, 0))
+        rows.append(('reparcours, 1 fichier modifié', timed_ms(restarted.get_logos)[0]))
+
+        print(f"{args.logos} logos")
+        for label, ms in rows:
+            print(f"{label:>32} {ms:>10.2f} ms")
+        print(f"fichiers rouverts au redémarrage : {reads_after_restart}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de la recherche de joueurs par nom (préfixe et recherche approchée)
+
+Construit des noms synthétiques distincts en combinant prénoms et noms du vrai
+dataset, puis mesure la construction de l'index et la latence des requêtes :
+préfixes saisis au fil de la frappe et noms comportant une faute de frappe.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import csv_service, player_index
+
+
+def make_names(count, seed=42):
+    """Noms distincts « prénom [second prénom] nom » tirés des mots du vrai dataset"""
+    source = csv_service.get_dataframe()[player_index.NAME_COLUMN].dropna().astype(str)
+    parts = [name.split() for name in source.unique() if len(name.split()) >= 2]
+    firsts = np.array(sorted({words[0] for words in parts}), dtype=object)
+    lasts = np.array(sorted({words[-1] for words in parts}), dtype=object)
+    rng = np.random.default_rng(seed)
+    names = set()
+    while len(names) < count:
+        size = count - len(names)
+        first = firsts[rng.integers(0, len(firsts), size)]
+        middle = np.where(rng.random(size) < 0.3, firsts[rng.integers(0, len(firsts), size)], '')
+        last = lasts[rng.integers(0, len(lasts), size)]
+        names.update(' '.join(word for word in words if word) for words in zip(first, middle, last))
+    return list(names)
+
+
+def with_typo(name, rng):
+    """Supprime, double ou remplace un caractère du nom"""
+    position = int(rng.integers(1, len(name)))
+    kind = rng.integers(0, 3)
+    if kind == 0:
+        return name[:position] + name[position + 1:]
+    if kind == 1:
+        return name[:position] + name[position] + name[position:]
+    return name[:position] + 'e' + name[position + 1:]
+
+
+def latency_ms(index, queries):
+    """Latence médiane et 95e centile (ms) des recherches"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), float(np.percentile(timings, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la recherche de joueurs par nom')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3_000, 100_000, 1_000_000],
+                        help='Nombres de noms synthétiques')
+    parser.add_argument('--queries', type=int, default=500, help='Nombre de requêtes par mesure')
+    args = parser.parse_args()
+
+    print(f"{'noms':>10} {'index (s)':>10} {'préfixe p50/p95 (ms)':>22} {'mot p50/p95 (ms)':>18} "
+          f"{'faute p50/p95 (ms)':>20} {'faute trouvée':>14}")
+    for count in args.sizes:
+        names = make_names(count)
+        start = time.perf_counter()
+        index = player_index.NameSearchIndex(names)
+        build_s = time.perf_counter() - start
+
+        rng = np.random.default_rng(0)
+        sample = [names[i] for i in rng.integers(0, len(names), args.queries)]
+        prefixes = [name[:int(rng.integers(2, 9))] for name in sample]
+        words = [name.split()[-1][:int(rng.integers(3, 7))] for name in sample]
+        typos = [with_typo(name, rng) for name in sample]
+
+        found = sum(any(result['name'] == name for result in index.search(typo))
+                    for name, typo in zip(sample, typos))
+        prefix = latency_ms(index, prefixes)
+        word = latency_ms(index, words)
+        typo = latency_ms(index, typos)
+        print(f"{count:>10,} {build_s:>10.2f} {prefix[0]:>10.3f} / {prefix[1]:<9.3f} "
+              f"{word[0]:>8.3f} / {word[1]:<7.3f} {typo[0]:>9.3f} / {typo[1]:<8.3f} "
+              f"{found / len(sample):>13.1%}")
+
+
+if __name__ == '__main__':
+    main()
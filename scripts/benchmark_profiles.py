@@ -0,0 +1,80 @@
+"""
+Benchmark de l'index des profils de colonnes sur une version synthétique du dataset
+
+Compare, par requête, l'ancien calcul complet de /api/csv/columns + /api/csv/stats
+(nunique, min/max/mean/std et isnull().sum() sur tout le DataFrame) avec une
+construction unique de l'index suivie de simples lectures.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import csv_service, column_profile
+
+
+def make_synthetic(rows, seed=42):
+    """Génère un DataFrame de `rows` lignes en tirant au hasard des lignes du vrai dataset"""
+    source = csv_service.normalize_data(csv_service.load_csv())
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(source), size=rows)
+    return source.iloc[indices].reset_index(drop=True)
+
+
+def legacy_columns_and_stats(df):
+    """Reproduit le calcul par requête de get_columns_info + get_stats avant l'index"""
+    columns_info = []
+    for col in df.columns:
+        info = {
+            'unique_count': df[col].nunique(),
+            'null_count': int(df[col].isnull().sum())
+        }
+        if pd.api.types.is_numeric_dtype(df[col]):
+            info['min'] = float(df[col].min())
+            info['max'] = float(df[col].max())
+            info['mean'] = float(df[col].mean())
+            info['std'] = float(df[col].std())
+        columns_info.append(info)
+    missing = df.isnull().sum().to_dict()
+    total_missing = int(df.isnull().sum().sum())
+    return columns_info, missing, total_missing
+
+
+def timed(func, repeat):
+    """Retourne le meilleur temps d'exécution (secondes) sur `repeat` essais"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'index des profils de colonnes")
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Nombre de lignes synthétiques')
+    parser.add_argument('--repeat', type=int, default=3, help='Nombre de mesures')
+    args = parser.parse_args()
+
+    df = make_synthetic(args.rows)
+    print(f"Dataset synthétique: {len(df)} lignes x {len(df.columns)} colonnes")
+
+    legacy = timed(lambda: legacy_columns_and_stats(df), args.repeat)
+    build = timed(lambda: column_profile.build_profiles(df), args.repeat)
+    profiles = column_profile.build_profiles(df)
+    lookup = timed(lambda: (profiles['columns'], profiles['dataset'], profiles['by_name']['Goal']['chart_types']),
+                   1000)
+
+    print(f"{'ancien calcul par requête':<32} {legacy * 1000:>12.1f} ms")
+    print(f"{'construction de l index (1x)':<32} {build * 1000:>12.1f} ms")
+    print(f"{'lecture par requête':<32} {lookup * 1e6:>12.2f} µs")
+
+
+if __name__ == '__main__':
+    main()
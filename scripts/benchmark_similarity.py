@@ -0,0 +1,77 @@
+"""
+Benchmark de la recherche de joueurs similaires (k plus proches voisins)
+
+Pour chaque taille (3k, 100k, 1M joueurs synthétiques), mesure la construction de
+l'index puis la latence des requêtes : calcul par produit matriciel (brute), arbre KD
+(sans filtre) et requête filtrée par poste et compétition.
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import csv_service, similarity
+
+
+def make_synthetic(rows, seed=42):
+    """Tire des lignes du vrai dataset et bruite les caractéristiques pour éviter les doublons exacts"""
+    source = csv_service.normalize_data(csv_service.load_csv())
+    rng = np.random.default_rng(seed)
+    df = source.iloc[rng.integers(0, len(source), size=rows)].reset_index(drop=True)
+    for col in similarity.get_feature_columns(df):
+        values = df[col].to_numpy(dtype=np.float64)
+        noise = rng.normal(0.0, 0.05 * (np.nanstd(values) or 1.0), size=rows)
+        df[col] = (values + noise).astype(np.float32)
+    return df
+
+
+def latency_ms(func, queries):
+    """Retourne la latence médiane et le 95e centile (ms) de `func` sur les requêtes"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings)), float(np.percentile(timings, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de la recherche de joueurs similaires')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3_000, 100_000, 1_000_000],
+                        help='Nombres de joueurs synthétiques')
+    parser.add_argument('--queries', type=int, default=50, help='Nombre de requêtes par mesure')
+    parser.add_argument('-k', type=int, default=10, help='Nombre de voisins')
+    args = parser.parse_args()
+
+    print(f"{'joueurs':>10} {'index (ms)':>11} {'méthode':>8} {'brute p50/p95 (ms)':>20} "
+          f"{'arbre p50/p95 (ms)':>20} {'filtré p50/p95 (ms)':>20}")
+    for rows in args.sizes:
+        df = make_synthetic(rows)
+        start = time.perf_counter()
+        index = similarity.SimilarityIndex(df)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        rng = np.random.default_rng(0)
+        queries = rng.integers(0, rows, size=args.queries)
+        candidates = np.flatnonzero(similarity.position_mask(df['Position'], ['MF'])
+                                    & similarity.competition_mask(df['Compition'], ['Ligue 1']))
+
+        brute = latency_ms(lambda q: index._brute_force(index.matrix[q], args.k + 1), queries)
+        filtered = latency_ms(lambda q: index.query(q, args.k, candidates), queries)
+        if index.tree is not None:
+            tree = latency_ms(lambda q: index.query(q, args.k), queries)
+            tree_text = f"{tree[0]:>9.2f} / {tree[1]:<8.2f}"
+        else:
+            tree_text = f"{'-':>20}"
+
+        print(f"{rows:>10} {build_ms:>11.0f} {index.method:>8} {brute[0]:>9.2f} / {brute[1]:<8.2f} "
+              f"{tree_text} {filtered[0]:>9.2f} / {filtered[1]:<8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark du chargement à froid : CSV (load_csv + normalize_data) contre instantané .npy
+
+Chaque mesure est faite dans un sous-processus neuf pour obtenir un vrai
+démarrage à froid ; le RSS mesuré est l'augmentation de VmRSS (Linux) après
+le chargement. Pour l'instantané, les pages projetées sont partagées entre workers.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+CHILD_CODE = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+from app.services import csv_service, dataset_snapshot
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+baseline = rss_kb()
+start = time.perf_counter()
+if {mode!r} == 'csv':
+    df = csv_service.normalize_data(csv_service.load_csv({csv!r}))
+else:
+    df = dataset_snapshot.load_snapshot({snapshot!r}, dataset_snapshot.source_key({csv!r}))
+    # Toucher toutes les colonnes pour mesurer un chargement effectif
+    df.sum(numeric_only=True)
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'rss_kb': rss_kb() - baseline, 'rows': len(df)}}))
+"""
+
+
+def make_scaled_csv(source, factor, directory):
+    """Génère un CSV synthétique en répétant le fichier source `factor` fois"""
+    target = os.path.join(directory, 'player_stats_x{}.csv'.format(factor))
+    with open(source, 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith(b'\n'):
+        body += b'\n'
+    with open(target, 'wb') as f:
+        f.write(header)
+        for _ in range(factor):
+            f.write(body)
+    return target
+
+
+def run_child(mode, csv_path, snapshot_dir):
+    """Lance une mesure dans un processus Python neuf"""
+    code = CHILD_CODE.format(root=str(ROOT), mode=mode, csv=csv_path, snapshot=snapshot_dir)
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    from app.services import csv_service
+
+    parser = argparse.ArgumentParser(description='Compare le chargement CSV et instantané')
+    parser.add_argument('--factor', type=int, default=1, help='Facteur de réplication du CSV')
+    parser.add_argument('--repeat', type=int, default=3, help='Nombre de mesures par méthode')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = csv_service.CSV_FILE
+        if args.factor > 1:
+            csv_path = make_scaled_csv(csv_path, args.factor, tmp)
+        snapshot_dir = os.path.join(tmp, 'snapshots')
+        csv_service.build_snapshot(csv_path, snapshot_dir)
+
+        print(f"Fichier: {csv_path} ({os.path.getsize(csv_path) / (1024 * 1024):.1f} MB)")
+        print(f"{'méthode':<10} {'lignes':>10} {'temps (ms)':>12} {'RSS (MB)':>10}")
+        for mode in ('csv', 'snapshot'):
+            runs = [run_child(mode, csv_path, snapshot_dir) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r['seconds'])
+            print(f"{mode:<10} {best['rows']:>10} {best['seconds'] * 1000:>12.1f} {best['rss_kb'] / 1024:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
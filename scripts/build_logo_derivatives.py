@@ -0,0 +1,80 @@
+"""
+Génération d'avance des miniatures des logos (WebP / PNG)
+
+Génère toutes les miniatures des logos des clubs (tailles IMAGE_DERIVATIVE_SIZES)
+dans IMAGE_DERIVATIVES_DIR, supprime au besoin celles des anciennes versions des
+logos, puis compare le poids des logos d'origine à celui des miniatures et le
+coût d'une miniature servie depuis le cache à celui d'une réduction à la volée.
+"""
+
+import io
+import sys
+import time
+import argparse
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import image_service, logo_derivatives
+
+
+def resize_on_the_fly(path, size, fmt):
+    """Miniature recalculée à chaque requête (sans cache)"""
+    pil_format, _, options = logo_derivatives.DERIVATIVE_FORMATS[fmt]
+    with Image.open(path) as img:
+        img.draft('RGB', (size, size))
+        thumbnail = img.convert('RGBA' if logo_derivatives._has_alpha(img) else 'RGB')
+        thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format=pil_format, **options)
+    return buffer.getvalue()
+
+
+def read_cached(name, size, fmt):
+    """Miniature servie depuis le cache (empreinte du logo puis lecture du fichier)"""
+    path, _, _ = image_service.get_logo_derivative(name, size, fmt)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def total_ms(function, items):
+    start = time.perf_counter()
+    for item in items:
+        function(*item)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Génère les miniatures des logos')
+    parser.add_argument('--formats', nargs='+', default=list(logo_derivatives.DERIVATIVE_FORMATS),
+                        choices=list(logo_derivatives.DERIVATIVE_FORMATS))
+    parser.add_argument('--prune', action='store_true', help='Supprimer les miniatures des anciennes versions')
+    args = parser.parse_args()
+
+    stats = image_service.build_logo_derivatives(args.formats, prune=args.prune)
+    print(f"{stats['derivatives']} miniatures pour {stats['logos']} logos en {stats['seconds'] * 1000:.0f} ms "
+          f"({stats['mode']}, {stats['workers']} processus), échecs : {stats['failed']}")
+    for error in stats['errors']:
+        print(f"  {error}")
+    if args.prune:
+        print(f"miniatures obsolètes supprimées : {stats['pruned']}")
+
+    logos = [logo for logo in image_service.get_logos_list() if 'error' not in logo]
+    source_bytes = sum(logo['size_bytes'] for logo in logos)
+    print(f"{'taille':>8} {'format':>7} {'poids total':>12} {'/ logos':>8} {'à la volée':>11} {'cache':>9}")
+    for size in image_service._derivatives.sizes:
+        for fmt in args.formats:
+            items = [(logo['name'], size, fmt) for logo in logos]
+            derivative_bytes = sum(len(read_cached(*item)) for item in items)
+            cached_ms = total_ms(read_cached, items)
+            fly_ms = total_ms(resize_on_the_fly,
+                              [(Path(image_service.get_logos_dir()) / name, s, f) for name, s, f in items])
+            print(f"{size:>6}px {fmt:>7} {derivative_bytes / 1024:>9.1f} Ko {derivative_bytes / source_bytes:>7.1%} "
+                  f"{fly_ms:>8.1f} ms {cached_ms:>6.1f} ms")
+    print(f"logos d'origine : {source_bytes / 1024:.1f} Ko")
+
+
+if __name__ == '__main__':
+    main()
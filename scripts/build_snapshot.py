@@ -0,0 +1,26 @@
+"""
+Script pour construire hors ligne l'instantané colonnaire du dataset CSV
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Config
+from app.services import csv_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit l'instantané .npy du CSV des joueurs")
+    parser.add_argument('--csv', default=csv_service.CSV_FILE, help='Fichier CSV source')
+    parser.add_argument('--out', default=Config.CSV_SNAPSHOT_DIR, help="Dossier racine des instantanés")
+    args = parser.parse_args()
+
+    path = csv_service.build_snapshot(args.csv, args.out)
+    print(f"✓ Instantané écrit dans: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""
+Script pour ajouter (ou mettre à jour) des lignes de joueurs dans data/player_stats.csv
+
+Les lignes sont validées contre le schéma avant écriture.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import csv_service, ingestion
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ajoute des lignes au CSV des joueurs')
+    parser.add_argument('rows', help='Fichier CSV des nouvelles lignes (avec en-tête)')
+    parser.add_argument('--mode', choices=ingestion.INGEST_MODES, default='append',
+                        help="'append' ajoute les lignes, 'upsert' remplace les joueurs existants (nom + club)")
+    args = parser.parse_args()
+
+    encoding = ingestion.detect_encoding(args.rows)
+    with open(args.rows, 'r', encoding=encoding) as f:
+        rows = ingestion.rows_from_csv_text(f.read())
+
+    try:
+        result = csv_service.ingest_rows(rows, args.mode)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    print(f"✓ {result['appended']} ligne(s) ajoutée(s), {result['replaced']} remplacée(s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Vérification de la lecture par morceaux (CSV_INGESTION_MODE=chunked)
+
+1. Compare les profils et la carte des nationalités calculés par morceaux à ceux
+   du chargement en mémoire sur le fichier réel.
+2. Génère un CSV de plusieurs Go (répétition du fichier source) et vérifie,
+   dans un processus neuf, que le pic de mémoire (VmHWM, Linux) reste sous le
+   plafond demandé pendant le calcul des résumés.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+CHILD_CODE = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+from app.services import csv_service
+
+def status_kb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return 0
+
+baseline = status_kb('VmRSS')
+start = time.perf_counter()
+summary = csv_service.summarize_chunked({csv!r}, memory_limit_mb={memory_mb!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'peak_kb': status_kb('VmHWM') - baseline,
+                   'rows': summary['rows'], 'ingestion': summary['ingestion']}}))
+"""
+
+# Erreur de rang tolérée sur les quantiles estimés par l'esquisse
+RANK_TOLERANCE = 0.02
+
+
+def make_large_csv(source, size_gb, directory):
+    """Génère un CSV d'environ `size_gb` Go en répétant le corps du fichier source"""
+    target = os.path.join(directory, 'player_stats_{}gb.csv'.format(size_gb))
+    with open(source, 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith(b'\n'):
+        body += b'\n'
+    target_bytes = int(size_gb * 1024 ** 3)
+    with open(target, 'wb') as f:
+        f.write(header)
+        written = len(header)
+        while written < target_bytes:
+            f.write(body)
+            written += len(body)
+    return target
+
+
+def compare_with_memory():
+    """Compare résumés par morceaux et en mémoire sur le fichier réel"""
+    from app.services import csv_service, column_profile
+
+    df = csv_service.get_dataframe()
+    exact = column_profile.build_profiles(df)
+    summary = csv_service.summarize_chunked(csv_service.CSV_FILE, chunk_rows=500)
+    approx = summary['profiles']
+    errors = []
+
+    if approx['dataset'] != exact['dataset']:
+        errors.append('totaux du dataset différents')
+    for profile in exact['columns']:
+        other = approx['by_name'].get(profile['name'])
+        if other is None:
+            errors.append(f"{profile['name']}: colonne absente")
+            continue
+        for key in ('count', 'null_count'):
+            if profile[key] != other[key]:
+                errors.append(f"{profile['name']}.{key}: {profile[key]} != {other[key]}")
+        if not profile['is_numeric']:
+            continue
+        for key in ('min', 'max', 'mean', 'std'):
+            if profile[key] is not None and abs(profile[key] - other[key]) > 1e-3 * max(1.0, abs(profile[key])):
+                errors.append(f"{profile['name']}.{key}: {profile[key]} != {other[key]}")
+        # Arrondi identique à celui des profils (valeurs float32 sérialisées à 6 décimales)
+        values = df[profile['name']].dropna().to_numpy(dtype='float64').round(6)
+        for key, q in column_profile.PROFILE_QUANTILES.items():
+            estimate = other['quantiles'][key]
+            # Le quantile estimé doit couvrir le rang q à la tolérance près
+            low = (values < estimate).mean()
+            high = (values <= estimate).mean()
+            if not (low - RANK_TOLERANCE <= q <= high + RANK_TOLERANCE):
+                errors.append(f"{profile['name']}.{key}: {estimate} (rang {low:.3f}-{high:.3f})")
+
+    nations = csv_service._nationality_map_from_counts(summary['nationality_counts'], summary['rows'])
+    expected = csv_service.get_nationality_map_data()
+    as_counts = lambda data: {point['nation']: point['count'] for point in data['points']}
+    if as_counts(nations) != as_counts(expected) or nations['unresolved'] != expected['unresolved']:
+        errors.append('carte des nationalités différente')
+    return errors
+
+
+def main():
+    from app.services import csv_service
+
+    parser = argparse.ArgumentParser(description='Vérifie la lecture par morceaux du CSV')
+    parser.add_argument('--size-gb', type=float, default=2.0, help='Taille du CSV généré (Go)')
+    parser.add_argument('--memory-mb', type=int, default=64, help='Plafond mémoire d\'un morceau (Mo)')
+    parser.add_argument('--ceiling-mb', type=int, default=None,
+                        help='Pic de mémoire maximal accepté (défaut : 4 x --memory-mb)')
+    parser.add_argument('--skip-large', action='store_true', help='Ne pas générer le gros fichier')
+    args = parser.parse_args()
+    ceiling_mb = args.ceiling_mb or 4 * args.memory_mb
+
+    errors = compare_with_memory()
+    print('Comparaison mémoire / morceaux :', 'OK' if not errors else 'ÉCHEC')
+    for error in errors:
+        print('  -', error)
+
+    if not args.skip_large:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = make_large_csv(csv_service.CSV_FILE, args.size_gb, tmp)
+            print(f"Fichier: {csv_path} ({os.path.getsize(csv_path) / 1024 ** 3:.2f} Go)")
+            code = CHILD_CODE.format(root=str(ROOT), csv=csv_path, memory_mb=args.memory_mb)
+            output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+            result = json.loads(output.stdout.strip().splitlines()[-1])
+            peak_mb = result['peak_kb'] / 1024
+            print(f"{result['rows']} lignes, {result['ingestion']['chunks']} morceaux de "
+                  f"{result['ingestion']['chunk_rows']} lignes, {result['seconds']:.1f} s, "
+                  f"pic mémoire +{peak_mb:.1f} Mo (plafond {ceiling_mb} Mo)")
+            if peak_mb > ceiling_mb:
+                errors.append(f"pic mémoire {peak_mb:.1f} Mo > {ceiling_mb} Mo")
+
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
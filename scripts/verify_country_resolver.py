@@ -0,0 +1,52 @@
+"""
+Vérification de la résolution des nationalités
+
+Chaque nationalité du CSV doit être résolue, les formats "xx ABC" par leur code
+final, et les noms composés absents du référentiel ne doivent pas être rattachés
+au pays d'un de leurs mots : ils restent non résolus (`unresolved` de la carte).
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import country_resolver, csv_service
+
+# Nationalité -> nom attendu dans le référentiel (None : non résolue)
+EXPECTED = {
+    'FRA': 'France',
+    'fr FRA': 'France',
+    'eng ENG': 'England',
+    'de GER': 'Germany',
+    'Brésil': 'Brazil',
+    'Papua New Guinea': None,
+    'South Sudan': None,
+    'US Virgin Islands': None,
+    'Sao Tome and Principe': None,
+    'xx ZZZ': None,
+}
+
+
+def main():
+    resolver = country_resolver.get_resolver()
+    errors = []
+    for nation, expected in EXPECTED.items():
+        entry = resolver.resolve(nation)
+        name = entry['name'] if entry else None
+        if name != expected:
+            errors.append(f"{nation!r} -> {name!r} (attendu {expected!r})")
+
+    nations = csv_service.get_dataframe()['Nation'].dropna().astype(str).unique()
+    unresolved = [nation for nation in nations if resolver.resolve(nation) is None]
+    errors.extend(f"{nation!r} du CSV non résolue" for nation in unresolved)
+
+    print(f"{len(EXPECTED)} cas, {len(nations)} nationalités du CSV")
+    print('Résolution des nationalités :', 'OK' if not errors else 'ÉCHEC')
+    for error in errors:
+        print('  -', error)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
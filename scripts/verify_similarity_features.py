@@ -0,0 +1,63 @@
+"""
+Vérification des caractéristiques de la recherche de joueurs similaires
+
+Construit l'index de similarité sur les données normalisées sans les métriques
+dérivées, puis sur le dataset servi par l'API (métriques dérivées du registre
+ajoutées) : les caractéristiques, les voisins et les distances doivent être
+identiques, l'ajout d'une métrique au registre ne devant pas modifier les
+résultats de /api/csv/player/<nom>/similar.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import csv_service, derived_metrics, similarity
+
+
+def compare(native, derived, players, k):
+    """Erreurs entre l'index sans et avec métriques dérivées"""
+    errors = []
+    if native.features != derived.features:
+        extra = sorted(set(derived.features) - set(native.features))
+        errors.append(f"caractéristiques différentes (en plus : {extra})")
+        return errors
+    if not np.array_equal(native.matrix, derived.matrix):
+        errors.append("matrices standardisées différentes")
+    for position in players:
+        native_positions, native_distances = native.query(position, k)
+        derived_positions, derived_distances = derived.query(position, k)
+        if not np.array_equal(native_positions, derived_positions) or \
+                not np.array_equal(native_distances, derived_distances):
+            errors.append(f"voisins différents pour la ligne {position}")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vérifie que les métriques dérivées ne changent pas la similarité')
+    parser.add_argument('--players', type=int, default=500, help='Nombre de joueurs interrogés')
+    parser.add_argument('--k', type=int, default=similarity.DEFAULT_K)
+    args = parser.parse_args()
+
+    native_frame = csv_service.normalize_data(csv_service.load_csv())
+    derived_frame = derived_metrics.add_derived_columns(native_frame.copy())
+    added = [name for name in derived_frame.columns if name not in native_frame.columns]
+    native = similarity.build_index(native_frame)
+    derived = similarity.build_index(derived_frame)
+
+    players = np.linspace(0, len(native) - 1, min(args.players, len(native))).astype(int)
+    errors = compare(native, derived, players, args.k)
+    print(f"{len(native)} joueurs, {len(native.features)} caractéristiques, "
+          f"{len(added)} métriques dérivées ajoutées, {len(players)} joueurs interrogés (k={args.k})")
+    print('Similarité sans / avec métriques dérivées :', 'OK' if not errors else 'ÉCHEC')
+    for error in errors[:20]:
+        print('  -', error)
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@ let currentColumn = null;
 let currentChartType = null;
 let currentLibrary = 'chartjs';
 let randomVisualizations = [];
+let csvColumnsInfo = [];
 
 // Bibliothèques disponibles
 const AVAILABLE_LIBRARIES = {
@@ -67,6 +68,71 @@ function displayCSVStats(stats) {
     `;
     
     container.innerHTML = statsHTML;
+    displayPlayerSearch();
+}
+
+// Recherche de joueurs au fil de la frappe
+const PLAYER_SEARCH_DELAY_MS = 150;
+let playerSearchTimer = null;
+let playerSearchController = null;
+
+function displayPlayerSearch() {
+    const statsSection = document.querySelector('#csv-container .file-stats-section');
+    if (!statsSection || document.getElementById('player-search-input')) return;
+    
+    const searchSection = document.createElement('div');
+    searchSection.className = 'player-search-section';
+    searchSection.innerHTML = `
+        <h3>Rechercher un Joueur</h3>
+        <input type="search" id="player-search-input" class="player-search-input"
+               placeholder="Nom du joueur (ex. mbappe, de bruyne)" autocomplete="off">
+        <ul id="player-search-results" class="player-search-results"></ul>
+    `;
+    statsSection.insertAdjacentElement('afterend', searchSection);
+    
+    document.getElementById('player-search-input').addEventListener('input', event => {
+        clearTimeout(playerSearchTimer);
+        const query = event.target.value.trim();
+        playerSearchTimer = setTimeout(() => searchPlayers(query), PLAYER_SEARCH_DELAY_MS);
+    });
+}
+
+function searchPlayers(query) {
+    // Une seule requête en vol : la précédente est annulée à chaque frappe
+    if (playerSearchController) playerSearchController.abort();
+    if (!query) {
+        displayPlayerSearchResults([]);
+        return;
+    }
+    playerSearchController = new AbortController();
+    fetch(`/api/csv/players/search?q=${encodeURIComponent(query)}&limit=10`, { signal: playerSearchController.signal })
+        .then(response => response.json())
+        .then(data => {
+            if (data.status === 'success') {
+                displayPlayerSearchResults(data.search.results);
+            }
+        })
+        .catch(error => {
+            if (error.name !== 'AbortError') console.error('Error searching players:', error);
+        });
+}
+
+function displayPlayerSearchResults(results) {
+    const list = document.getElementById('player-search-results');
+    if (!list) return;
+    list.innerHTML = '';
+    results.forEach(result => {
+        const item = document.createElement('li');
+        item.className = `player-search-result match-${result.match}`;
+        const name = document.createElement('strong');
+        name.textContent = result.name;
+        const details = document.createElement('small');
+        details.textContent = [result.Squad.join(' / '), result.Position.join(' / '), result.Compition.join(' / ')]
+            .filter(text => text).join(' · ');
+        item.appendChild(name);
+        item.appendChild(details);
+        list.appendChild(item);
+    });
 }
 
 function loadCSVColumns() {
@@ -74,6 +140,7 @@ function loadCSVColumns() {
         .then(response => response.json())
         .then(data => {
             if (data.status === 'success') {
+                csvColumnsInfo = data.columns;
                 displayVisualizationControls(data.columns);
             }
         })
@@ -251,7 +318,14 @@ function createVisualization() {
             return;
         }
         
-        fetch(`/api/csv/column/${encodeURIComponent(column)}/data?limit=100`)
+        // Histogrammes et lignes : résumé calculé côté serveur sur toute la colonne
+        const summaryKinds = { 'histogram': 'histogram', 'line': 'downsample' };
+        const isNumeric = csvColumnsInfo.some(c => c.name === column && c.is_numeric);
+        const url = (isNumeric && summaryKinds[chartType])
+            ? `/api/csv/column/${encodeURIComponent(column)}/summary?kind=${summaryKinds[chartType]}&method=fd`
+            : `/api/csv/column/${encodeURIComponent(column)}/data?limit=100`;
+        
+        fetch(url)
             .then(response => response.json())
             .then(data => {
                 if (data.status === 'success') {
@@ -456,7 +530,9 @@ function renderChartJS(data, chartType, columnName, container) {
                 }
             };
         } else if (chartType === 'histogram') {
-            const bins = createHistogramBins(data.data, 20);
+            const bins = data.kind === 'histogram'
+                ? { labels: data.labels, frequencies: data.data }
+                : createHistogramBins(data.data, 20);
             chartConfig = {
                 type: 'bar',
                 data: {
@@ -1151,7 +1227,7 @@ function initNationalityMap(points) {
         // Ajouter un popup avec les informations
         const popupContent = `
             <div style="text-align: center; padding: 5px;">
-                <strong>${point.nation}</strong><br>
+                <strong>${point.country || point.nation}</strong><br>
                 <span style="font-size: 18px; color: ${bubbleColor}; font-weight: bold;">
                     ${point.count} joueur${point.count > 1 ? 's' : ''}
                 </span>
@@ -204,8 +204,13 @@ function displayLogosBubbles(logos) {
         
         const logoName = logo.name.replace(/\.[^/.]+$/, '').replace(/\.(png|jpg|jpeg)$/i, '');
         
+        // Miniatures pré-générées (128 px, 256 px pour les écrans haute densité) si disponibles
+        const thumbnails = logo.thumbnails || {};
+        const src = thumbnails['128'] || logo.path;
+        const srcset = thumbnails['128'] && thumbnails['256'] ? `${thumbnails['128']} 1x, ${thumbnails['256']} 2x` : '';
+        
         bubble.innerHTML = `
-            <img src="${logo.path}" alt="${logoName}" loading="lazy" 
+            <img src="${src}" ${srcset ? `srcset="${srcset}"` : ''} alt="${logoName}" loading="lazy" 
                  onerror="console.error('Error loading image: ${logo.path}'); this.style.display='none';">
             <div class="bubble-overlay">
                 <span class="bubble-name">${logoName}</span>